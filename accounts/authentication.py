@@ -0,0 +1,130 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+User = get_user_model()
+
+AUTH_STATE_KEY = "auth:state:{}"
+MISSING = "missing"
+
+
+def get_auth_state(user_id):
+    """
+    Return (is_active, is_staff, is_superuser) for a user, or None if the
+    user no longer exists. Cached for AUTH_STATE_CACHE_TTL seconds and dropped
+    on every User save, so promotions and deactivations apply at once and
+    queryset.update() changes within the TTL.
+    """
+    key = AUTH_STATE_KEY.format(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = (
+            User.objects.filter(pk=user_id)
+            .values_list("is_active", "is_staff", "is_superuser")
+            .first()
+        ) or MISSING
+        cache.set(key, state, getattr(settings, "AUTH_STATE_CACHE_TTL", 30))
+    return None if state == MISSING else state
+
+
+async def aget_auth_state(user_id):
+    """
+    get_auth_state() for async views.
+    """
+    key = AUTH_STATE_KEY.format(user_id)
+    state = await cache.aget(key)
+    if state is None:
+        state = await (
+            User.objects.filter(pk=user_id)
+            .values_list("is_active", "is_staff", "is_superuser")
+            .afirst()
+        ) or MISSING
+        await cache.aset(key, state, getattr(settings, "AUTH_STATE_CACHE_TTL", 30))
+    return None if state == MISSING else state
+
+
+def invalidate_auth_state(user_id):
+    cache.delete(AUTH_STATE_KEY.format(user_id))
+
+
+class ClaimsUser(TokenUser):
+    """
+    Lightweight request.user built from access-token claims.
+    Has no DB row attached: views that need profile fields or
+    writes must load the User themselves.
+    """
+
+    @cached_property
+    def id(self):
+        # simplejwt stores the id claim as a string; compare like a real pk
+        return User._meta.pk.to_python(self.token[api_settings.USER_ID_CLAIM])
+
+    @cached_property
+    def pk(self):
+        return self.id
+
+    @cached_property
+    def active_plan_id(self):
+        # plan at token issuance; use the entitlement selectors for live data
+        return self.token.get("plan_id")
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication without the per-request user query.
+
+    The token's role claims are checked against the cached auth state:
+    inactive or deleted users are rejected, and if the roles changed since
+    the token was issued (e.g. promote) the user is loaded from the DB as usual.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        if "is_staff" not in validated_token:
+            # issued by a serializer without our claims
+            return super().get_user(validated_token)
+        state = get_auth_state(validated_token[api_settings.USER_ID_CLAIM])
+        if self.claims_match(validated_token, state):
+            return api_settings.TOKEN_USER_CLASS(validated_token)
+        return super().get_user(validated_token)
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() for async views (see core.asyncapi). Only the rare
+        DB fallback of get_user() runs in a worker thread.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if api_settings.USER_ID_CLAIM in validated_token and "is_staff" in validated_token:
+            state = await aget_auth_state(validated_token[api_settings.USER_ID_CLAIM])
+            if self.claims_match(validated_token, state):
+                return api_settings.TOKEN_USER_CLASS(validated_token), validated_token
+        return await sync_to_async(self.get_user)(validated_token), validated_token
+
+    def claims_match(self, validated_token, state):
+        """
+        True when the token's role claims still hold for the cached auth
+        state; raises for inactive or deleted users.
+        """
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        is_active, is_staff, is_superuser = state
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return (is_staff, is_superuser) == (
+            validated_token.get("is_staff"),
+            validated_token.get("is_superuser"),
+        )
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from accounts.services.login import (
+    acheck_user_password,
+    ahash_unknown_user,
+    check_user_password,
+    hash_unknown_user,
+)
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend whose password checks go through the login hash pool
+    (accounts.services.login), for both the sync token view and async logins.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            hash_unknown_user(password)
+            return None
+        if check_user_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            await ahash_unknown_user(password)
+            return None
+        if await acheck_user_password(user, password) and self.user_can_authenticate(user):
+            return user
+        return None
@@ -0,0 +1,18 @@
+from django.contrib.auth import get_user_model
+from core.export import Export
+
+User = get_user_model()
+
+
+def user_export():
+    return Export("users", User.objects.all(), [
+        ("id", "id"),
+        ("username", "username"),
+        ("email", "email"),
+        ("first_name", "first_name"),
+        ("last_name", "last_name"),
+        ("is_active", "is_active"),
+        ("is_staff", "is_staff"),
+        ("date_joined", "date_joined"),
+        ("last_login", "last_login"),
+    ])
@@ -0,0 +1,16 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the work factor taken from PASSWORD_HASH_ITERATIONS.
+
+    Same algorithm name as Django's hasher, so existing hashes keep
+    verifying; hashes with another iteration count report must_update()
+    and are rewritten on the user's next login (accounts.services.login).
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_HASH_ITERATIONS", PBKDF2PasswordHasher.iterations)
@@ -0,0 +1,9 @@
+from accounts.exports import user_export
+from core.export import ExportCommand
+
+
+class Command(ExportCommand):
+    help = "Stream all users as CSV or JSON Lines."
+
+    def get_export(self):
+        return user_export()
@@ -6,8 +6,23 @@ class User(AbstractUser):
     """
     Custom user model extending Django's AbstractUser.
     Adds unique email constraint for safer logins and communication.
+
+    active_plan and feature_mask mirror the user's active subscription
+    (subscriptions.services.active_plan keeps them in step; the
+    rebuild_active_plans command repairs or verifies them), so "which plan,
+    which features" is a primary-key read or no query at all.
     """
     email = models.EmailField(unique=True)
+    active_plan = models.ForeignKey(
+        "subscriptions.Plan",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        editable=False,
+    )
+    # packed bitset of active_plan's features by Feature.bit (see subscriptions.bitsets)
+    feature_mask = models.BinaryField(default=b"", editable=False)
 
     def __str__(self):
         return self.username
@@ -5,9 +5,10 @@ class IsSelfOrAdmin(BasePermission):
     Allow access only to self or admin users.
     """
     def has_object_permission(self, request, view, obj):
-        # obj here is a User instance
+        # obj here is a User instance; request.user may be a claims-only
+        # token user, so compare primary keys
         return bool(
             request.user and (
-                request.user.is_superuser or obj == request.user
+                request.user.is_superuser or obj.pk == request.user.pk
             )
         )
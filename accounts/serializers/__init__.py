@@ -1,3 +1,4 @@
 from .user import UserCreateSerializer, UserSerializer
+from .token import ClaimsTokenObtainPairSerializer
 
-__all__ = ["UserCreateSerializer", "UserSerializer"]
\ No newline at end of file
+__all__ = ["UserCreateSerializer", "UserSerializer", "ClaimsTokenObtainPairSerializer"]
\ No newline at end of file
@@ -0,0 +1,23 @@
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Login serializer that embeds the claims needed by
+    accounts.authentication.ClaimsJWTAuthentication, so authenticated
+    requests don't have to load the user row.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.username
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        # Snapshot at login time; live checks go through the entitlement cache.
+        token["plan_id"] = (
+            user.subscriptions.filter(is_active=True)
+            .values_list("plan_id", flat=True)
+            .first()
+        )
+        return token
@@ -1,5 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers
 from accounts.models import User
+from accounts.tasks import record_audit_event, send_welcome_email
+from jobs.queue import enqueue_jobs
 
 class UserCreateSerializer(serializers.ModelSerializer):
     """
@@ -13,14 +16,22 @@ class UserCreateSerializer(serializers.ModelSerializer):
         fields = ["id", "username", "email", "first_name", "last_name", "password"]
 
     def create(self, validated_data):
-        # Ensure password is hashed
-        user = User.objects.create_user(
-            username=validated_data["username"],
-            email=validated_data.get("email"),
-            first_name=validated_data.get("first_name", ""),
-            last_name=validated_data.get("last_name", ""),
-            password=validated_data["password"],
-        )
+        with transaction.atomic():
+            # Ensure password is hashed
+            user = User.objects.create_user(
+                username=validated_data["username"],
+                email=validated_data.get("email"),
+                first_name=validated_data.get("first_name", ""),
+                last_name=validated_data.get("last_name", ""),
+                password=validated_data["password"],
+            )
+            # slow side effects run in the job worker, after commit
+            enqueue_jobs([
+                send_welcome_email.job(idempotency_key=f"welcome-email:{user.pk}", user_id=user.pk),
+                record_audit_event.job(
+                    idempotency_key=f"audit:user.registered:{user.pk}", event="user.registered", user_id=user.pk,
+                ),
+            ])
         return user
     
 
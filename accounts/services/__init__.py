@@ -0,0 +1,3 @@
+from .user_import import READERS, UserImporter
+
+__all__ = ["READERS", "UserImporter"]
@@ -0,0 +1,97 @@
+"""
+Login password checks.
+
+PBKDF2 is deliberately slow, so verification runs in a bounded thread
+pool (LOGIN_HASH_WORKERS threads per process; hashlib releases the GIL
+while hashing): a burst of logins queues for the pool instead of taking
+every request thread, and async views await it without blocking the
+event loop. Hashes made with an outdated hasher configuration are
+rewritten after a successful check (rehash on login), and the time each
+login spends hashing is recorded in the metrics registry.
+"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password, verify_password
+from core.metrics import registry
+
+User = get_user_model()
+
+HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.15, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0)
+
+registry.register_histogram(
+    "auth_password_hash_seconds", "Password hashing time per login attempt.", HASH_BUCKETS
+)
+registry.register_counter("auth_password_rehash_total", "Password hashes upgraded on login.")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = getattr(settings, "LOGIN_HASH_WORKERS", None) or os.cpu_count() or 1
+            _pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="login-hash")
+        return _pool
+
+
+def _check(password, encoded):
+    """
+    Runs in the pool: verify, and hash again if the stored hash is outdated.
+    Returns (is_correct, new_encoded or None).
+    """
+    started = time.perf_counter()
+    is_correct, must_update = verify_password(password, encoded)
+    new_encoded = make_password(password) if is_correct and must_update else None
+    outcome = "rehashed" if new_encoded else ("valid" if is_correct else "invalid")
+    registry.observe("auth_password_hash_seconds", (("outcome", outcome),), time.perf_counter() - started)
+    return is_correct, new_encoded
+
+
+def _dummy(password):
+    """
+    Hash once for unknown usernames so they take as long as known ones.
+    """
+    started = time.perf_counter()
+    make_password(password)
+    registry.observe(
+        "auth_password_hash_seconds", (("outcome", "unknown_user"),), time.perf_counter() - started
+    )
+
+
+def _rehashed(user, new_encoded):
+    """
+    Filter for storing an upgraded hash; matches nothing if the password
+    changed since it was read.
+    """
+    registry.inc("auth_password_rehash_total", ())
+    old_encoded, user.password = user.password, new_encoded
+    return User.objects.filter(pk=user.pk, password=old_encoded)
+
+
+def check_user_password(user, password):
+    is_correct, new_encoded = get_pool().submit(_check, password, user.password).result()
+    if new_encoded:
+        _rehashed(user, new_encoded).update(password=new_encoded)
+    return is_correct
+
+
+async def acheck_user_password(user, password):
+    is_correct, new_encoded = await asyncio.wrap_future(get_pool().submit(_check, password, user.password))
+    if new_encoded:
+        await _rehashed(user, new_encoded).aupdate(password=new_encoded)
+    return is_correct
+
+
+def hash_unknown_user(password):
+    get_pool().submit(_dummy, password).result()
+
+
+async def ahash_unknown_user(password):
+    await asyncio.wrap_future(get_pool().submit(_dummy, password))
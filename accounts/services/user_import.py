@@ -0,0 +1,260 @@
+"""
+Bulk user import (see the import_users management command).
+
+Rows are streamed from CSV or JSONL and handled in chunks: each chunk is
+validated with one lookup query, its passwords are hashed in a process
+pool (PBKDF2 is CPU-bound, so threads would not help), and the valid
+rows go in with one bulk_create. Memory stays flat apart from the
+usernames/emails already seen, which catch duplicates inside the file.
+"""
+import csv
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from accounts.tasks import send_welcome_email
+from jobs.queue import enqueue_jobs
+
+User = get_user_model()
+
+
+def read_csv(stream):
+    """
+    Yield (line number, row dict, error) from a CSV file with a header row.
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        yield reader.line_num, row, None
+
+
+def read_jsonl(stream):
+    """
+    Yield (line number, row dict, error) from a file of one JSON object per line.
+    """
+    for line_no, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_no, None, "Malformed JSON."
+            continue
+        if not isinstance(row, dict):
+            yield line_no, None, "Expected a JSON object."
+            continue
+        yield line_no, row, None
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl}
+
+
+class ImportStats:
+    def __init__(self):
+        self.read = 0
+        self.imported = 0
+        self.rejected = 0
+        self.started = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+
+def _clean(value):
+    return "" if value is None else str(value).strip()
+
+
+class UserImporter:
+    """
+    Import users from (line number, row, error) tuples.
+
+    on_reject(line_no, reason, row) is called for every rejected row and
+    on_progress(stats) after every chunk. workers=0 hashes in-process.
+    """
+    def __init__(self, batch_size=1000, workers=None, dry_run=False, welcome_email=False,
+                 on_reject=None, on_progress=None):
+        self.batch_size = batch_size
+        self.workers = workers
+        self.dry_run = dry_run
+        self.welcome_email = welcome_email
+        self.on_reject = on_reject or (lambda line_no, reason, row: None)
+        self.on_progress = on_progress or (lambda stats: None)
+        self.stats = ImportStats()
+        self._usernames = set()
+        self._emails = set()
+        self._username_field = User._meta.get_field("username")
+        self._email_field = User._meta.get_field("email")
+        self._name_max_length = User._meta.get_field("first_name").max_length
+
+    def run(self, rows):
+        executor = None
+        if self.workers != 0:
+            # fork keeps the configured Django settings in the workers
+            context = None
+            if "fork" in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context("fork")
+            executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        try:
+            rows = iter(rows)
+            while True:
+                chunk = list(islice(rows, self.batch_size))
+                if not chunk:
+                    break
+                self.import_chunk(chunk, executor)
+                self.on_progress(self.stats)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        return self.stats
+
+    def reject(self, line_no, reason, row):
+        self.stats.rejected += 1
+        self.on_reject(line_no, reason, row)
+
+    def validate(self, row):
+        """
+        Return the cleaned row, or the reason it is rejected.
+        Raises ValidationError for invalid usernames/emails.
+        """
+        username = User.normalize_username(_clean(row.get("username")))
+        email = User.objects.normalize_email(_clean(row.get("email")))
+        if not username:
+            return "Missing username."
+        if not email:
+            return "Missing email."
+        self._username_field.run_validators(username)
+        self._email_field.run_validators(email)
+        cleaned = {
+            "username": username,
+            "email": email,
+            "first_name": _clean(row.get("first_name")),
+            "last_name": _clean(row.get("last_name")),
+            "password": _clean(row.get("password")),
+            "password_hash": _clean(row.get("password_hash")),
+        }
+        for field in ("first_name", "last_name"):
+            if len(cleaned[field]) > self._name_max_length:
+                return f"{field} is longer than {self._name_max_length} characters."
+        if cleaned["password_hash"]:
+            try:
+                identify_hasher(cleaned["password_hash"])
+            except ValueError:
+                return "Unrecognized password_hash format."
+        return cleaned
+
+    def import_chunk(self, chunk, executor):
+        candidates = []
+        for line_no, row, error in chunk:
+            self.stats.read += 1
+            if error:
+                self.reject(line_no, error, row)
+                continue
+            try:
+                cleaned = self.validate(row)
+            except ValidationError as exc:
+                cleaned = " ".join(exc.messages)
+            if isinstance(cleaned, str):
+                self.reject(line_no, cleaned, row)
+            elif cleaned["username"] in self._usernames:
+                self.reject(line_no, "Duplicate username in file.", row)
+            elif cleaned["email"] in self._emails:
+                self.reject(line_no, "Duplicate email in file.", row)
+            else:
+                self._usernames.add(cleaned["username"])
+                self._emails.add(cleaned["email"])
+                candidates.append((line_no, cleaned, row))
+        if not candidates:
+            return
+
+        taken_usernames, taken_emails = set(), set()
+        for username, email in User.objects.filter(
+            Q(username__in=[c["username"] for _, c, _ in candidates])
+            | Q(email__in=[c["email"] for _, c, _ in candidates])
+        ).values_list("username", "email"):
+            taken_usernames.add(username)
+            taken_emails.add(email)
+
+        to_insert = []
+        for line_no, cleaned, row in candidates:
+            if cleaned["username"] in taken_usernames:
+                self.reject(line_no, "Username already exists.", row)
+            elif cleaned["email"] in taken_emails:
+                self.reject(line_no, "Email already exists.", row)
+            else:
+                to_insert.append((line_no, cleaned, row))
+        if not to_insert:
+            return
+
+        if self.dry_run:
+            self.stats.imported += len(to_insert)
+            return
+        hashes = self.hash_passwords([cleaned for _, cleaned, _ in to_insert], executor)
+        users = [
+            User(
+                username=cleaned["username"],
+                email=cleaned["email"],
+                first_name=cleaned["first_name"],
+                last_name=cleaned["last_name"],
+                password=password,
+            )
+            for (_, cleaned, _), password in zip(to_insert, hashes)
+        ]
+        self.insert(to_insert, users)
+
+    def hash_passwords(self, rows, executor):
+        """
+        Hash plaintext passwords (in the pool when there is one); rows
+        without a password get an unusable one, prehashed rows are kept.
+        """
+        plain = [row["password"] for row in rows if row["password"] and not row["password_hash"]]
+        if executor is not None and plain:
+            chunksize = max(1, len(plain) // ((self.workers or os.cpu_count() or 1) * 4))
+            hashed = iter(list(executor.map(make_password, plain, chunksize=chunksize)))
+        else:
+            hashed = iter([make_password(password) for password in plain])
+        result = []
+        for row in rows:
+            if row["password_hash"]:
+                result.append(row["password_hash"])
+            elif row["password"]:
+                result.append(next(hashed))
+            else:
+                result.append(make_password(None))
+        return result
+
+    def insert(self, to_insert, users):
+        """
+        One INSERT per chunk. Rows that lost a race with a concurrent
+        signup are skipped by the database and reported as conflicts:
+        a row is ours if it carries the (salted, unique) hash we generated.
+        """
+        with transaction.atomic():
+            User.objects.bulk_create(users, ignore_conflicts=True)
+            inserted = dict(
+                User.objects.filter(username__in=[u.username for u in users])
+                .values_list("username", "password")
+            )
+            ours = []
+            for (line_no, _, row), user in zip(to_insert, users):
+                if inserted.get(user.username) == user.password:
+                    ours.append(user.username)
+                else:
+                    self.reject(line_no, "Conflicts with an existing user.", row)
+            self.stats.imported += len(ours)
+            if self.welcome_email and ours:
+                ids = User.objects.filter(username__in=ours).values_list("id", flat=True)
+                enqueue_jobs([
+                    send_welcome_email.job(idempotency_key=f"welcome-email:{pk}", user_id=pk)
+                    for pk in ids
+                ])
@@ -0,0 +1,14 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from accounts.authentication import invalidate_auth_state
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    """
+    Role or is_active changes must reach stateless JWT checks right away.
+    """
+    invalidate_auth_state(instance.pk)
@@ -0,0 +1,31 @@
+import json
+import logging
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+from jobs.registry import task
+
+User = get_user_model()
+audit_logger = logging.getLogger("audit")
+
+
+@task("accounts.send_welcome_email")
+def send_welcome_email(user_id):
+    user = User.objects.filter(pk=user_id).only("username", "email").first()
+    if user is None or not user.email:
+        return
+    send_mail(
+        subject="Welcome!",
+        message=f"Hi {user.username}, your account is ready.",
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        recipient_list=[user.email],
+    )
+
+
+@task("accounts.record_audit_event")
+def record_audit_event(event, **data):
+    """
+    One JSON line per event on the "audit" logger; route it to durable
+    storage in LOGGING.
+    """
+    audit_logger.info(json.dumps({"event": event, **data}, sort_keys=True, default=str))
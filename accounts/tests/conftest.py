@@ -3,10 +3,23 @@
 import pytest
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
+from core.throttling import get_counter_store
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def query_budgets(settings):
+    """Fail any request that exceeds its view's query budget or looks like N+1."""
+    settings.QUERY_BUDGET_MODE = "raise"
+
+
+@pytest.fixture(autouse=True)
+def throttle_counters():
+    """Start every test with empty rate-limit counters."""
+    get_counter_store().clear()
+
+
 @pytest.fixture
 def api_client():
     """Return DRF test client without authentication."""
@@ -0,0 +1,63 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from django.contrib.auth import get_user_model
+from subscriptions.models import Plan, Subscription
+
+User = get_user_model()
+
+
+class ClaimsJWTAuthenticationTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user1", email="user1@example.com", password="userpass"
+        )
+        self.plan = Plan.objects.create(name="Basic Plan")
+        Subscription.objects.create(user=self.user, plan=self.plan)
+
+        resp = self.client.post(reverse("user-login"), {
+            "username": "user1",
+            "password": "userpass",
+        }, format="json")
+        self.token = resp.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+        self.entitlements_url = reverse("subscriptions:entitlement-list")
+        self.user_list_url = reverse("user-list-create")
+
+    def test_login_embeds_claims(self):
+        """Access token carries role and plan claims"""
+        token = AccessToken(self.token)
+        self.assertEqual(token["user_id"], str(self.user.id))
+        self.assertFalse(token["is_staff"])
+        self.assertFalse(token["is_superuser"])
+        self.assertEqual(token["plan_id"], self.plan.id)
+
+    def test_authenticated_request_skips_user_lookup(self):
+        """Warm requests authenticate without touching the user table"""
+        self.client.get(self.entitlements_url)
+        with self.assertNumQueries(0):
+            resp = self.client.get(self.entitlements_url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data["user"], self.user.id)
+
+    def test_promote_takes_effect_with_old_token(self):
+        """Role changes apply without re-login"""
+        self.client.get(self.entitlements_url)
+        self.assertEqual(self.client.get(self.user_list_url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.user.save()
+        self.assertEqual(self.client.get(self.user_list_url).status_code, status.HTTP_200_OK)
+
+    def test_deactivated_user_is_rejected(self):
+        """Deactivation revokes outstanding tokens"""
+        self.client.get(self.entitlements_url)
+        self.user.is_active = False
+        self.user.save()
+        resp = self.client.get(self.entitlements_url)
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from django.core.management import call_command
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from jobs.models import Job
+
+User = get_user_model()
+
+
+class ImportUsersCommandTest(TestCase):
+
+    def setUp(self):
+        User.objects.create_user(username="existing", email="existing@example.com", password="pass1234")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def write(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def run_import(self, path, *args):
+        out = io.StringIO()
+        call_command("import_users", path, "--workers", "0", *args, stdout=out)
+        return out.getvalue()
+
+    def test_csv_import_with_rejects(self):
+        """Valid rows are inserted in bulk; bad and conflicting rows are reported"""
+        path = self.write("users.csv", "\n".join([
+            "username,email,password,first_name,last_name",
+            "alice,alice@example.com,Secret123!,Alice,A",
+            "bob,bob@EXAMPLE.com,,Bob,B",
+            "alice,alice2@example.com,Secret123!,,",
+            "carol,not-an-email,Secret123!,,",
+            "existing,new@example.com,Secret123!,,",
+            "dave,existing@example.com,Secret123!,,",
+            ",nobody@example.com,Secret123!,,",
+        ]))
+        rejects = os.path.join(self.tmp.name, "rejects.csv")
+        output = self.run_import(path, "--batch-size", "3", "--rejects", rejects)
+
+        self.assertIn("2 users imported, 5 rejected", output)
+        alice = User.objects.get(username="alice")
+        self.assertTrue(alice.check_password("Secret123!"))
+        self.assertEqual((alice.first_name, alice.last_name), ("Alice", "A"))
+        bob = User.objects.get(username="bob")
+        self.assertEqual(bob.email, "bob@example.com")
+        self.assertFalse(bob.has_usable_password())
+
+        with open(rejects, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(
+            [(row["line"], row["reason"]) for row in rows],
+            [
+                ("4", "Duplicate username in file."),
+                ("5", "Enter a valid email address."),
+                ("6", "Username already exists."),
+                ("7", "Email already exists."),
+                ("8", "Missing username."),
+            ],
+        )
+
+    def test_jsonl_with_prehashed_passwords(self):
+        """JSONL rows may carry Django password hashes; malformed lines are rejected"""
+        from django.contrib.auth.hashers import make_password
+        lines = [
+            json.dumps({"username": "erin", "email": "erin@example.com", "password_hash": make_password("pw-erin-1")}),
+            "{not json",
+            json.dumps({"username": "frank", "email": "frank@example.com", "password_hash": "plaintext"}),
+        ]
+        output = self.run_import(self.write("users.jsonl", "\n".join(lines)))
+        self.assertIn("1 users imported, 2 rejected", output)
+        self.assertTrue(User.objects.get(username="erin").check_password("pw-erin-1"))
+
+    def test_dry_run_inserts_nothing(self):
+        """--dry-run only validates"""
+        path = self.write("users.csv", "username,email,password\ngina,gina@example.com,Secret123!\n")
+        output = self.run_import(path, "--dry-run")
+        self.assertIn("1 users would be imported", output)
+        self.assertFalse(User.objects.filter(username="gina").exists())
+
+    def test_process_pool_hashing_and_welcome_email(self):
+        """Passwords hashed in worker processes verify; welcome emails are queued"""
+        path = self.write("users.csv", "username,email,password\nhank,hank@example.com,Secret123!\n"
+                                        "ivy,ivy@example.com,Secret456!\n")
+        out = io.StringIO()
+        call_command("import_users", path, "--workers", "2", "--welcome-email", stdout=out)
+        self.assertTrue(User.objects.get(username="hank").check_password("Secret123!"))
+        self.assertTrue(User.objects.get(username="ivy").check_password("Secret456!"))
+        self.assertEqual(Job.objects.filter(name="accounts.send_welcome_email").count(), 2)
@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from core.metrics import registry
+
+User = get_user_model()
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class LoginPipelineTest(TestCase):
+
+    def setUp(self):
+        registry.reset()
+        self.user = User.objects.create_user(username="user1", email="user1@example.com", password="userpass")
+        self.login_url = reverse("user-login")
+        self.async_login_url = reverse("async-user-login")
+
+    def hash_count(self, outcome):
+        histogram = registry.get_histogram("auth_password_hash_seconds", (("outcome", outcome),))
+        return histogram.count if histogram else 0
+
+    def test_login_records_hash_time(self):
+        """Each login attempt's hashing time lands in the metrics registry"""
+        resp = self.client.post(self.login_url, {"username": "user1", "password": "userpass"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.client.post(self.login_url, {"username": "user1", "password": "wrong"})
+        self.client.post(self.login_url, {"username": "nobody", "password": "userpass"})
+        self.assertEqual(self.hash_count("valid"), 1)
+        self.assertEqual(self.hash_count("invalid"), 1)
+        self.assertEqual(self.hash_count("unknown_user"), 1)
+        self.assertIn("auth_password_hash_seconds_bucket", registry.render())
+
+    def test_outdated_hash_is_upgraded_on_login(self):
+        """Changing PASSWORD_HASH_ITERATIONS rehashes at the next successful login"""
+        with self.settings(PASSWORD_HASH_ITERATIONS=2000):
+            self.client.post(self.login_url, {"username": "user1", "password": "wrong"})
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith("pbkdf2_sha256$1000$"))
+
+            resp = self.client.post(self.login_url, {"username": "user1", "password": "userpass"})
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith("pbkdf2_sha256$2000$"))
+            self.assertEqual(registry.get_counter("auth_password_rehash_total", ()), 1)
+            self.assertEqual(self.hash_count("rehashed"), 1)
+
+            resp = self.client.post(self.login_url, {"username": "user1", "password": "userpass"})
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertEqual(registry.get_counter("auth_password_rehash_total", ()), 1)
+
+    async def test_async_login(self):
+        """async/login/ issues the same claims tokens"""
+        resp = await self.async_client.post(
+            self.async_login_url, {"username": "user1", "password": "userpass"}, content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        token = AccessToken(resp.json()["access"])
+        self.assertEqual(token["user_id"], str(self.user.id))
+        self.assertIn("is_staff", token)
+        self.assertEqual(self.hash_count("valid"), 1)
+
+    async def test_async_login_rejects_bad_credentials(self):
+        resp = await self.async_client.post(
+            self.async_login_url, {"username": "user1", "password": "wrong"}, content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(resp.json()["detail"], "No active account found with the given credentials")
+
+        resp = await self.async_client.post(
+            self.async_login_url, {"username": "user1"}, content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("password", resp.json())
@@ -0,0 +1,97 @@
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework_simplejwt.tokens import RefreshToken
+
+User = get_user_model()
+
+RATES = {
+    "login_ip": "3/min",
+    "login_user": "2/min",
+    "token_refresh_ip": "100/min",
+    "token_refresh_user": "2/min",
+    "register": "2/hour",
+}
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class AuthThrottleTest(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.dict(SimpleRateThrottle.THROTTLE_RATES, RATES)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.user = User.objects.create_user(username="user1", email="user1@example.com", password="userpass")
+        self.login_url = reverse("user-login")
+
+    def login(self, username, ip="10.0.0.1", password="wrong"):
+        return self.client.post(
+            self.login_url, {"username": username, "password": password}, format="json", REMOTE_ADDR=ip
+        )
+
+    def test_login_is_limited_per_ip(self):
+        """One IP trying many accounts is cut off before hashing more passwords"""
+        codes = [self.login(f"user{i}").status_code for i in range(4)]
+        self.assertEqual(codes[:3], [status.HTTP_401_UNAUTHORIZED] * 3)
+        self.assertEqual(codes[3], status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", self.login("user9"))
+        self.assertEqual(self.login("user9", ip="10.0.0.2").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_is_limited_per_username(self):
+        """Guesses against one account from many IPs are limited too"""
+        self.login("user1", ip="10.0.0.1")
+        self.login("USER1", ip="10.0.0.2")
+        resp = self.login("user1", ip="10.0.0.3", password="userpass")
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.login("other", ip="10.0.0.3").status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_registration_is_limited_per_ip(self):
+        url = reverse("user-list-create")
+        codes = [
+            self.client.post(url, {
+                "username": f"new{i}", "email": f"new{i}@example.com", "password": "StrongPass123!",
+            }, format="json").status_code
+            for i in range(3)
+        ]
+        self.assertEqual(codes, [status.HTTP_201_CREATED] * 2 + [status.HTTP_429_TOO_MANY_REQUESTS])
+
+    def test_token_refresh_is_limited_per_user(self):
+        refresh = self.login("user1", password="userpass").data["refresh"]
+        url = reverse("token-refresh")
+        codes = [
+            self.client.post(url, {"refresh": refresh}, format="json", REMOTE_ADDR=f"10.0.1.{i}").status_code
+            for i in range(3)
+        ]
+        self.assertEqual(codes, [status.HTTP_200_OK] * 2 + [status.HTTP_429_TOO_MANY_REQUESTS])
+
+    def test_root_token_routes_share_the_limits(self):
+        """api/token/ and api/token/refresh/ cannot be used to bypass the account routes' throttles"""
+        self.login("user1", ip="10.0.0.1")
+        self.login("user1", ip="10.0.0.2")
+        resp = self.client.post(
+            reverse("token_obtain_pair"), {"username": "user1", "password": "userpass"},
+            format="json", REMOTE_ADDR="10.0.0.3",
+        )
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        refresh = str(RefreshToken.for_user(self.user))
+        for _ in range(2):
+            resp = self.client.post(reverse("token-refresh"), {"refresh": refresh}, format="json")
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        resp = self.client.post(reverse("token_refresh"), {"refresh": refresh}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    async def test_async_login_is_throttled(self):
+        url = reverse("async-user-login")
+        for _ in range(2):
+            await self.async_client.post(url, {"username": "user1", "password": "wrong"}, content_type="application/json")
+        resp = await self.async_client.post(
+            url, {"username": "user1", "password": "userpass"}, content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", resp)
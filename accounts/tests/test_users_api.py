@@ -97,7 +97,7 @@ class UserViewSetTest(APITestCase):
         # List users
         resp = self.client.get(self.user_list_url)
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        self.assertGreaterEqual(len(resp.data), 2)  # user + admin
+        self.assertGreaterEqual(len(resp.data["results"]), 2)  # user + admin
 
         # Promote regular user
         resp = self.client.post(self.promote_url(self.user_id))
@@ -109,6 +109,22 @@ class UserViewSetTest(APITestCase):
         self.assertTrue(user.is_superuser)
         self.assertTrue(user.is_staff)
 
+    def test_admin_list_is_cursor_paginated(self):
+        """User list pages with an opaque cursor in id order"""
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.admin_token}")
+
+        resp = self.client.get(self.user_list_url, {"page_size": 1})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data["results"]), 1)
+        self.assertIsNone(resp.data["previous"])
+        self.assertIn("cursor=", resp.data["next"])
+        first_id = resp.data["results"][0]["id"]
+
+        resp = self.client.get(resp.data["next"])
+        self.assertEqual(len(resp.data["results"]), 1)
+        self.assertGreater(resp.data["results"][0]["id"], first_id)
+        self.assertIsNone(resp.data["next"])
+
     def test_user_detail_retrieve_update(self):
         """User can retrieve/update own detail (detail endpoint)"""
         self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.user_token}")
@@ -0,0 +1,71 @@
+from django.contrib.auth import get_user_model
+from rest_framework.exceptions import ParseError, UnsupportedMediaType
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from core.throttling import SlidingWindowThrottle
+
+User = get_user_model()
+
+
+class IPThrottle(SlidingWindowThrottle):
+    """
+    Per client IP (REMOTE_ADDR, or X-Forwarded-For with NUM_PROXIES).
+    """
+    def get_cache_key(self, request, view):
+        return self.cache_format % {"scope": self.scope, "ident": self.get_ident(request)}
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = "login_ip"
+
+
+class LoginUserThrottle(SlidingWindowThrottle):
+    """
+    Per submitted username, so a credential-stuffing run against one
+    account is limited however many IPs it comes from.
+    """
+    scope = "login_user"
+
+    def get_cache_key(self, request, view):
+        try:
+            username = request.data.get(User.USERNAME_FIELD)
+        except (AttributeError, ParseError, UnsupportedMediaType):
+            return None
+        if not isinstance(username, str) or not username:
+            return None
+        ident = User.normalize_username(username).casefold()
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class TokenRefreshIPThrottle(IPThrottle):
+    scope = "token_refresh_ip"
+
+
+class TokenRefreshUserThrottle(SlidingWindowThrottle):
+    """
+    Per user of a (signature-checked) refresh token; invalid tokens are
+    left to the view and the IP throttle.
+    """
+    scope = "token_refresh_user"
+
+    def get_cache_key(self, request, view):
+        try:
+            raw = request.data.get("refresh")
+            if not isinstance(raw, str):
+                return None
+            token = RefreshToken(raw)
+        except (AttributeError, ParseError, UnsupportedMediaType, TokenError):
+            return None
+        ident = token.get(jwt_settings.USER_ID_CLAIM)
+        if ident is None:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+
+class RegisterThrottle(IPThrottle):
+    scope = "register"
+
+
+LOGIN_THROTTLES = [LoginIPThrottle, LoginUserThrottle]
+TOKEN_REFRESH_THROTTLES = [TokenRefreshIPThrottle, TokenRefreshUserThrottle]
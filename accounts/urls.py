@@ -1,6 +1,8 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from accounts.throttling import LOGIN_THROTTLES, TOKEN_REFRESH_THROTTLES
 from accounts.views.user import UserViewSet
+from accounts.views import asynchronous
 
 user_list = UserViewSet.as_view({
     "get": "list",
@@ -19,10 +21,20 @@ urlpatterns = [
     path("<int:pk>/", user_detail, name="user-detail"),  # GET/PUT/PATCH/DELETE user
 
     # JWT
-    path("login/", TokenObtainPairView.as_view(), name="user-login"),
-    path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
+    path("login/", TokenObtainPairView.as_view(throttle_classes=LOGIN_THROTTLES), name="user-login"),
+    path(
+        "token/refresh/",
+        TokenRefreshView.as_view(throttle_classes=TOKEN_REFRESH_THROTTLES),
+        name="token-refresh",
+    ),
 
     # Custom actions
     path("me/", UserViewSet.as_view({"get": "me", "put": "me", "patch": "me"}), name="user-me"),
     path("<int:pk>/promote/", UserViewSet.as_view({"post": "promote"}), name="user-promote"),
+    # (action kwargs carry the export renderers, as a router would pass them)
+    path("export/", UserViewSet.as_view({"get": "export"}, **UserViewSet.export.kwargs), name="user-export"),
+
+    # Native async reads for ASGI servers
+    path("async/me/", asynchronous.me, name="async-user-me"),
+    path("async/login/", asynchronous.login, name="async-user-login"),
 ]
\ No newline at end of file
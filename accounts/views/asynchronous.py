@@ -0,0 +1,61 @@
+# accounts/views/asynchronous.py
+import json
+from asgiref.sync import sync_to_async
+from django.contrib import auth
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from rest_framework.exceptions import AuthenticationFailed, NotFound, ParseError, ValidationError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from accounts.serializers import UserSerializer
+from accounts.serializers.token import ClaimsTokenObtainPairSerializer
+from accounts.throttling import LOGIN_THROTTLES
+from core.asyncapi import async_api_view
+
+User = get_user_model()
+
+
+@async_api_view(query_budget=2)
+async def me(request):
+    """
+    GET /api/accounts/async/me/ -> Get current user (native async, read-only)
+    """
+    user = request.user
+    if not isinstance(user, User):
+        # token-claims user: the profile lives in the DB row
+        try:
+            user = await User.objects.aget(pk=user.pk)
+        except User.DoesNotExist:
+            raise NotFound()
+    return UserSerializer(user).data
+
+
+@async_api_view(methods=("POST",), query_budget=3, authenticated=False, throttle_classes=LOGIN_THROTTLES)
+async def login(request):
+    """
+    POST /api/accounts/async/login/ -> Obtain a JWT pair, like login/.
+    The password check is awaited on the login hash pool, so slow hashes
+    don't hold up the event loop.
+    """
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        raise ParseError()
+    if not isinstance(data, dict):
+        raise ParseError()
+    fields = (User.USERNAME_FIELD, "password")
+    missing = {
+        field: ["This field is required."]
+        for field in fields
+        if not isinstance(data.get(field), str) or not data[field]
+    }
+    if missing:
+        raise ValidationError(missing)
+
+    user = await auth.aauthenticate(request, **{field: data[field] for field in fields})
+    if not jwt_settings.USER_AUTHENTICATION_RULE(user):
+        serializer = ClaimsTokenObtainPairSerializer
+        raise AuthenticationFailed(serializer.default_error_messages["no_active_account"], "no_active_account")
+    refresh = await sync_to_async(ClaimsTokenObtainPairSerializer.get_token)(user)
+    if jwt_settings.UPDATE_LAST_LOGIN:
+        await sync_to_async(update_last_login)(None, user)
+    return {"refresh": str(refresh), "access": str(refresh.access_token)}
@@ -3,6 +3,11 @@ from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.contrib.auth import get_user_model
+from django.db import transaction
+from accounts.exports import user_export
+from accounts.tasks import record_audit_event
+from accounts.throttling import RegisterThrottle
+from core.export import EXPORT_RENDERERS
 from accounts.serializers import UserCreateSerializer, UserSerializer
 from accounts.permissions import IsSelfOrAdmin 
 
@@ -18,6 +23,17 @@ class UserViewSet(viewsets.ModelViewSet):
     """
 
     queryset = User.objects.all()
+    # enforced by core.querybudget in tests
+    query_budget = {
+        "create": 6,
+        "list": 3,
+        "retrieve": 3,
+        "update": 3,
+        "partial_update": 3,
+        "me": 3,
+        "promote": 5,
+        "export": 2,
+    }
 
     def get_serializer_class(self):
         # Use different serializers for creation vs. other actions
@@ -30,15 +46,23 @@ class UserViewSet(viewsets.ModelViewSet):
         - Registration (create) is public
         - Listing all users is admin-only
         - Retrieve/update profile requires authentication
-        - Promote requires admin
+        - Promote and export require admin
         """
         if self.action == "create":
             return [permissions.AllowAny()]
-        elif self.action in ["list", "promote"]:
+        elif self.action in ["list", "promote", "export"]:
             return [permissions.IsAdminUser()]
         else:  # retrieve, update, partial_update, destroy
             return [permissions.IsAuthenticated(), IsSelfOrAdmin()]
 
+    def get_throttles(self):
+        """
+        Registration is rate-limited per IP (it hashes a password).
+        """
+        if self.action == "create":
+            return [RegisterThrottle()]
+        return super().get_throttles()
+
     @action(detail=False, methods=["get", "put", "patch"], url_path="me")
     def me(self, request):
         """
@@ -46,6 +70,9 @@ class UserViewSet(viewsets.ModelViewSet):
         PUT/PATCH /api/accounts/me/ -> Update current user
         """
         user = request.user
+        if not isinstance(user, User):
+            # token-claims user: the profile lives in the DB row
+            user = User.objects.get(pk=user.pk)
         if request.method == "GET":
             serializer = self.get_serializer(user)
             return Response(serializer.data)
@@ -61,10 +88,19 @@ class UserViewSet(viewsets.ModelViewSet):
         POST /api/accounts/{id}/promote/ -> Promote user to superuser (admin-only)
         """
         user = self.get_object()
-        user.is_superuser = True
-        user.is_staff = True
-        user.save()
+        with transaction.atomic():
+            user.is_superuser = True
+            user.is_staff = True
+            user.save()
+            record_audit_event.enqueue(event="user.promoted", user_id=user.pk, by=request.user.pk)
         return Response(
             {"status": f"User {user.username} promoted to superuser."},
             status=status.HTTP_200_OK,
         )
+
+    @action(detail=False, methods=["get"], url_path="export", renderer_classes=EXPORT_RENDERERS)
+    def export(self, request):
+        """
+        GET /api/accounts/export/?format=csv|jsonl -> stream every user (admin-only)
+        """
+        return user_export().response(request.accepted_renderer.format)
@@ -0,0 +1,131 @@
+"""
+Load and latency benchmarks for the API.
+
+    python -m benchmarks.run                         # small scale, in-memory SQLite
+    python -m benchmarks.run --scale medium --db file --db-path /tmp/bench.sqlite3
+    python -m benchmarks.run --scenarios catalog entitlement --requests 2000 --json out.json
+
+Runs every scenario through Django's in-process test server against a
+freshly created test database (migrations must exist; run reset_db first)
+and reports p50/p95/p99 latency, requests/sec and queries/request.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+
+def percentile(sorted_values, pct):
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def run_scenario(ctx, factory, requests, warmup):
+    from django.db import connections
+    from core.middleware import QueryStats
+
+    for _ in range(warmup):
+        factory(ctx)()
+
+    latencies = []
+    queries = 0
+    errors = 0
+    elapsed = 0
+    for _ in range(requests):
+        request = factory(ctx)
+        stats = QueryStats()
+        with connections["default"].execute_wrapper(stats):
+            start = time.perf_counter_ns()
+            response = request()
+            duration = time.perf_counter_ns() - start
+        elapsed += duration
+        latencies.append(duration / 1e6)
+        queries += stats.count
+        if response.status_code >= 400:
+            errors += 1
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "rps": round(requests / (elapsed / 1e9), 1) if elapsed else 0.0,
+        "queries_per_request": round(queries / requests, 2) if requests else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", default="small", help="small, medium or large")
+    parser.add_argument("--users", type=int, help="override the scale's user count")
+    parser.add_argument("--db", choices=["memory", "file"], default="memory")
+    parser.add_argument("--db-path", default="bench.sqlite3", help="database file for --db file")
+    parser.add_argument("--requests", type=int, default=500, help="timed requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--scenarios", nargs="+", help="subset of scenarios to run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    import django
+
+    django.setup()
+    from django.conf import settings
+
+    # every scenario comes from one client IP: measure the app, not the rate limits
+    settings.THROTTLE_ENABLED = False
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+    from benchmarks.scenarios import SCENARIOS, Context
+    from benchmarks.seed import SCALES, seed
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = set(names) - set(SCENARIOS)
+    if unknown or args.scale not in SCALES:
+        parser.error(f"unknown scenario(s) {sorted(unknown)} or scale {args.scale!r}")
+
+    scale = dict(SCALES[args.scale])
+    if args.users:
+        scale["users"] = args.users
+
+    connection.settings_dict["TEST"]["NAME"] = args.db_path if args.db == "file" else None
+    setup_test_environment(debug=False)
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        started = time.perf_counter()
+        data = seed(rng_seed=args.seed, **scale)
+        print(f"seeded {scale} in {time.perf_counter() - started:.1f}s ({args.db} db)", file=sys.stderr)
+
+        ctx = Context(Client(), data, random.Random(args.seed))
+        results = {}
+        for name in names:
+            results[name] = run_scenario(ctx, SCENARIOS[name], args.requests, args.warmup)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    header = f"{'scenario':<18}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'q/req':>8}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<18}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}"
+            f"{r['rps']:>10}{r['queries_per_request']:>8}{r['errors']:>8}"
+        )
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"scale": scale, "db": args.db, "results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark scenarios. Each scenario prepares its request outside the
+timed section and returns a zero-argument callable performing exactly
+one HTTP request through the in-process test server.
+"""
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from accounts.serializers.token import ClaimsTokenObtainPairSerializer
+from benchmarks.seed import BENCH_PASSWORD
+from subscriptions.models import Subscription
+
+User = get_user_model()
+
+
+class Context:
+    def __init__(self, client, data, rng):
+        self.client = client
+        self.data = data
+        self.rng = rng
+        self._tokens = {}
+        self.active = dict(
+            Subscription.objects.filter(is_active=True).values_list("user_id", "id")
+        )
+
+    def auth(self, user_id):
+        token = self._tokens.get(user_id)
+        if token is None:
+            user = User.objects.get(pk=user_id)
+            token = str(ClaimsTokenObtainPairSerializer.get_token(user).access_token)
+            self._tokens[user_id] = token
+        return {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def random_user(self):
+        return self.rng.choice(self.data["users"])
+
+    def random_subscriber(self):
+        return self.rng.choice(list(self.active))
+
+
+def login(ctx):
+    index = ctx.rng.randrange(len(ctx.data["users"]))
+    payload = {"username": f"bench{index:06d}", "password": BENCH_PASSWORD}
+    url = reverse("user-login")
+    return lambda: ctx.client.post(url, payload, content_type="application/json")
+
+
+def catalog(ctx):
+    headers = ctx.auth(ctx.random_user())
+    url = reverse("subscriptions:plan-list")
+    return lambda: ctx.client.get(url, **headers)
+
+
+def subscription_list(ctx):
+    headers = ctx.auth(ctx.random_subscriber())
+    url = reverse("subscriptions:subscription-list")
+    return lambda: ctx.client.get(url, **headers)
+
+
+def change_plan(ctx):
+    user_id = ctx.random_subscriber()
+    headers = ctx.auth(user_id)
+    sub_id = ctx.active[user_id]
+    current = Subscription.objects.values_list("plan_id", flat=True).get(pk=sub_id)
+    plan_id = ctx.rng.choice([p for p in ctx.data["plans"] if p != current])
+    url = reverse("subscriptions:subscription-change-plan", args=[sub_id])
+
+    def request():
+        response = ctx.client.post(url, {"plan_id": plan_id}, content_type="application/json", **headers)
+        # plan changes may hand back a new subscription row
+        if response.status_code == 200:
+            ctx.active[user_id] = response.json()["id"]
+        return response
+    return request
+
+
+def entitlement(ctx):
+    headers = ctx.auth(ctx.random_subscriber())
+    url = reverse("subscriptions:entitlement-detail", args=[ctx.rng.choice(ctx.data["features"])])
+    return lambda: ctx.client.get(url, **headers)
+
+
+SCENARIOS = {
+    "login": login,
+    "catalog": catalog,
+    "subscription_list": subscription_list,
+    "change_plan": change_plan,
+    "entitlement": entitlement,
+}
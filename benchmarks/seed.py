@@ -0,0 +1,66 @@
+"""
+Deterministic data generator for the benchmark suite.
+"""
+import random
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from subscriptions.models import Feature, Plan, Subscription
+from subscriptions.services.active_plan import set_active_plans
+from subscriptions.services.feature_index import update_plan_bits
+
+User = get_user_model()
+
+BENCH_PASSWORD = "bench-pass-123"
+
+SCALES = {
+    # users, features, plans, features per plan, share of users subscribed
+    "small": dict(users=200, features=20, plans=5, features_per_plan=8, subscribed=0.8),
+    "medium": dict(users=5000, features=60, plans=15, features_per_plan=20, subscribed=0.8),
+    "large": dict(users=50000, features=200, plans=40, features_per_plan=50, subscribed=0.8),
+}
+
+
+def seed(users, features, plans, features_per_plan, subscribed, rng_seed=42, batch_size=2000):
+    """
+    Create the catalog, users and subscriptions with bulk inserts.
+    Every user shares one precomputed password hash, so seeding
+    does not pay PBKDF2 per row while logins still verify for real.
+    """
+    rng = random.Random(rng_seed)
+    password = make_password(BENCH_PASSWORD)
+
+    feature_objs = Feature.objects.bulk_create(
+        [Feature(name=f"feature-{i:04d}", bit=i) for i in range(features)], batch_size=batch_size
+    )
+    plan_objs = Plan.objects.bulk_create(
+        [Plan(name=f"plan-{i:03d}") for i in range(plans)], batch_size=batch_size
+    )
+    Through = Plan.features.through
+    links = []
+    for plan in plan_objs:
+        for feature in rng.sample(feature_objs, min(features_per_plan, len(feature_objs))):
+            links.append(Through(plan_id=plan.id, feature_id=feature.id))
+    Through.objects.bulk_create(links, batch_size=batch_size)
+    update_plan_bits([plan.id for plan in plan_objs])
+
+    user_objs = User.objects.bulk_create(
+        [
+            User(username=f"bench{i:06d}", email=f"bench{i:06d}@example.com", password=password)
+            for i in range(users)
+        ],
+        batch_size=batch_size,
+    )
+    subscriptions = Subscription.objects.bulk_create(
+        [
+            Subscription(user_id=user.id, plan_id=rng.choice(plan_objs).id)
+            for user in user_objs
+            if rng.random() < subscribed
+        ],
+        batch_size=batch_size,
+    )
+    set_active_plans(subscriptions)
+    return {
+        "users": [u.id for u in user_objs],
+        "features": [f.name for f in feature_objs],
+        "plans": [p.id for p in plan_objs],
+    }
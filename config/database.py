@@ -0,0 +1,78 @@
+"""
+Database settings built from environment variables (see .env.example).
+
+SQLite defaults are tuned for a web workload: WAL so readers never block
+the writer, synchronous=NORMAL (durable in WAL mode except on power loss),
+a busy timeout instead of instant "database is locked" errors, IMMEDIATE
+transactions so concurrent writers queue on the lock rather than deadlock
+while upgrading a read lock, memory-mapped reads and persistent connections.
+
+Read replicas (see core.replicas) are listed in DB_REPLICAS.
+"""
+import os
+
+
+def env_str(name, default):
+    return os.environ.get(name, default)
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return default if value in (None, "") else int(value)
+
+
+def env_bool(name, default):
+    value = os.environ.get(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def sqlite_pragmas():
+    pragmas = [
+        f"PRAGMA journal_mode={env_str('DB_JOURNAL_MODE', 'WAL')}",
+        f"PRAGMA synchronous={env_str('DB_SYNCHRONOUS', 'NORMAL')}",
+        f"PRAGMA mmap_size={env_int('DB_MMAP_SIZE', 256 * 1024 * 1024)}",
+    ]
+    cache_size = env_int("DB_CACHE_SIZE", 0)
+    if cache_size:
+        # negative = KiB, positive = pages (SQLite semantics)
+        pragmas.append(f"PRAGMA cache_size={cache_size}")
+    return pragmas
+
+
+def sqlite_database(default_name):
+    """
+    Return a DATABASES entry for SQLite.
+    """
+    options = {
+        "init_command": ";".join(sqlite_pragmas()),
+        # seconds to wait on a locked database before raising
+        "timeout": env_int("DB_BUSY_TIMEOUT_MS", 5000) / 1000,
+    }
+    transaction_mode = env_str("DB_TRANSACTION_MODE", "IMMEDIATE")
+    if transaction_mode:
+        options["transaction_mode"] = transaction_mode
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": env_str("DB_NAME", str(default_name)),
+        "OPTIONS": options,
+        "CONN_MAX_AGE": env_int("DB_CONN_MAX_AGE", 60),
+        "CONN_HEALTH_CHECKS": env_bool("DB_CONN_HEALTH_CHECKS", True),
+    }
+
+
+def sqlite_replicas():
+    """
+    Return DATABASES entries "replica1", "replica2", ... for the
+    comma-separated SQLite paths in DB_REPLICAS (none by default).
+    Test runs mirror them to "default".
+    """
+    paths = [path.strip() for path in env_str("DB_REPLICAS", "").split(",") if path.strip()]
+    replicas = {}
+    for n, path in enumerate(paths, start=1):
+        database = sqlite_database(path)
+        database["NAME"] = path
+        database["TEST"] = {"MIRROR": "default"}
+        replicas[f"replica{n}"] = database
+    return replicas
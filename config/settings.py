@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 
+from config.database import sqlite_database, sqlite_replicas
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -45,6 +47,7 @@ INSTALLED_APPS = [
     # Local apps
     "accounts", 
     'subscriptions',
+    "jobs",
 
 ]
 
@@ -58,11 +61,78 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         # 'rest_framework.authentication.SessionAuthentication',
         # 'rest_framework.authentication.BasicAuthentication',
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        # JWTAuthentication without the per-request user query
+        "accounts.authentication.ClaimsJWTAuthentication",
+    ],
+    # orjson-backed JSON when installed, stdlib otherwise (same bytes either way)
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
     ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Keyset pagination: list endpoints never run OFFSET scans
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.IdCursorPagination',
+    'PAGE_SIZE': 50,
+    # Sliding-window limits for the endpoints that hash passwords (see accounts.throttling)
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_user': '10/min',
+        'token_refresh_ip': '60/min',
+        'token_refresh_user': '30/min',
+        'register': '20/hour',
+    },
+    # Set to the number of reverse proxies in front of the app so client IPs
+    # come from X-Forwarded-For
+    'NUM_PROXIES': None,
+}
+
+# Throttle counters (core.throttling). LocalCounterStore is per process; with
+# several workers on one host use the shared SQLite file:
+#   THROTTLE_COUNTER_STORE = "core.throttling.SQLiteCounterStore"
+#   THROTTLE_COUNTER_OPTIONS = {"path": "/var/run/app/throttle.sqlite3"}
+THROTTLE_ENABLED = True
+THROTTLE_COUNTER_STORE = "core.throttling.LocalCounterStore"
+THROTTLE_COUNTER_OPTIONS = {}
+
+SIMPLE_JWT = {
+    # Embed role/plan claims at login so requests can skip the user lookup
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.token.ClaimsTokenObtainPairSerializer",
+    "TOKEN_USER_CLASS": "accounts.authentication.ClaimsUser",
+}
+
+# Seconds a user's (is_active, is_staff, is_superuser) stays cached for
+# stateless JWT checks; User saves invalidate it immediately.
+AUTH_STATE_CACHE_TTL = 30
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "subscription-service",
+    }
 }
 
+# Per-plan feature sets and per-user active plan ids
+# (see subscriptions.selectors.entitlement). None = until invalidated.
+ENTITLEMENT_CACHE_TIMEOUT = None
+
+# Serialized plan catalog pages, keyed by catalog version
+# (see subscriptions.services.catalog).
+CATALOG_CACHE_TIMEOUT = 60 * 60 * 24
+CATALOG_LOCAL_PAGES = 256           # most recent pages also kept in each process
+
 MIDDLEWARE = [
+    # outermost, so latency covers the whole middleware stack
+    "core.middleware.RequestTimingMiddleware",
+    # gzip/brotli; must wrap everything that produces the body
+    "core.compression.CompressionMiddleware",
+
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -71,9 +141,57 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
-    "core.middleware.RequestTimingMiddleware",
+    # off in production; the test conftests switch it to "raise"
+    "core.querybudget.QueryBudgetMiddleware",
 ]
 
+# Response compression (core.compression)
+COMPRESSION_MIN_SIZE = 1024          # bytes; smaller bodies are sent as-is
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5       # used only if the brotli package is installed
+COMPRESSION_CACHE_SIZE = 256         # compressed ETag'd bodies kept per process
+
+# SQL auditing (core.querybudget): "off", "warn" (log) or "raise".
+QUERY_BUDGET_MODE = "off"
+# Same query shape this many times in one request = possible N+1
+QUERY_N_PLUS_ONE_THRESHOLD = 3
+
+# Request metrics (core.middleware / core.metrics), scraped at /metrics/.
+# Disabling removes the middleware from the stack entirely.
+METRICS_ENABLED = True
+# Client addresses allowed to scrape; empty = nobody
+METRICS_ALLOWED_IPS = ["127.0.0.1", "::1"]
+
+# Subscription change feed (subscriptions.views.change_feed)
+CHANGE_FEED_PAGE_SIZE = 500          # max events per response
+CHANGE_FEED_MAX_WAIT = 25            # seconds a long-poll may wait (?wait=)
+CHANGE_FEED_POLL_INTERVAL = 0.5      # seconds between outbox checks while waiting
+CHANGE_FEED_STREAM_SECONDS = 300     # SSE connections end after this; clients resume
+CHANGE_FEED_HEARTBEAT = 15           # seconds between SSE keepalive comments
+CHANGE_FEED_RETRY_MS = 2000          # SSE reconnect delay sent to clients
+
+# Background jobs (jobs app): `python manage.py run_jobs`
+JOBS_WORKER_PROCESSES = 1
+JOBS_WORKER_THREADS = 4
+JOBS_POLL_INTERVAL = 1.0             # seconds an idle worker thread sleeps
+JOBS_MAX_ATTEMPTS = 5
+JOBS_RETRY_BACKOFF = 10              # seconds; doubles per attempt
+JOBS_RETRY_BACKOFF_MAX = 60 * 60
+JOBS_LOCK_TIMEOUT = 300              # running jobs older than this are reclaimed
+
+# `manage.py import_users`: rows validated, hashed and inserted per chunk
+USER_IMPORT_BATCH_SIZE = 1000
+
+# Streaming exports (core.export): rows fetched per DB round trip and per written chunk
+EXPORT_CHUNK_SIZE = 2000
+
+# Billing sync job target (subscriptions.tasks); None = skip
+BILLING_SYNC_URL = None
+BILLING_SYNC_TIMEOUT = 10
+
+EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+DEFAULT_FROM_EMAIL = "no-reply@subscription-service.local"
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -97,13 +215,40 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Tuned SQLite (WAL, busy timeout, persistent connections); every knob can be
+# overridden through DB_* environment variables, see config/database.py and .env.example
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3'),
+    **sqlite_replicas(),
 }
 
+# Read replicas (core.replicas): only the list/retrieve reads of the ViewSets using
+# ReplicaReadMixin go to them. After writing a subscription, a user reads from
+# default for READ_REPLICA_STICKY_SECONDS so they see their own change.
+DATABASE_ROUTERS = ["core.replicas.ReadReplicaRouter"]
+READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+READ_REPLICA_STICKY_SECONDS = 5
+
+
+# Password hashing
+# Logins check passwords through accounts.backends.PooledModelBackend: hashing
+# runs on LOGIN_HASH_WORKERS threads per process (default: CPU count), and hashes
+# made with a different PASSWORD_HASH_ITERATIONS are upgraded on the next login.
+# Size the iterations against the login p99 (auth_password_hash_seconds in /metrics).
+
+AUTHENTICATION_BACKENDS = ["accounts.backends.PooledModelBackend"]
+
+PASSWORD_HASHERS = [
+    "accounts.hashers.TunedPBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+PASSWORD_HASH_ITERATIONS = 1_000_000
+LOGIN_HASH_WORKERS = None
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -170,6 +315,11 @@ LOGGING = {
             "level": "INFO",            # show INFO and above
             "propagate": False,         # don’t bubble up to root logger
         },
+        "audit": {                      # accounts.tasks.record_audit_event
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
         "django": {                     # keep Django's logs too
             "handlers": ["console"],
             "level": "WARNING",         # adjust as needed
@@ -17,6 +17,8 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path,include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from accounts.throttling import LOGIN_THROTTLES, TOKEN_REFRESH_THROTTLES
+from core.views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -25,7 +27,14 @@ urlpatterns = [
     path("api/subscriptions/", include("subscriptions.urls")), # subscription endpoints
 
 
-    # JWT Auth endpoints
-    path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    # JWT Auth endpoints (same throttles and counters as accounts/login/ and token/refresh/)
+    path("api/token/", TokenObtainPairView.as_view(throttle_classes=LOGIN_THROTTLES), name="token_obtain_pair"),
+    path(
+        "api/token/refresh/",
+        TokenRefreshView.as_view(throttle_classes=TOKEN_REFRESH_THROTTLES),
+        name="token_refresh",
+    ),
+
+    # Prometheus scrape endpoint (see core.metrics)
+    path("metrics/", metrics_view, name="metrics"),
 ]
@@ -0,0 +1,124 @@
+"""
+Native async read endpoints for ASGI deployments.
+
+`async_api_view` wraps an `async def view(request, ...)` with the parts of
+DRF the read paths need, without DRF's sync request cycle: authentication
+through the configured authenticators' `aauthenticate()`, an
+authenticated-only check, method checks, JSON rendering and DRF-style
+error bodies. Views raise DRF exceptions (NotFound, PermissionDenied, ...)
+as usual and return plain data or an HttpResponse.
+"""
+import functools
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse, HttpResponseBase
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from core.renderers import FastJSONRenderer
+
+_renderer = FastJSONRenderer()
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    return HttpResponse(_renderer.render(data), status=status, content_type=_renderer.media_type)
+
+
+def _error_response(exc):
+    detail = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    response = json_response(detail, status=exc.status_code)
+    if getattr(exc, "wait", None):
+        response["Retry-After"] = "%d" % exc.wait
+    return response
+
+
+async def aauthenticate(request):
+    """
+    Run the async-capable DEFAULT_AUTHENTICATION_CLASSES in order.
+    Returns (user, auth, authenticator) or (None, None, None).
+    """
+    for authenticator_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        authenticator = authenticator_class()
+        if not hasattr(authenticator, "aauthenticate"):
+            continue
+        result = await authenticator.aauthenticate(request)
+        if result is not None:
+            return (*result, authenticator)
+    return None, None, None
+
+
+def drf_request(request, parsers=()):
+    """
+    Wrap a Django request for DRF helpers that expect one (paginators,
+    throttles; pass parsers for ones that read request.data).
+    """
+    return Request(request, parsers=parsers)
+
+
+def check_throttles(request, throttle_classes):
+    """
+    DRF's APIView.check_throttles() for async views; raises Throttled.
+    """
+    request.body  # cache the body so the view can still read it
+    wrapped = drf_request(request, [parser() for parser in api_settings.DEFAULT_PARSER_CLASSES])
+    throttles = [throttle_class() for throttle_class in throttle_classes]
+    waits = [throttle.wait() for throttle in throttles if not throttle.allow_request(wrapped, None)]
+    if waits:
+        raise exceptions.Throttled(wait=max((wait for wait in waits if wait is not None), default=None))
+
+
+def async_api_view(methods=("GET",), query_budget=None, n_plus_one_exempt=False, authenticated=True,
+                   throttle_classes=()):
+    """
+    Decorate an async view. request.user/request.auth are set from the
+    token; anonymous requests get 401 like DRF's IsAuthenticated.
+    authenticated=False skips authentication (public views like login);
+    throttle_classes are checked after it, as in DRF.
+    query_budget and n_plus_one_exempt are read by core.querybudget like
+    a ViewSet's (n_plus_one_exempt=True for views that poll).
+    """
+    allowed = [method.upper() for method in methods]
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in allowed:
+                response = _error_response(exceptions.MethodNotAllowed(request.method))
+                response["Allow"] = ", ".join(allowed)
+                return response
+            authenticator = None
+            try:
+                if authenticated:
+                    user, auth, authenticator = await aauthenticate(request)
+                    if user is None:
+                        raise exceptions.NotAuthenticated()
+                    request.user, request.auth = user, auth
+                else:
+                    request.user, request.auth = AnonymousUser(), None
+                if throttle_classes:
+                    check_throttles(request, throttle_classes)
+                result = await view(request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                response = _error_response(exc)
+                if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                    header = _authenticate_header(authenticator, request)
+                    if header:
+                        response["WWW-Authenticate"] = header
+                return response
+            if isinstance(result, HttpResponseBase):
+                return result
+            return json_response(result)
+
+        wrapper.query_budget = query_budget
+        wrapper.n_plus_one_exempt = True if n_plus_one_exempt else ()
+        return wrapper
+
+    return decorator
+
+
+def _authenticate_header(authenticator, request):
+    if authenticator is None:
+        classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+        if not classes:
+            return None
+        authenticator = classes[0]()
+    return authenticator.authenticate_header(request)
@@ -0,0 +1,139 @@
+"""
+Negotiated response compression.
+
+Compresses compressible bodies of at least COMPRESSION_MIN_SIZE bytes with
+brotli (when the `brotli` package is installed and the client accepts it)
+or gzip. JSON responses that carry an ETag (e.g. the plan catalog) are
+versioned by it, so their compressed bytes are kept in a small in-process
+LRU and reused instead of recompressing identical payloads. Other types
+are never cached: the browsable API's HTML embeds the requesting user's
+name and CSRF token under the same ETag.
+"""
+import gzip
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from core.middleware import AsyncCapableMiddleware
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+_ACCEPT_ENCODING = _lazy_re_compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*")
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml")
+_CACHEABLE_TYPES = ("application/json",)
+
+
+def accepted_encoding(header):
+    """
+    Pick "br" or "gzip" from an Accept-Encoding header, or None.
+    Brotli wins ties; q=0 excludes an encoding.
+    """
+    offered = {}
+    for part in header.split(","):
+        match = _ACCEPT_ENCODING.fullmatch(part)
+        if match:
+            name, q = match.group(1).lower(), match.group(2)
+            try:
+                offered[name] = float(q) if q is not None else 1.0
+            except ValueError:
+                continue
+    candidates = (["br"] if brotli is not None else []) + ["gzip"]
+    best, best_q = None, 0.0
+    for name in candidates:
+        q = offered.get(name, offered.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=getattr(settings, "COMPRESSION_BROTLI_QUALITY", 5))
+    # mtime=0 keeps the output deterministic for identical payloads
+    return gzip.compress(body, compresslevel=getattr(settings, "COMPRESSION_GZIP_LEVEL", 6), mtime=0)
+
+
+class CompressedBodyCache:
+    """
+    Thread-safe LRU of compressed bodies keyed by
+    (path, content type, ETag, encoding).
+    """
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+
+    def set(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+compressed_cache = CompressedBodyCache(getattr(settings, "COMPRESSION_CACHE_SIZE", 256))
+
+
+class CompressionMiddleware(AsyncCapableMiddleware):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process(request, await self.get_response(request))
+
+    def process(self, request, response):
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        if (
+            response.streaming
+            or response.status_code != 200
+            or response.has_header("Content-Encoding")
+            or len(response.content) < self.min_size
+            or "no-transform" in response.get("Cache-Control", "")
+            or not response.get("Content-Type", "").startswith(_COMPRESSIBLE_TYPES)
+        ):
+            return response
+
+        encoding = accepted_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        etag = response.get("ETag")
+        cacheable = etag and response["Content-Type"].startswith(_CACHEABLE_TYPES)
+        key = (request.get_full_path(), response["Content-Type"], etag, encoding) if cacheable else None
+        body = compressed_cache.get(key) if key else None
+        if body is None:
+            body = compress(response.content, encoding)
+            if len(body) >= len(response.content):
+                return response
+            if key:
+                compressed_cache.set(key, body)
+
+        response.content = body
+        response["Content-Length"] = str(len(body))
+        response["Content-Encoding"] = encoding
+        if etag and not etag.startswith("W/"):
+            # the compressed entity differs byte-wise from the identity one
+            response["ETag"] = "W/" + etag
+        return response
@@ -0,0 +1,20 @@
+"""
+Conditional GETs for cached reads, shared by the ViewSets and the async
+views: the caller derives an ETag from whatever versions its cache keys
+use, answers 304 when it matches, and marks every response revalidate-only.
+"""
+from django.utils.cache import patch_cache_control
+
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get("If-None-Match", "")
+    return etag in if_none_match or if_none_match.strip() == "*"
+
+
+def set_etag(response, etag):
+    """
+    Attach `etag` and make clients revalidate before reusing the response.
+    """
+    response["ETag"] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,126 @@
+"""
+In-process request metrics with Prometheus text exposition.
+
+Each worker process keeps its own registry; scrape every worker
+(or aggregate in Prometheus) when running several.
+"""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+COUNTERS = {
+    "http_requests_total": "Requests by method, route and status.",
+}
+HISTOGRAMS = {
+    "http_request_duration_seconds": ("Request latency.", LATENCY_BUCKETS),
+    "http_request_db_queries": ("SQL queries per request.", QUERY_COUNT_BUCKETS),
+    "http_request_db_duration_seconds": ("SQL time per request.", LATENCY_BUCKETS),
+    "http_response_size_bytes": ("Response body size.", SIZE_BUCKETS),
+}
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _series(name, labels):
+    if not labels:
+        return name
+    rendered = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in labels
+    )
+    return f"{name}{{{rendered}}}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = defaultdict(int)
+            self._histograms = {}
+
+    def register_histogram(self, name, help_text, buckets):
+        HISTOGRAMS.setdefault(name, (help_text, buckets))
+
+    def register_counter(self, name, help_text):
+        COUNTERS.setdefault(name, help_text)
+
+    def inc(self, name, labels, amount=1):
+        """
+        labels: tuple of (name, value) pairs, e.g. (("route", "user-me"),)
+        """
+        with self._lock:
+            self._counters[(name, labels)] += amount
+
+    def observe(self, name, labels, value):
+        with self._lock:
+            hist = self._histograms.get((name, labels))
+            if hist is None:
+                hist = self._histograms[(name, labels)] = Histogram(HISTOGRAMS[name][1])
+            hist.observe(value)
+
+    def get_histogram(self, name, labels):
+        return self._histograms.get((name, labels))
+
+    def get_counter(self, name, labels):
+        return self._counters.get((name, labels), 0)
+
+    def render(self):
+        """
+        Return all metrics in Prometheus text format 0.0.4.
+        """
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+            snapshot = [
+                (key, hist.buckets, list(hist.counts), hist.sum, hist.count)
+                for key, hist in histograms
+            ]
+
+        lines = []
+        seen = set()
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {COUNTERS[name]}")
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f"{_series(name, labels)} {value}")
+
+        for (name, labels), buckets, counts, total, count in snapshot:
+            if name not in seen:
+                seen.add(name)
+                lines.append(f"# HELP {name} {HISTOGRAMS[name][0]}")
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, bucket_count in zip(buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                bucket_labels = labels + (("le", bound if bound == "+Inf" else _format_value(bound)),)
+                lines.append(f"{_series(name + '_bucket', bucket_labels)} {cumulative}")
+            lines.append(f"{_series(name + '_sum', labels)} {_format_value(total)}")
+            lines.append(f"{_series(name + '_count', labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
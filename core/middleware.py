@@ -1,19 +1,117 @@
 import time
 import logging
+from contextlib import ExitStack
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from core.metrics import registry
 
 logger = logging.getLogger(__name__)
 
-class RequestTimingMiddleware:
+
+class QueryStats:
+    """
+    connection.execute_wrapper hook counting queries and SQL time.
+    """
+    __slots__ = ("count", "duration_ns")
+
+    def __init__(self):
+        self.count = 0
+        self.duration_ns = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter_ns()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration_ns += time.perf_counter_ns() - start
+            self.count += 1
+
+
+def install_execute_wrapper(stack, wrapper):
+    """
+    Enter `wrapper` on every connection of the current thread.
+    Async middleware runs this through sync_to_async so the wrapper lands
+    on the connections the async ORM's thread-sensitive calls use.
+    """
+    for conn in connections.all():
+        stack.enter_context(conn.execute_wrapper(wrapper))
+
+
+class AsyncCapableMiddleware:
+    """
+    Base for this project's middleware: Django picks sync or async per
+    request stack, so native async views under ASGI don't force a thread
+    hop here. Subclasses implement __call__ for sync and __acall__ for async.
+    """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+
+def route_name(request):
+    """
+    Metric label for a request: the resolved URL name, never the raw path,
+    so /api/accounts/1/ and /api/accounts/2/ share one series.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    return match.view_name or match.route or "<unnamed>"
+
+
+class RequestTimingMiddleware(AsyncCapableMiddleware):
+    """
+    Records per-route latency, DB queries/time and response size into
+    core.metrics.registry. With METRICS_ENABLED = False Django drops the
+    middleware entirely, so disabled metrics cost nothing per request.
+    """
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        super().__init__(get_response)
 
     def __call__(self, request):
-        start_time = time.time()
-        
-        # Process the request and get the response
-        response = self.get_response(request)
-        
-        duration = time.time() - start_time
-        logger.info(f"{request.path} took {duration:.4f} seconds")
-        
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = QueryStats()
+        start = time.perf_counter_ns()
+
+        with ExitStack() as stack:
+            install_execute_wrapper(stack, stats)
+            response = self.get_response(request)
+
+        self.record(request, response, start, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = QueryStats()
+        start = time.perf_counter_ns()
+
+        stack = ExitStack()
+        await sync_to_async(install_execute_wrapper)(stack, stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+
+        self.record(request, response, start, stats)
         return response
+
+    def record(self, request, response, start, stats):
+        duration = (time.perf_counter_ns() - start) / 1e9
+        labels = (("method", request.method), ("route", route_name(request)))
+        registry.inc("http_requests_total", labels + (("status", response.status_code),))
+        registry.observe("http_request_duration_seconds", labels, duration)
+        registry.observe("http_request_db_queries", labels, stats.count)
+        registry.observe("http_request_db_duration_seconds", labels, stats.duration_ns / 1e9)
+        if not response.streaming:
+            registry.observe("http_response_size_bytes", labels, len(response.content))
+
+        logger.debug("%s %s took %.4f seconds (%d queries)", request.method, request.path, duration, stats.count)
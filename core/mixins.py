@@ -0,0 +1,67 @@
+from contextlib import ExitStack
+from types import SimpleNamespace
+from django.http import Http404
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from core.replicas import pin_to_primary, replica_reads
+
+
+class ReadPlanMixin:
+    """
+    Serve list/retrieve from `.values()` rows rendered by `read_plan`
+    (see subscriptions.serializers.read) instead of the ModelSerializer.
+    Writes keep using `serializer_class`.
+    """
+    read_plan = None
+
+    def get_read_queryset(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        return queryset.select_related(None).prefetch_related(None).values(*self.read_plan.columns())
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.get_read_queryset()
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.read_plan.render(page))
+        return Response(self.read_plan.render(list(queryset)))
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        filter_kwargs = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            row = self.get_read_queryset().get(**filter_kwargs)
+        except (self.get_queryset().model.DoesNotExist, ValueError, TypeError):
+            raise Http404
+        # object permissions only read attributes such as user_id
+        self.check_object_permissions(request, SimpleNamespace(**row))
+        return Response(self.read_plan.render([row])[0])
+
+
+class ReplicaReadMixin:
+    """
+    Run the safe-method requests of `replica_actions` with their reads on a
+    replica (see core.replicas). The block is entered once the user is
+    authenticated, so a pinned user reads from "default". pin_on_write
+    pins the user after each successful write through this ViewSet.
+    """
+    replica_actions = ("list", "retrieve")
+    pin_on_write = False
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and self.action in self.replica_actions:
+            self._replica_reads = ExitStack()
+            self._replica_reads.enter_context(replica_reads(request.user.pk))
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        reads = getattr(self, "_replica_reads", None)
+        if reads is not None:
+            reads.close()
+        elif (
+            self.pin_on_write
+            and request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            pin_to_primary(request.user.pk)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -0,0 +1,126 @@
+from urllib.parse import urlsplit
+from rest_framework.pagination import CursorPagination
+
+
+def _flip(field):
+    return field[1:] if field.startswith("-") else "-" + field
+
+
+def portable_links(data):
+    """
+    Paginated data with the next/previous links cut down to their query
+    string, so a cached page holds no host or path of the request that
+    built it. absolute_links() turns them back into URLs.
+    """
+    links = {
+        name: None if data[name] is None else urlsplit(data[name]).query
+        for name in ("next", "previous")
+    }
+    return {**data, **links}
+
+
+def absolute_links(request, data):
+    """
+    Undo portable_links() for `request`'s host and path.
+    """
+    links = {
+        name: None if data[name] is None
+        else request.build_absolute_uri(request.path + (f"?{data[name]}" if data[name] else ""))
+        for name in ("next", "previous")
+    }
+    return {**data, **links}
+
+
+class AsyncCursorPaginationMixin:
+    """
+    DRF's cursor pagination with the page query built here, so sync and
+    async views share it: page_query() turns the request's cursor into an
+    ordered, filtered and sliced queryset, and set_page() records the rows
+    it returned. Cursors, links and the envelope stay DRF's.
+    """
+
+    def page_query(self, queryset, request, view=None):
+        """
+        The keyset query for this request's page (one extra row to tell
+        whether another page follows), or None if pagination is off.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        offset, reverse, position = self.cursor or (0, False, None)
+
+        queryset = queryset.order_by(*(map(_flip, self.ordering) if reverse else self.ordering))
+        if position is not None:
+            # walking against the ordering of its first field: "lt", else "gt"
+            field = self.ordering[0]
+            lookup = "lt" if reverse != field.startswith("-") else "gt"
+            queryset = queryset.filter(**{f"{field.lstrip('-')}__{lookup}": position})
+        return queryset[offset:offset + self.page_size + 1]
+
+    def set_page(self, results):
+        """
+        Keep the page out of page_query()'s rows and work out the
+        next/previous positions, as CursorPagination.paginate_queryset does.
+        """
+        offset, reverse, position = self.cursor or (0, False, None)
+        self.page = list(results[:self.page_size])
+        has_following = len(results) > len(self.page)
+        following = self._get_position_from_instance(results[-1], self.ordering) if has_following else None
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None or offset > 0
+            self.has_previous = has_following
+            if self.has_next:
+                self.next_position = position
+            if self.has_previous:
+                self.previous_position = following
+        else:
+            self.has_next = has_following
+            self.has_previous = position is not None or offset > 0
+            if self.has_next:
+                self.next_position = following
+            if self.has_previous:
+                self.previous_position = position
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def page_key(self, request):
+        """
+        The page a request asks for, from the cursor and the page size in
+        effect only, e.g. for caching pages: other query parameters and
+        out-of-range sizes do not make new keys.
+        """
+        return f"{request.query_params.get(self.cursor_query_param, '')}:{self.get_page_size(request)}"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        query = self.page_query(queryset, request, view)
+        return None if query is None else self.set_page(list(query))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        query = self.page_query(queryset, request, view)
+        return None if query is None else self.set_page([row async for row in query])
+
+
+class IdCursorPagination(AsyncCursorPaginationMixin, CursorPagination):
+    """
+    Keyset pagination on the primary key.
+    The cursor is an opaque base64 token, and every page is a
+    `WHERE id > <last id> ORDER BY id LIMIT n` range scan,
+    so deep pages cost the same as the first one.
+    """
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+
+class StartDateCursorPagination(IdCursorPagination):
+    """
+    Newest-first keyset pagination for subscriptions,
+    backed by the (user, -start_date) index.
+    """
+    ordering = ("-start_date", "-id")
@@ -0,0 +1,130 @@
+"""
+Development/test-time SQL auditing.
+
+QueryBudgetMiddleware records every query of a request and checks it
+against the view's declared budget and for N+1 patterns (the same query
+shape repeated within one request). ViewSets declare budgets as:
+
+    query_budget = 3                       # every action
+    query_budget = {"list": 2, "retrieve": 2}
+    n_plus_one_exempt = ["bulk_change_plan"]   # actions allowed to repeat shapes
+
+and async views as @async_api_view(query_budget=3) (see core.asyncapi),
+where n_plus_one_exempt=True exempts the whole view.
+"""
+import logging
+import re
+from collections import Counter
+from contextlib import ExitStack
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from core.middleware import AsyncCapableMiddleware, install_execute_wrapper
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT", "BEGIN", "COMMIT", "ROLLBACK")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """
+    Raised in "raise" mode so the offending request fails its test.
+    """
+
+
+def query_shape(sql):
+    """
+    Normalize SQL to its shape: parameters are already placeholders,
+    and IN lists of any length collapse to one form.
+    """
+    return _IN_LIST.sub("IN (...)", sql)
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper hook keeping every statement of a request.
+    """
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def repeated_shapes(self, threshold):
+        shapes = Counter(
+            query_shape(sql) for sql in self.queries
+            if not sql.lstrip().upper().startswith(_TRANSACTION_CONTROL)
+        )
+        return {shape: n for shape, n in shapes.items() if n >= threshold}
+
+
+def get_view_budget(view_class, action):
+    budget = getattr(view_class, "query_budget", None)
+    if isinstance(budget, dict):
+        return budget.get(action)
+    return budget
+
+
+class QueryBudgetMiddleware(AsyncCapableMiddleware):
+    """
+    Enabled by QUERY_BUDGET_MODE = "warn" (log) or "raise" (fail the request);
+    any other value removes it from the stack.
+    """
+    def __init__(self, get_response):
+        self.mode = getattr(settings, "QUERY_BUDGET_MODE", "off")
+        if self.mode not in ("warn", "raise"):
+            raise MiddlewareNotUsed
+        self.threshold = getattr(settings, "QUERY_N_PLUS_ONE_THRESHOLD", 3)
+        super().__init__(get_response)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        with ExitStack() as stack:
+            install_execute_wrapper(stack, recorder)
+            response = self.get_response(request)
+        self.report(request, recorder)
+        return response
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        stack = ExitStack()
+        await sync_to_async(install_execute_wrapper)(stack, recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self.report(request, recorder)
+        return response
+
+    def report(self, request, recorder):
+        problems = self.check(request, recorder)
+        if problems:
+            message = f"{request.method} {request.path}: " + "; ".join(problems)
+            if self.mode == "raise":
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+    def check(self, request, recorder):
+        match = getattr(request, "resolver_match", None)
+        view_func = match.func if match else None
+        # ViewSets carry the budget on the class, async_api_view functions on the view
+        view_class = getattr(view_func, "cls", view_func)
+        actions = getattr(view_func, "actions", None) or {}
+        action = actions.get(request.method.lower())
+
+        problems = []
+        budget = get_view_budget(view_class, action) if view_class else None
+        if budget is not None and len(recorder.queries) > budget:
+            problems.append(
+                f"{len(recorder.queries)} queries exceed the budget of {budget} "
+                f"for {view_class.__name__}.{action}"
+            )
+        exempt = getattr(view_class, "n_plus_one_exempt", ())
+        if exempt is not True and action not in exempt:
+            for shape, count in recorder.repeated_shapes(self.threshold).items():
+                problems.append(f"possible N+1, query repeated {count}x: {shape}")
+        return problems
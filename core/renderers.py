@@ -0,0 +1,81 @@
+import csv
+import io
+import json
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+_ORJSON_OPTIONS = 0
+if orjson is not None:
+    # datetimes go through DRF's encoder so "+00:00" still becomes "Z"
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed.
+
+    Compact output is byte-for-byte what the stdlib renderer produces;
+    indented (browsable/`; indent=` requests), ASCII-only output and
+    anything orjson refuses fall back to the stdlib path.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self._default, option=_ORJSON_OPTIONS)
+        except (TypeError, orjson.JSONEncodeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        # same JavaScript-safety escapes as JSONRenderer
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+    def _default(self, obj):
+        return (self.encoder_class or JSONEncoder)().default(obj)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Selects CSV exports (core.export) through DRF negotiation (?format=csv or
+    Accept: text/csv). Exports stream their own body; render() only
+    handles error payloads.
+    """
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        buffer = io.StringIO()
+        rows = data if isinstance(data, list) else [data]
+        writer = csv.writer(buffer)
+        for row in rows:
+            if isinstance(row, dict):
+                writer.writerow(row.keys())
+                writer.writerow(row.values())
+            else:
+                writer.writerow([row])
+        return buffer.getvalue().encode(self.charset)
+
+
+class JSONLinesRenderer(BaseRenderer):
+    """
+    JSON Lines counterpart of CSVRenderer (?format=jsonl).
+    """
+    media_type = "application/x-ndjson"
+    format = "jsonl"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        return "".join(json.dumps(row, default=str) + "\n" for row in rows).encode(self.charset)
+
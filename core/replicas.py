@@ -0,0 +1,109 @@
+"""
+Read-replica routing.
+
+Replicas are the database aliases listed in READ_REPLICAS. They are opt-in:
+reads go to a replica only inside `replica_reads()`, which ReplicaReadMixin
+enters for the safe-method requests of a ViewSet's `replica_actions`.
+Everything else, writes included, uses "default", so code that reads its
+own writes (services, signals, cache fills) keeps working unchanged.
+
+Read-your-writes: after a user writes through a ViewSet with
+pin_on_write = True, their routed reads stay on "default" for
+READ_REPLICA_STICKY_SECONDS, long enough for the replicas to catch up.
+"""
+import random
+import sqlite3
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_KEY = "db:pin:{}"
+
+_read_alias = ContextVar("read_alias", default=None)
+
+
+def get_replicas():
+    return list(getattr(settings, "READ_REPLICAS", ()))
+
+
+def pin_to_primary(user_id):
+    """
+    Route `user_id`'s replica reads to "default" for the sticky window.
+    """
+    seconds = getattr(settings, "READ_REPLICA_STICKY_SECONDS", 5)
+    if seconds:
+        cache.set(PIN_KEY.format(user_id), True, seconds)
+
+
+def is_pinned(user_id):
+    return user_id is not None and cache.get(PIN_KEY.format(user_id), False)
+
+
+@contextmanager
+def replica_reads(user_id=None):
+    """
+    Send the reads in this block to one replica (picked at random), or to
+    "default" when none is configured or `user_id` is pinned.
+    """
+    replicas = get_replicas()
+    alias = DEFAULT_DB_ALIAS
+    if replicas and not is_pinned(user_id):
+        alias = random.choice(replicas)
+    token = _read_alias.set(alias)
+    try:
+        yield alias
+    finally:
+        _read_alias.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """
+    Read from "default" inside a replica_reads() block, e.g. when the
+    result is cached and must not be behind the primary.
+    """
+    token = _read_alias.set(DEFAULT_DB_ALIAS)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReadReplicaRouter:
+    """
+    DATABASE_ROUTERS entry: reads follow replica_reads()/primary_reads(),
+    writes and migrations always go to "default".
+    """
+    def db_for_read(self, model, **hints):
+        return _read_alias.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # never the replica an instance was loaded from
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_replicas()
+
+
+def sync_sqlite_replica(alias, source=DEFAULT_DB_ALIAS):
+    """
+    Copy the `source` SQLite database over the replica `alias` with the
+    backup API: a stand-in for replication when running replicas locally
+    and in tests. The copy sees `source`'s current transaction.
+    """
+    source_conn = connections[source]
+    source_conn.ensure_connection()
+    replica = connections[alias]
+    replica.close()
+    # the replica's own connection settings, so test databases (URIs) work too
+    target = sqlite3.connect(**replica.get_connection_params())
+    try:
+        source_conn.connection.backup(target)
+    finally:
+        target.close()
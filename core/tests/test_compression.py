@@ -0,0 +1,94 @@
+import gzip
+from unittest import mock
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from core import compression
+from core.compression import accepted_encoding
+from subscriptions.models import Feature, Plan
+
+User = get_user_model()
+
+
+class AcceptEncodingTest(APITestCase):
+
+    def test_negotiation(self):
+        """gzip is chosen when accepted and skipped when refused"""
+        with mock.patch.object(compression, "brotli", None):
+            self.assertEqual(accepted_encoding("gzip, deflate"), "gzip")
+            self.assertEqual(accepted_encoding("br;q=1.0, gzip;q=0.5"), "gzip")
+            self.assertEqual(accepted_encoding("*"), "gzip")
+            self.assertIsNone(accepted_encoding("gzip;q=0, identity"))
+            self.assertIsNone(accepted_encoding(""))
+
+    def test_prefers_brotli_when_available(self):
+        """br wins ties once the brotli package is importable"""
+        with mock.patch.object(compression, "brotli", object()):
+            self.assertEqual(accepted_encoding("gzip, br"), "br")
+            self.assertEqual(accepted_encoding("br;q=0.4, gzip"), "gzip")
+
+
+class CompressionMiddlewareTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        compression.compressed_cache.clear()
+        self.user = User.objects.create_user(username="user", email="user@example.com", password="userpass")
+        features = [Feature.objects.create(name=f"Feature {i}") for i in range(10)]
+        for i in range(20):
+            Plan.objects.create(name=f"Plan {i}").features.set(features)
+        self.url = reverse("subscriptions:plan-list")
+        self.client.force_authenticate(user=self.user)
+
+    def test_gzip_round_trip(self):
+        """Large catalog is gzipped and decompresses to the identity body"""
+        plain = self.client.get(self.url)
+        self.assertNotIn("Content-Encoding", plain)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertEqual(response["ETag"], "W/" + plain["ETag"])
+
+    def test_weak_etag_still_revalidates(self):
+        """Weak ETag of the compressed catalog yields 304"""
+        etag = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_catalog_compressed_once_per_version(self):
+        """Repeated catalog reads reuse the cached compressed bytes"""
+        first = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        with mock.patch.object(compression, "compress", side_effect=AssertionError) as compress:
+            second = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        compress.assert_not_called()
+        self.assertEqual(second.content, first.content)
+
+        Plan.objects.create(name="New Plan")
+        third = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertNotEqual(third["ETag"], first["ETag"])
+        self.assertIn(b"New Plan", gzip.decompress(third.content))
+
+    def test_html_is_not_shared_between_users(self):
+        """The browsable API page is compressed per request, never from another user's bytes"""
+        pages = {}
+        for username in ("alice", "bob"):
+            self.client.force_authenticate(user=User.objects.create_user(
+                username=username, email=f"{username}@example.com", password="pass1234"
+            ))
+            response = self.client.get(self.url, HTTP_ACCEPT="text/html", HTTP_ACCEPT_ENCODING="gzip")
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            pages[username] = gzip.decompress(response.content)
+        self.assertIn(b"alice", pages["alice"])
+        self.assertIn(b"bob", pages["bob"])
+        self.assertNotIn(b"alice", pages["bob"])
+
+    def test_small_bodies_are_not_compressed(self):
+        """Bodies under COMPRESSION_MIN_SIZE are sent as-is"""
+        response = self.client.get(reverse("subscriptions:subscription-list"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("Content-Encoding", response)
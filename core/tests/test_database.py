@@ -0,0 +1,88 @@
+import threading
+import time
+import pytest
+from django.db import OperationalError
+from django.db.utils import ConnectionHandler
+from config.database import sqlite_database
+
+
+def run_concurrent_writers(db_settings, threads=6, iterations=20):
+    """
+    Read-modify-write a counter from several threads, each with its own
+    connection, and return (lock errors, final counter value).
+    """
+    # own handler and alias, so the test database is never touched
+    handler = ConnectionHandler({"default": {"ENGINE": "django.db.backends.dummy"}, "concurrency": db_settings})
+    setup = handler["concurrency"]
+    with setup.cursor() as cursor:
+        cursor.execute("CREATE TABLE counter (id INTEGER PRIMARY KEY, n INTEGER)")
+        cursor.execute("INSERT INTO counter VALUES (1, 0)")
+    setup.close()
+
+    errors = []
+    barrier = threading.Barrier(threads)
+
+    def worker():
+        conn = handler["concurrency"]   # thread-local connection
+        conn.ensure_connection()
+        barrier.wait()
+        for _ in range(iterations):
+            try:
+                with conn.cursor() as cursor:
+                    # what transaction.atomic() issues for this connection
+                    cursor.execute(f"BEGIN {conn.transaction_mode or ''}")
+                    cursor.execute("SELECT n FROM counter WHERE id = 1")
+                    n = cursor.fetchone()[0]
+                    time.sleep(0.001)
+                    cursor.execute("UPDATE counter SET n = %s WHERE id = 1", [n + 1])
+                    cursor.execute("COMMIT")
+            except OperationalError as exc:
+                errors.append(str(exc))
+                conn.connection.rollback()
+        conn.close()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+
+    with setup.cursor() as cursor:
+        cursor.execute("SELECT n FROM counter WHERE id = 1")
+        total = cursor.fetchone()[0]
+    setup.close()
+    return errors, total
+
+
+@pytest.fixture
+def db_files(tmp_path, django_db_blocker):
+    """Temp dir for standalone SQLite files, outside the test database."""
+    with django_db_blocker.unblock():
+        yield tmp_path
+
+
+def test_plain_sqlite_hits_lock_errors(db_files):
+    """Deferred transactions deadlock when upgrading to a write lock"""
+    plain = {"ENGINE": "django.db.backends.sqlite3", "NAME": str(db_files / "plain.sqlite3")}
+    errors, total = run_concurrent_writers(plain)
+    assert errors
+    assert "database is locked" in errors[0]
+    assert total < 6 * 20
+
+
+def test_tuned_sqlite_serializes_writers_without_errors(db_files):
+    """WAL + busy timeout + IMMEDIATE transactions: no lock errors, no lost updates"""
+    tuned = sqlite_database(db_files / "tuned.sqlite3")
+    errors, total = run_concurrent_writers(tuned)
+    assert errors == []
+    assert total == 6 * 20
+
+
+def test_settings_read_environment(monkeypatch):
+    monkeypatch.setenv("DB_CONN_MAX_AGE", "0")
+    monkeypatch.setenv("DB_SYNCHRONOUS", "FULL")
+    monkeypatch.setenv("DB_TRANSACTION_MODE", "")
+    db = sqlite_database("x.sqlite3")
+    assert db["CONN_MAX_AGE"] == 0
+    assert "PRAGMA synchronous=FULL" in db["OPTIONS"]["init_command"]
+    assert "transaction_mode" not in db["OPTIONS"]
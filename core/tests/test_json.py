@@ -0,0 +1,59 @@
+import io
+from unittest import mock
+from django.test import TestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from django.contrib.auth import get_user_model
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+from subscriptions.models import Feature, Plan, Subscription
+from subscriptions.serializers import PlanSerializer, SubscriptionSerializer
+
+User = get_user_model()
+
+
+class FastJSONCompatibilityTest(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user(username="user", email="user@example.com", password="pass1234")
+        plan = Plan.objects.create(name="Pro Plan – Ünïcode ✓")
+        plan.features.set([
+            Feature.objects.create(name="Unlimited Storage"),
+            Feature.objects.create(name="line\u2028separator \"quoted\" \\ slash"),
+        ])
+        Plan.objects.create(name="Empty Plan")
+        self.subscription = Subscription.objects.create(user=user, plan=plan)
+
+    def assertSameBytes(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_plan_serializer_output_identical(self):
+        plans = Plan.objects.prefetch_related("features")
+        self.assertSameBytes(PlanSerializer(plans, many=True).data)
+        self.assertSameBytes({"next": None, "previous": None, "results": PlanSerializer(plans, many=True).data})
+
+    def test_subscription_serializer_output_identical(self):
+        self.assertSameBytes(SubscriptionSerializer(self.subscription).data)
+        self.assertSameBytes(SubscriptionSerializer([self.subscription], many=True).data)
+
+    def test_stdlib_fallback_without_orjson(self):
+        data = SubscriptionSerializer(self.subscription).data
+        with mock.patch("core.renderers.orjson", None):
+            self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_indented_output_uses_stdlib(self):
+        data = {"a": [1, 2]}
+        rendered = FastJSONRenderer().render(data, "application/json; indent=4")
+        self.assertEqual(rendered, JSONRenderer().render(data, "application/json; indent=4"))
+
+    def test_parser_matches_stdlib(self):
+        body = '{"plan_id": 3, "name": "Ünïcode", "ids": [1, 2.5, null, true]}'.encode()
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_parser_rejects_invalid_json(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"plan_id": NaN}'))
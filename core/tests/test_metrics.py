@@ -0,0 +1,82 @@
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from core.metrics import registry
+from core.middleware import RequestTimingMiddleware
+from subscriptions.models import Feature
+
+User = get_user_model()
+
+
+class RequestMetricsTest(APITestCase):
+
+    def setUp(self):
+        registry.reset()
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="userpass"
+        )
+        Feature.objects.create(name="Unlimited Storage")
+        self.client.force_authenticate(user=self.user)
+        self.labels = (("method", "GET"), ("route", "subscriptions:feature-list"))
+
+    def test_requests_are_recorded_per_route(self):
+        """Latency, queries and size are recorded under the URL name"""
+        self.client.get(reverse("subscriptions:feature-list"))
+        self.client.get(reverse("subscriptions:feature-list"))
+
+        duration = registry.get_histogram("http_request_duration_seconds", self.labels)
+        self.assertEqual(duration.count, 2)
+        self.assertGreater(duration.sum, 0)
+        queries = registry.get_histogram("http_request_db_queries", self.labels)
+        self.assertEqual(queries.sum, 2)   # one SELECT per list
+        self.assertEqual(registry.get_counter("http_requests_total", self.labels + (("status", 200),)), 2)
+        self.assertGreater(registry.get_histogram("http_response_size_bytes", self.labels).sum, 0)
+
+    def test_detail_routes_share_one_series(self):
+        """Different ids on one route are not separate series"""
+        self.client.get(reverse("user-detail", args=[self.user.id]))
+        self.client.get(reverse("user-detail", args=[self.user.id + 1]))
+        labels = (("method", "GET"), ("route", "user-detail"))
+        self.assertEqual(registry.get_histogram("http_request_duration_seconds", labels).count, 2)
+
+    def test_scrape_endpoint_renders_prometheus_text(self):
+        """/metrics/ exposes histograms in Prometheus text format"""
+        self.client.get(reverse("subscriptions:feature-list"))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = response.content.decode()
+        self.assertIn("# TYPE http_request_duration_seconds histogram", body)
+        self.assertIn(
+            'http_request_duration_seconds_count{method="GET",route="subscriptions:feature-list"} 1',
+            body,
+        )
+        self.assertIn(
+            'http_request_db_queries_bucket{method="GET",route="subscriptions:feature-list",le="+Inf"} 1',
+            body,
+        )
+
+    @override_settings(METRICS_ALLOWED_IPS=["10.0.0.1"])
+    def test_scrape_endpoint_ip_allowlist(self):
+        """Scrapes from other addresses are refused"""
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_scrape_endpoint_defaults_to_loopback(self):
+        """Only loopback may scrape out of the box; an empty list refuses everyone"""
+        self.assertEqual(self.client.get(reverse("metrics"), REMOTE_ADDR="::1").status_code, status.HTTP_200_OK)
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="203.0.113.7")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        with override_settings(METRICS_ALLOWED_IPS=[]):
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled_metrics_remove_middleware(self):
+        """Disabled metrics take the middleware out of the stack"""
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestTimingMiddleware(lambda request: None)
@@ -0,0 +1,64 @@
+from unittest import mock
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from core.querybudget import QueryBudgetExceeded, QueryRecorder, query_shape
+from subscriptions.models import Feature, Plan
+from subscriptions.serializers import PlanSerializer
+from subscriptions.serializers.read import PlanReadPlan
+from subscriptions.views.feature import FeatureViewSet
+from subscriptions.views.plan import PlanViewSet
+
+User = get_user_model()
+
+
+class NaivePlanReadPlan(PlanReadPlan):
+    @classmethod
+    def render(cls, rows):
+        return [PlanSerializer(Plan.objects.get(pk=row["id"])).data for row in rows]
+
+
+@override_settings(QUERY_BUDGET_MODE="raise", QUERY_N_PLUS_ONE_THRESHOLD=3)
+class QueryBudgetMiddlewareTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="userpass"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_within_budget_passes(self):
+        """Requests inside their budget are untouched"""
+        response = self.client.get(reverse("subscriptions:feature-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_budget_exceeded_raises(self):
+        """Exceeding the declared budget fails the request"""
+        with mock.patch.object(FeatureViewSet, "query_budget", {"list": 0}):
+            with self.assertRaisesMessage(QueryBudgetExceeded, "exceed the budget of 0 for FeatureViewSet.list"):
+                self.client.get(reverse("subscriptions:feature-list"))
+
+    def test_n_plus_one_detected(self):
+        """Serializing plans one by one is flagged as N+1"""
+        for i in range(3):
+            plan = Plan.objects.create(name=f"Plan {i}")
+            plan.features.add(Feature.objects.create(name=f"Feature {i}"))
+        with mock.patch.object(PlanViewSet, "read_plan", NaivePlanReadPlan):
+            with self.assertRaisesMessage(QueryBudgetExceeded, "possible N+1, query repeated 3x"):
+                self.client.get(reverse("subscriptions:plan-list"))
+
+
+class QueryShapeTest(APITestCase):
+
+    def test_in_lists_collapse(self):
+        self.assertEqual(
+            query_shape('SELECT 1 FROM t WHERE id IN (%s, %s, %s)'),
+            query_shape('SELECT 1 FROM t WHERE id IN (%s)'),
+        )
+
+    def test_transaction_control_ignored(self):
+        recorder = QueryRecorder()
+        recorder.queries = ['SAVEPOINT "s1"'] * 5 + ["SELECT 1"] * 2
+        self.assertEqual(recorder.repeated_shapes(3), {})
@@ -0,0 +1,107 @@
+import tempfile
+from pathlib import Path
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from core.replicas import (
+    PIN_KEY,
+    ReadReplicaRouter,
+    is_pinned,
+    pin_to_primary,
+    primary_reads,
+    replica_reads,
+    sync_sqlite_replica,
+)
+from subscriptions.models import Feature, Plan
+
+User = get_user_model()
+
+REPLICA = "replica"
+_tmpdir = None
+
+
+def setUpModule():
+    """
+    Test harness: a second SQLite file as the replica, updated only by
+    sync_sqlite_replica(), so replication lag is whatever the test makes it.
+    """
+    global _tmpdir
+    _tmpdir = tempfile.TemporaryDirectory()
+    connections.settings[REPLICA] = dict(
+        connections.settings["default"], NAME=_replica_path()
+    )
+
+
+def tearDownModule():
+    connections[REPLICA].close()
+    if connections.settings[REPLICA]["NAME"] == _replica_path():
+        # otherwise the test runner created (and will destroy) it
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+    _tmpdir.cleanup()
+
+
+def _replica_path():
+    return str(Path(_tmpdir.name) / "replica.sqlite3")
+
+
+@override_settings(READ_REPLICAS=[REPLICA], READ_REPLICA_STICKY_SECONDS=5)
+class ReplicaRoutingTest(TransactionTestCase):
+    databases = {"default", REPLICA}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="userpass"
+        )
+        self.plan = Plan.objects.create(name="Basic Plan")
+        sync_sqlite_replica(REPLICA)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_router_follows_read_context(self):
+        """Reads use a replica only inside replica_reads(); writes never do"""
+        router = ReadReplicaRouter()
+        self.assertEqual(router.db_for_read(Plan), "default")
+        with replica_reads(self.user.pk):
+            self.assertEqual(router.db_for_read(Plan), REPLICA)
+            self.assertEqual(router.db_for_write(Plan), "default")
+            with primary_reads():
+                self.assertEqual(router.db_for_read(Plan), "default")
+            self.assertEqual(router.db_for_read(Plan), REPLICA)
+        pin_to_primary(self.user.pk)
+        with replica_reads(self.user.pk):
+            self.assertEqual(router.db_for_read(Plan), "default")
+        self.assertFalse(router.allow_migrate(REPLICA, "subscriptions"))
+
+    def test_list_reads_lag_until_sync(self):
+        """Feature listing is served by the replica"""
+        url = reverse("subscriptions:feature-list")
+        Feature.objects.create(name="Unlimited Storage")
+        self.assertEqual(self.client.get(url).data["results"], [])
+        sync_sqlite_replica(REPLICA)
+        names = [row["name"] for row in self.client.get(url).data["results"]]
+        self.assertEqual(names, ["Unlimited Storage"])
+
+    def test_own_subscription_write_pins_reads(self):
+        """The writer sees their subscription at once; others wait for the replica"""
+        url = reverse("subscriptions:subscription-list")
+        response = self.client.post(url, {"plan_id": self.plan.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertTrue(is_pinned(self.user.pk))
+        self.assertEqual(len(self.client.get(url).data["results"]), 1)
+
+        cache.delete(PIN_KEY.format(self.user.pk))   # sticky window over, replica not caught up
+        self.assertEqual(self.client.get(url).data["results"], [])
+        sync_sqlite_replica(REPLICA)
+        self.assertEqual(len(self.client.get(url).data["results"]), 1)
+
+    def test_failed_write_does_not_pin(self):
+        url = reverse("subscriptions:subscription-list")
+        response = self.client.post(url, {"plan_id": 0}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(is_pinned(self.user.pk))
@@ -0,0 +1,95 @@
+import multiprocessing
+import os
+import tempfile
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+from core.throttling import LocalCounterStore, SQLiteCounterStore, SlidingWindowThrottle, get_counter_store
+
+
+class StoreTestMixin:
+
+    def test_hit_counts_current_and_previous_window(self):
+        store = self.make_store()
+        self.assertEqual(store.hit("k", 10, 120), (0, 1))
+        self.assertEqual(store.hit("k", 10, 120), (0, 2))
+        self.assertEqual(store.hit("k", 11, 120), (2, 1))
+        self.assertEqual(store.hit("other", 11, 120), (0, 1))
+        store.clear()
+        self.assertEqual(store.hit("k", 11, 120), (0, 1))
+
+
+class LocalCounterStoreTest(StoreTestMixin, SimpleTestCase):
+
+    def make_store(self):
+        return LocalCounterStore()
+
+    def test_expired_counters_are_swept(self):
+        store = LocalCounterStore(sweep_interval=0)
+        store.hit("k", 1, -1)
+        store.hit("j", 1, 60)
+        self.assertEqual(list(store._counters), [("j", 1)])
+
+
+def _hammer(path, hits):
+    store = SQLiteCounterStore(path=path)
+    for _ in range(hits):
+        store.hit("shared", 1, 60)
+
+
+class SQLiteCounterStoreTest(StoreTestMixin, SimpleTestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".sqlite3")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+
+    def make_store(self):
+        return SQLiteCounterStore(path=self.path)
+
+    def test_counters_are_shared_between_processes(self):
+        """Worker processes on one host see each other's hits"""
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=_hammer, args=(self.path, 50)) for _ in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual(self.make_store().hit("shared", 1, 60), (0, 151))
+
+
+class ThrottleForTest(SlidingWindowThrottle):
+    scope = "test"
+    rate = "10/min"
+
+    def get_cache_key(self, request, view):
+        return "test"
+
+
+@override_settings(THROTTLE_COUNTER_STORE="core.throttling.LocalCounterStore", THROTTLE_COUNTER_OPTIONS={})
+class SlidingWindowThrottleTest(SimpleTestCase):
+
+    def setUp(self):
+        get_counter_store().clear()
+
+    def allow(self, now):
+        throttle = ThrottleForTest()
+        with mock.patch.object(throttle, "timer", return_value=now):
+            return throttle.allow_request(None, None), throttle
+
+    def test_limit_within_window(self):
+        results = [self.allow(600 + i)[0] for i in range(11)]
+        self.assertEqual(results, [True] * 10 + [False])
+
+    def test_previous_window_decays(self):
+        """Ten hits late in one window still count early in the next"""
+        for i in range(10):
+            self.allow(659)
+        allowed, throttle = self.allow(660 + 5)   # 10 * 55/60 + 1 > 10
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 1.0)
+        allowed, _ = self.allow(660 + 20)         # 10 * 40/60 + 2 (+ this one)
+        self.assertTrue(allowed)
+
+    @override_settings(THROTTLE_ENABLED=False)
+    def test_can_be_disabled(self):
+        self.assertTrue(all(self.allow(600)[0] for _ in range(20)))
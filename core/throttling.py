@@ -0,0 +1,181 @@
+"""
+Sliding-window rate limits with pluggable counter stores.
+
+Each limit keeps two fixed-window counters per key: the current window and
+the previous one. The request rate is estimated as
+
+    previous * (1 - elapsed / window) + current
+
+which approximates a true sliding window without storing timestamps, so a
+check is one atomic increment and one read whatever the rate.
+
+Counters live in the store named by THROTTLE_COUNTER_STORE:
+LocalCounterStore keeps them in process memory (one worker, tests);
+SQLiteCounterStore keeps them in a local SQLite file shared by every
+worker process on the host.
+"""
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class BaseCounterStore:
+    def hit(self, key, window, ttl):
+        """
+        Add one to the counter for (key, window) and return
+        (count in window - 1, count in window). ttl: seconds to keep it.
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class LocalCounterStore(BaseCounterStore):
+    """
+    Counters in a dict guarded by a lock; expired ones are swept at most
+    once per `sweep_interval` seconds.
+    """
+    def __init__(self, sweep_interval=60):
+        self.sweep_interval = sweep_interval
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._next_sweep = time.monotonic() + sweep_interval
+
+    def clear(self):
+        with self._lock:
+            self._counters = {}
+
+    def hit(self, key, window, ttl):
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_sweep:
+                self._counters = {k: v for k, v in self._counters.items() if v[1] > now}
+                self._next_sweep = now + self.sweep_interval
+            count, _ = self._counters.get((key, window), (0, 0))
+            self._counters[(key, window)] = (count + 1, now + ttl)
+            previous = self._counters.get((key, window - 1), (0, 0))[0]
+        return previous, count + 1
+
+
+class SQLiteCounterStore(BaseCounterStore):
+    """
+    Counters in a SQLite file (WAL mode) so every worker process on the
+    host shares them. One connection per thread; each hit is a single
+    upsert plus a primary-key read in one transaction.
+    """
+    def __init__(self, path=None, sweep_interval=60, timeout=5.0):
+        self.path = path or os.path.join(tempfile.gettempdir(), "throttle-counters.sqlite3")
+        self.sweep_interval = sweep_interval
+        self.timeout = timeout
+        self._local = threading.local()
+        self._next_sweep = 0.0
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters ("
+                " key TEXT NOT NULL, bucket INTEGER NOT NULL,"
+                " count INTEGER NOT NULL, expires REAL NOT NULL,"
+                " PRIMARY KEY (key, bucket)) WITHOUT ROWID"
+            )
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, window, ttl):
+        conn = self._connection()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            (current,) = conn.execute(
+                "INSERT INTO counters (key, bucket, count, expires) VALUES (?, ?, 1, ?)"
+                " ON CONFLICT (key, bucket) DO UPDATE SET count = count + 1"
+                " RETURNING count",
+                (key, window, now + ttl),
+            ).fetchone()
+            row = conn.execute(
+                "SELECT count FROM counters WHERE key = ? AND bucket = ?", (key, window - 1)
+            ).fetchone()
+            if now >= self._next_sweep:
+                conn.execute("DELETE FROM counters WHERE expires < ?", (now,))
+                self._next_sweep = now + self.sweep_interval
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return (row[0] if row else 0), current
+
+    def clear(self):
+        self._connection().execute("DELETE FROM counters")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_counter_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            store_class = import_string(
+                getattr(settings, "THROTTLE_COUNTER_STORE", "core.throttling.LocalCounterStore")
+            )
+            _store = store_class(**getattr(settings, "THROTTLE_COUNTER_OPTIONS", {}))
+        return _store
+
+
+@receiver(setting_changed)
+def _reset_store(setting, **kwargs):
+    global _store
+    if setting in ("THROTTLE_COUNTER_STORE", "THROTTLE_COUNTER_OPTIONS"):
+        with _store_lock:
+            _store = None
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle (scope, THROTTLE_RATES, get_cache_key) counted in
+    the configured counter store instead of a timestamp list in the cache.
+    Requests over the limit are counted too, so a client that keeps
+    hammering stays limited. THROTTLE_ENABLED = False turns every
+    throttle off.
+    """
+
+    def allow_request(self, request, view):
+        if not getattr(settings, "THROTTLE_ENABLED", True) or self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        now = self.timer()
+        window, offset = divmod(now, self.duration)
+        self.elapsed = offset / self.duration
+        self.previous, self.current = get_counter_store().hit(
+            self.key, int(window), self.duration * 2
+        )
+        return self.estimate() <= self.num_requests
+
+    def estimate(self):
+        return self.previous * (1 - self.elapsed) + self.current
+
+    def wait(self):
+        """
+        Seconds until the estimate is back under the limit, assuming no
+        more requests.
+        """
+        if self.current > self.num_requests or not self.previous:
+            # only the next window can let the client back in
+            return self.duration * (1 - self.elapsed)
+        decay_to = 1 - (self.num_requests - self.current) / self.previous
+        return max(0.0, (decay_to - self.elapsed) * self.duration)
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from core.metrics import registry
+
+
+def metrics_view(request):
+    """
+    GET /metrics/ -> Prometheus scrape endpoint.
+    Only clients in METRICS_ALLOWED_IPS (loopback by default) may scrape;
+    an empty list refuses everyone.
+    """
+    if not getattr(settings, "METRICS_ENABLED", True):
+        raise Http404
+    allowed = getattr(settings, "METRICS_ALLOWED_IPS", ["127.0.0.1", "::1"])
+    if request.META.get("REMOTE_ADDR") not in allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
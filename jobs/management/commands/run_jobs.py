@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from jobs.worker import run_pending, run_workers
+
+
+class Command(BaseCommand):
+    help = "Run background jobs from the Job table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes", type=int, default=getattr(settings, "JOBS_WORKER_PROCESSES", 1),
+            help="Worker processes (default: JOBS_WORKER_PROCESSES).",
+        )
+        parser.add_argument(
+            "--threads", type=int, default=getattr(settings, "JOBS_WORKER_THREADS", 4),
+            help="Threads per process (default: JOBS_WORKER_THREADS).",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=getattr(settings, "JOBS_POLL_INTERVAL", 1.0),
+            help="Seconds an idle thread waits before polling again.",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Exit once no due jobs are left instead of polling forever.",
+        )
+
+    def handle(self, *args, **options):
+        if options["once"] and options["processes"] <= 1 and options["threads"] <= 1:
+            ran = run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Ran {ran} job(s)."))
+            return
+        self.stdout.write(
+            f"Starting {options['processes']} process(es) x {options['threads']} thread(s)"
+        )
+        run_workers(
+            processes=options["processes"],
+            threads=options["threads"],
+            poll_interval=options["poll_interval"],
+            once=options["once"],
+        )
@@ -0,0 +1,76 @@
+import random
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from jobs.models import Job
+
+
+def enqueue_jobs(jobs):
+    """
+    Insert jobs in one statement. Call inside the write's transaction:
+    the jobs then exist exactly when the write commits. Jobs whose
+    idempotency_key is already queued (or done) are skipped.
+    """
+    if jobs:
+        Job.objects.bulk_create(jobs, ignore_conflicts=True)
+
+
+def retry_delay(attempts):
+    """
+    Exponential backoff with jitter: base * 2**(attempts-1), capped.
+    """
+    base = getattr(settings, "JOBS_RETRY_BACKOFF", 10)
+    cap = getattr(settings, "JOBS_RETRY_BACKOFF_MAX", 60 * 60)
+    delay = min(cap, base * 2 ** (attempts - 1))
+    return timedelta(seconds=delay + random.uniform(0, delay / 10))
+
+
+def _claimable(now):
+    # due queued jobs, plus running jobs whose worker died holding them
+    stale = now - timedelta(seconds=getattr(settings, "JOBS_LOCK_TIMEOUT", 300))
+    return Q(status=Job.QUEUED, run_at__lte=now) | Q(status=Job.RUNNING, locked_at__lt=stale)
+
+
+def claim_job(worker_id, batch=10):
+    """
+    Lock the next due job for `worker_id` and return it, or None.
+
+    Candidates are read first, then taken with a conditional UPDATE that
+    only succeeds if the row is still claimable, so concurrent workers
+    never run the same job (no SELECT ... SKIP LOCKED needed, which
+    SQLite lacks).
+    """
+    now = timezone.now()
+    candidates = list(
+        Job.objects.filter(_claimable(now)).order_by("run_at", "id").values_list("id", flat=True)[:batch]
+    )
+    for pk in candidates:
+        # unique per claim, so a worker that lost a stale job can't finish it
+        token = f"{worker_id}:{uuid.uuid4().hex[:8]}"
+        claimed = Job.objects.filter(_claimable(now), pk=pk).update(
+            status=Job.RUNNING, locked_by=token, locked_at=now, attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def complete_job(job):
+    Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by).update(
+        status=Job.SUCCEEDED, finished_at=timezone.now(), locked_by="", last_error="",
+    )
+
+
+def fail_job(job, error):
+    """
+    Requeue with backoff, or give up after max_attempts.
+    """
+    now = timezone.now()
+    changes = {"locked_by": "", "last_error": error}
+    if job.attempts >= job.max_attempts:
+        changes.update(status=Job.FAILED, finished_at=now)
+    else:
+        changes.update(status=Job.QUEUED, run_at=now + retry_delay(job.attempts))
+    Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=job.locked_by).update(**changes)
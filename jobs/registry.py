@@ -0,0 +1,67 @@
+"""
+Task registry.
+
+    @task("accounts.send_welcome_email")
+    def send_welcome_email(user_id): ...
+
+    send_welcome_email.enqueue(user_id=1, idempotency_key="welcome:1")
+
+Payloads are keyword arguments stored as JSON, so pass ids rather than
+model instances and re-read current state inside the task.
+"""
+from django.conf import settings
+from django.utils import timezone
+
+tasks = {}
+
+
+class UnknownTask(LookupError):
+    pass
+
+
+class Task:
+    def __init__(self, func, name, max_attempts):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+
+    def __call__(self, **payload):
+        return self.func(**payload)
+
+    def job(self, idempotency_key=None, run_at=None, **payload):
+        """
+        Unsaved Job for this call, for jobs.queue.enqueue_jobs() batches.
+        """
+        from jobs.models import Job
+        return Job(
+            name=self.name,
+            payload=payload,
+            idempotency_key=idempotency_key,
+            max_attempts=self.max_attempts,
+            run_at=run_at or timezone.now(),
+        )
+
+    def enqueue(self, idempotency_key=None, run_at=None, **payload):
+        from jobs.queue import enqueue_jobs
+        enqueue_jobs([self.job(idempotency_key=idempotency_key, run_at=run_at, **payload)])
+
+    def __repr__(self):
+        return f"<Task {self.name}>"
+
+
+def task(name, max_attempts=None):
+    """
+    Register a function as a background task under `name`.
+    """
+    def decorator(func):
+        attempts = max_attempts or getattr(settings, "JOBS_MAX_ATTEMPTS", 5)
+        tasks[name] = Task(func, name, attempts)
+        return tasks[name]
+    return decorator
+
+
+def get_task(name):
+    try:
+        return tasks[name]
+    except KeyError:
+        raise UnknownTask(name) from None
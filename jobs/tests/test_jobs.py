@@ -0,0 +1,119 @@
+from datetime import timedelta
+from unittest import mock
+from django.core import mail
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from jobs.models import Job
+from jobs.queue import claim_job, enqueue_jobs
+from jobs.registry import task
+from jobs.worker import run_pending
+from subscriptions.models import Plan, Subscription
+
+User = get_user_model()
+
+calls = []
+
+
+@task("tests.record", max_attempts=2)
+def record(value):
+    calls.append(value)
+
+
+@task("tests.explode", max_attempts=2)
+def explode():
+    raise RuntimeError("boom")
+
+
+class JobQueueTest(APITestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_and_run(self):
+        """Queued jobs run once and are marked succeeded"""
+        record.enqueue(value=1)
+        record.enqueue(value=2)
+        self.assertEqual(run_pending(), 2)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(Job.objects.filter(status=Job.SUCCEEDED).count(), 2)
+        self.assertEqual(run_pending(), 0)
+
+    def test_idempotency_key(self):
+        """A second enqueue with the same key is ignored"""
+        enqueue_jobs([record.job(idempotency_key="k", value=1), record.job(idempotency_key="k", value=2)])
+        record.enqueue(idempotency_key="k", value=3)
+        run_pending()
+        self.assertEqual(calls, [1])
+
+    def test_future_jobs_wait(self):
+        """run_at in the future is not claimed yet"""
+        record.enqueue(value=1, run_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(run_pending(), 0)
+
+    def test_retry_with_backoff_then_fail(self):
+        """Failures are retried later, then marked failed after max_attempts"""
+        explode.enqueue()
+        run_pending()
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("boom", job.last_error)
+
+        Job.objects.update(run_at=timezone.now())
+        run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+
+    def test_claimed_job_is_not_claimed_twice(self):
+        """A running job is invisible to other workers until its lock expires"""
+        record.enqueue(value=1)
+        job = claim_job("a")
+        self.assertIsNone(claim_job("b"))
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(claim_job("b").pk, job.pk)
+
+    def test_command_once(self):
+        """run_jobs --once drains the queue and exits"""
+        record.enqueue(value=1)
+        call_command("run_jobs", "--once", "--threads", "1", stdout=mock.MagicMock())
+        self.assertEqual(calls, [1])
+
+
+class WriteSideEffectsTest(APITestCase):
+
+    def test_registration_queues_welcome_email(self):
+        """Registration returns before the email is sent; the worker sends it"""
+        response = self.client.post(reverse("user-list-create"), {
+            "username": "newuser", "email": "new@example.com", "password": "StrongPass123!",
+        }, format="json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(
+            set(Job.objects.values_list("name", flat=True)),
+            {"accounts.send_welcome_email", "accounts.record_audit_event"},
+        )
+        run_pending()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["new@example.com"])
+
+    def test_plan_change_queues_audit_and_billing(self):
+        """Plan changes queue one audit and one billing job for the new subscription"""
+        user = User.objects.create_user(username="user", email="user@example.com", password="userpass")
+        basic, pro = Plan.objects.create(name="Basic"), Plan.objects.create(name="Pro")
+        sub = Subscription.objects.create(user=user, plan=basic)
+        self.client.force_authenticate(user=user)
+        response = self.client.post(
+            reverse("subscriptions:subscription-change-plan", args=[sub.id]), {"plan_id": pro.id}, format="json"
+        )
+        jobs = Job.objects.filter(payload__event="subscription.plan_changed")
+        self.assertEqual(
+            sorted(jobs.values_list("name", flat=True)),
+            ["accounts.record_audit_event", "subscriptions.sync_billing"],
+        )
+        self.assertEqual(jobs.first().payload["subscription_id"], response.data["id"])
+        with self.assertLogs("audit", "INFO") as logs:
+            self.assertEqual(run_pending(), 2)
+        self.assertIn('"event": "subscription.plan_changed"', logs.output[0])
@@ -0,0 +1,126 @@
+"""
+Job worker: N processes x M threads, each thread claiming and running one
+job at a time from the Job table (see jobs.queue).
+"""
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from django.db import close_old_connections, connections
+from jobs.queue import claim_job, complete_job, fail_job
+from jobs.registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+def run_job(job):
+    """
+    Run one claimed job and record the outcome. Task exceptions are
+    stored on the row and retried with backoff.
+    """
+    start = time.perf_counter()
+    try:
+        get_task(job.name)(**job.payload)
+    except Exception:
+        logger.warning("job %s (%s) attempt %d failed", job.pk, job.name, job.attempts, exc_info=True)
+        fail_job(job, traceback.format_exc(limit=5))
+    else:
+        complete_job(job)
+        logger.info("job %s (%s) done in %.3fs", job.pk, job.name, time.perf_counter() - start)
+
+
+def run_pending(worker_id="inline", limit=None):
+    """
+    Run due jobs in the current thread until none are left (or `limit`
+    ran). Returns the number of jobs run. Used by --once and tests.
+    """
+    count = 0
+    while limit is None or count < limit:
+        job = claim_job(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        count += 1
+    return count
+
+
+class Worker:
+    def __init__(self, threads=4, poll_interval=1.0, once=False):
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.once = once
+        self.stop = threading.Event()
+
+    def worker_id(self):
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+
+    def loop(self):
+        worker_id = self.worker_id()
+        while not self.stop.is_set():
+            close_old_connections()
+            try:
+                ran = run_pending(worker_id, limit=1)
+            except Exception:
+                # e.g. database is locked/unavailable: back off and retry
+                logger.exception("worker %s failed to claim a job", worker_id)
+                ran = 0
+            if not ran:
+                if self.once:
+                    break
+                self.stop.wait(self.poll_interval)
+        connections.close_all()
+
+    def shutdown(self, signum=None, frame=None):
+        """
+        Stop claiming; running jobs finish first.
+        """
+        self.stop.set()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.shutdown)
+        signal.signal(signal.SIGINT, self.shutdown)
+        pool = [
+            threading.Thread(target=self.loop, name=f"jobs-{i}", daemon=True)
+            for i in range(self.threads)
+        ]
+        for thread in pool:
+            thread.start()
+        while any(thread.is_alive() for thread in pool):
+            for thread in pool:
+                thread.join(0.5)
+
+
+def _run_process(threads, poll_interval, once):
+    Worker(threads=threads, poll_interval=poll_interval, once=once).run()
+
+
+def run_workers(processes=1, threads=4, poll_interval=1.0, once=False):
+    """
+    Run the pool in this process, or fork `processes` children.
+    SIGTERM/SIGINT stop claiming and let running jobs finish.
+    """
+    if processes <= 1:
+        _run_process(threads, poll_interval, once)
+        return
+    # children must not share the parent's DB connections
+    connections.close_all()
+    children = [
+        multiprocessing.Process(target=_run_process, args=(threads, poll_interval, once), name=f"jobs-worker-{i}")
+        for i in range(processes)
+    ]
+    for child in children:
+        child.start()
+
+    def forward(signum, frame):
+        for child in children:
+            if child.is_alive():
+                os.kill(child.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, forward)
+    signal.signal(signal.SIGINT, forward)
+    for child in children:
+        child.join()
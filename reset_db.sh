@@ -11,7 +11,7 @@ else
 fi
 
 # 2. Remove old migration files except __init__.py
-dirs=("subscriptions/migrations" "accounts/migrations")
+dirs=("subscriptions/migrations" "accounts/migrations" "jobs/migrations")
 for dir in "${dirs[@]}"; do
     if [ -d "$dir" ]; then
         find "$dir" -type f \( -name "*.py" -o -name "*.pyc" \) ! -name "__init__.py" -exec rm -f {} +
@@ -25,6 +25,7 @@ done
 echo -e "\033[36mCreating new migrations...\033[0m"
 python manage.py makemigrations accounts
 python manage.py makemigrations subscriptions
+python manage.py makemigrations jobs
 
 # 4. Apply migrations
 echo -e "\033[36mApplying migrations...\033[0m"
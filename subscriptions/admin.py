@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Feature, Plan, Subscription
+from .models import Feature, Plan, Subscription, SubscriptionChangeEvent
 
 
 @admin.register(Feature)
@@ -15,5 +15,11 @@ class PlanAdmin(admin.ModelAdmin):
 
 @admin.register(Subscription)
 class SubscriptionAdmin(admin.ModelAdmin):
-    list_display = ("id", "user", "plan", "start_date", "is_active")
+    list_display = ("id", "user", "plan", "start_date", "end_date", "is_active")
     list_filter = ("is_active", "plan")
+
+
+@admin.register(SubscriptionChangeEvent)
+class SubscriptionChangeEventAdmin(admin.ModelAdmin):
+    list_display = ("id", "event", "subscription_id", "user_id", "plan_id", "created_at")
+    list_filter = ("event",)
@@ -0,0 +1,42 @@
+"""
+Feature sets as integer bitsets.
+
+Bit n is set when the feature with Feature.bit == n is in the set. Bits
+are handed out densely from 0 when a feature is created and never change,
+so positions stay stable and a mask is about one byte per eight features
+ever created, whatever the primary keys look like. Stored packed as
+little-endian bytes (BinaryField).
+
+A deleted feature leaves a hole, and its bit is cleared from every plan
+and user mask in the same transaction (subscriptions.signals); only the
+highest bit can be handed out again, and by then nothing holds it.
+"""
+
+
+def mask_of(bits):
+    mask = 0
+    for bit in bits:
+        mask |= 1 << bit
+    return mask
+
+
+def bits_of(mask):
+    """
+    Yield the bit positions set in `mask`, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def pack(mask):
+    return mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+
+
+def unpack(data):
+    return int.from_bytes(bytes(data or b""), "little")
+
+
+def has_bit(mask, bit):
+    return bool(mask >> bit & 1)
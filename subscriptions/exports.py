@@ -0,0 +1,16 @@
+from core.export import Export
+from subscriptions.models import Subscription
+
+
+def subscription_export():
+    return Export("subscriptions", Subscription.objects.all(), [
+        ("id", "id"),
+        ("user_id", "user_id"),
+        ("username", "user__username"),
+        ("email", "user__email"),
+        ("plan_id", "plan_id"),
+        ("plan", "plan__name"),
+        ("start_date", "start_date"),
+        ("end_date", "end_date"),
+        ("is_active", "is_active"),
+    ])
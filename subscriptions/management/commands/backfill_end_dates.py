@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from subscriptions.services.history import backfill_end_dates
+
+
+class Command(BaseCommand):
+    help = (
+        "Set end_date on inactive subscriptions that were closed before it was recorded, "
+        "so point-in-time queries and daily active counts see them as ended. Rows followed by "
+        "a plan change end when the next subscription starts; the others are only reported "
+        "unless --fallback is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fallback",
+            help=(
+                'End for rows with no later subscription: "updated_at" (unreliable for rows '
+                "closed by the old deactivate endpoint, which never bumped it) or an ISO datetime."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        fallback = options["fallback"]
+        if fallback not in (None, "updated_at"):
+            parsed = parse_datetime(fallback)
+            if parsed is None:
+                raise CommandError('--fallback must be "updated_at" or an ISO datetime.')
+            if timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed)
+            fallback = parsed
+        from_next, from_fallback, unresolved = backfill_end_dates(fallback)
+        self.stdout.write(self.style.SUCCESS(
+            f"{from_next} subscriptions ended at their successor's start, {from_fallback} at the fallback."
+        ))
+        if unresolved:
+            self.stdout.write(self.style.WARNING(
+                f"{unresolved} inactive subscriptions have no later subscription and still have no end "
+                "date; they count as active in history queries. Re-run with --fallback to end them."
+            ))
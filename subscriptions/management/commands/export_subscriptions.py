@@ -0,0 +1,9 @@
+from core.export import ExportCommand
+from subscriptions.exports import subscription_export
+
+
+class Command(ExportCommand):
+    help = "Stream all subscriptions, with user and plan names, as CSV or JSON Lines."
+
+    def get_export(self):
+        return subscription_export()
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from subscriptions.services.active_plan import rebuild_active_plans
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every plan's feature bitset and every user's denormalized active plan "
+        "and feature mask, and fix the ones that drifted (e.g. after raw SQL or bulk loads)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify", action="store_true",
+            help="Only report drifted users; exits with an error if there are any.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Users checked per round trip.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        stale_plans, checked, wrong = rebuild_active_plans(
+            batch_size=options["batch_size"], dry_run=options["verify"]
+        )
+        if options["verify"]:
+            if stale_plans or wrong:
+                raise CommandError(
+                    f"{stale_plans} plans have a stale feature bitset; "
+                    f"{wrong} of {checked} users have a stale active plan or feature mask."
+                )
+            self.stdout.write(self.style.SUCCESS(f"{checked} users checked, all consistent."))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"{stale_plans} plan bitsets fixed; {checked} users checked, {wrong} fixed."
+            ))
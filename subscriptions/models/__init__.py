@@ -1,5 +1,6 @@
 from .feature import Feature
 from .plan import Plan
 from .subscription import Subscription
+from .change_event import SubscriptionChangeEvent
 
-__all__ = ["Feature", "Plan", "Subscription"]
\ No newline at end of file
+__all__ = ["Feature", "Plan", "Subscription", "SubscriptionChangeEvent"]
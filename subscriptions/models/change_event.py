@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class SubscriptionChangeEvent(models.Model):
+    """
+    Transactional outbox: one row per subscription change, inserted in the
+    same transaction as the change itself. The auto-increment id is the
+    change feed's sequence number.
+
+    Ids are copied rather than foreign keys, so events outlive deleted
+    subscriptions, users and plans.
+    """
+    CREATED = "subscription.created"
+    PLAN_CHANGED = "subscription.plan_changed"
+    DEACTIVATED = "subscription.deactivated"
+    DELETED = "subscription.deleted"
+
+    event = models.CharField(max_length=50)
+    subscription_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    plan_id = models.BigIntegerField()
+    is_active = models.BooleanField()
+    # plan changes: the subscription this one closed
+    replaces_id = models.BigIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, editable=False)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            # per-user feeds
+            models.Index(fields=["user_id", "id"], name="sub_change_user_seq_idx"),
+        ]
+
+    def __str__(self):
+        return f"#{self.pk} {self.event} {self.subscription_id}"
@@ -1,9 +1,14 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Max
 from .base import BaseModel
 
 
 class Feature(BaseModel):
     name = models.CharField(max_length=100, unique=True)
+    # position in every feature bitset (subscriptions.bitsets)
+    bit = models.PositiveIntegerField(unique=True, editable=False)
+
+    BIT_ATTEMPTS = 5
 
     class Meta:
         ordering = ["id"]
@@ -11,5 +16,28 @@ class Feature(BaseModel):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def next_bit(cls):
+        """
+        The bit after the highest one in use: bits are handed out densely
+        from 0 and never change, and a deleted feature's bit is not given
+        out again unless it was the highest.
+        """
+        highest = cls.objects.aggregate(highest=Max("bit"))["highest"]
+        return 0 if highest is None else highest + 1
 
-
+    def save(self, *args, **kwargs):
+        if self.bit is not None:
+            return super().save(*args, **kwargs)
+        # Two creates can read the same highest bit; the loser's INSERT
+        # fails on the unique bit and is retried with a fresh one.
+        for attempt in range(self.BIT_ATTEMPTS):
+            self.bit = Feature.next_bit()
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                taken = Feature.objects.filter(bit=self.bit).exists()
+                self.bit = None
+                if not taken or attempt == self.BIT_ATTEMPTS - 1:
+                    raise
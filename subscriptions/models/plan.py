@@ -10,6 +10,9 @@ class Plan(BaseModel):
         related_name="plans",
         blank=True
     )
+    # packed bitset of `features` (subscriptions.services.feature_index),
+    # rewritten on every M2M change
+    feature_bits = models.BinaryField(default=b"", editable=False)
 
     class Meta:
         ordering = ["id"]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from django.db.models import Q
+from django.utils import timezone
 from .base import BaseModel
 from .plan import Plan
 
@@ -16,16 +17,28 @@ class Subscription(BaseModel):
         Plan,
         on_delete=models.CASCADE,
         related_name="subscriptions",
-        db_index=True,
+        db_index=False,   # sub_plan_start_idx leads with plan
     )
-    start_date = models.DateTimeField(auto_now_add=True)
+    # set by writers, so a plan change can end one row exactly when the next starts
+    start_date = models.DateTimeField(default=timezone.now, editable=False)
+    # when the subscription stopped; null while active. A user's rows never
+    # overlap, so [start_date, end_date) gives their plan at any instant
+    end_date = models.DateTimeField(null=True, blank=True, editable=False)
     is_active = models.BooleanField(default=True)
 
     class Meta:
         ordering = ["-start_date"]
         indexes = [
             models.Index(fields=["user", "is_active"]),
-            models.Index(fields=["plan"]),
+            # keyset pagination of a user's subscriptions and point-in-time
+            # plan lookups (subscriptions.selectors.history)
+            models.Index(fields=["user", "-start_date", "-id"], name="sub_user_start_idx"),
+            # daily active counts: range scans over starts and ends,
+            # overall and per plan (they also serve plan_id lookups)
+            models.Index(fields=["start_date"], name="sub_start_idx"),
+            models.Index(fields=["end_date"], name="sub_end_idx"),
+            models.Index(fields=["plan", "start_date"], name="sub_plan_start_idx"),
+            models.Index(fields=["plan", "end_date"], name="sub_plan_end_idx"),
         ]
         constraints = [
             # Exactly one active subscription per user
@@ -38,3 +51,14 @@ class Subscription(BaseModel):
 
     def __str__(self):
         return f"{self.user} -> {self.plan}"
+
+    def save(self, *args, **kwargs):
+        # The services close rows with end_date themselves; any other save
+        # (admin, shell) that deactivates one ends it now, or history
+        # queries would count it as active forever.
+        if not self.is_active and self.end_date is None:
+            self.end_date = timezone.now()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "end_date"}
+        super().save(*args, **kwargs)
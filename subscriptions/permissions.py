@@ -6,7 +6,7 @@ class IsOwnerOfSubscription(permissions.BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        return obj.user == request.user
+        return obj.user_id == request.user.pk
 
 
 class IsAdminOrReadOnly(permissions.BasePermission):
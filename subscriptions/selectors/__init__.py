@@ -0,0 +1,11 @@
+from .entitlement import get_user_feature_names, has_feature, user_has_feature
+from .history import daily_active_counts, get_plan_at, get_subscription_at
+
+__all__ = [
+    "get_user_feature_names",
+    "has_feature",
+    "user_has_feature",
+    "daily_active_counts",
+    "get_plan_at",
+    "get_subscription_at",
+]
@@ -0,0 +1,42 @@
+from rest_framework import serializers
+from subscriptions.models import SubscriptionChangeEvent
+
+_datetime = serializers.DateTimeField().to_representation
+
+_COLUMNS = (
+    "id", "event", "subscription_id", "user_id", "plan_id", "is_active", "replaces_id", "created_at",
+)
+
+
+def _events_after(after, user_id=None):
+    queryset = SubscriptionChangeEvent.objects.filter(id__gt=after)
+    if user_id is not None:
+        queryset = queryset.filter(user_id=user_id)
+    return queryset.order_by("id").values(*_COLUMNS)
+
+
+async def aget_change_events(after, user_id=None, limit=500):
+    """
+    Up to `limit` outbox rows with a sequence number above `after`,
+    oldest first; only `user_id`'s when given.
+    """
+    return [row async for row in _events_after(after, user_id)[:limit]]
+
+
+async def aget_latest_sequence():
+    return await SubscriptionChangeEvent.objects.order_by("-id").values_list("id", flat=True).afirst() or 0
+
+
+def render_change_event(row):
+    return {
+        "seq": row["id"],
+        "event": row["event"],
+        "subscription": {
+            "id": row["subscription_id"],
+            "user": row["user_id"],
+            "plan": row["plan_id"],
+            "is_active": row["is_active"],
+        },
+        "replaces": row["replaces_id"],
+        "at": _datetime(row["created_at"]),
+    }
@@ -0,0 +1,144 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from subscriptions.bitsets import has_bit, unpack
+from subscriptions.models import Feature, Plan
+
+User = get_user_model()
+
+# Two small cache entries answer every check:
+#   user -> id of the plan behind their active subscription (0 = none)
+#   plan -> frozenset of feature names
+# so a plan's feature change never has to touch per-user keys.
+# has_feature() on a loaded User also needs feature name -> bit.
+USER_PLAN_KEY = "entitlements:user:{}"
+PLAN_FEATURES_KEY = "entitlements:plan:{}"
+FEATURE_BITS_KEY = "entitlements:feature-bits"
+NO_PLAN = 0
+
+
+def _timeout():
+    return getattr(settings, "ENTITLEMENT_CACHE_TIMEOUT", None)
+
+
+def get_active_plan_id(user_id):
+    """
+    Return the plan id of the user's active subscription, or None.
+    """
+    key = USER_PLAN_KEY.format(user_id)
+    plan_id = cache.get(key)
+    if plan_id is None:
+        # denormalized pointer: a primary-key read, no Subscription scan
+        plan_id = User.objects.filter(pk=user_id).values_list("active_plan_id", flat=True).first() or NO_PLAN
+        cache.set(key, plan_id, _timeout())
+    return plan_id or None
+
+
+def get_plan_feature_names(plan_id):
+    """
+    Return the precomputed feature-name set of a plan.
+    """
+    key = PLAN_FEATURES_KEY.format(plan_id)
+    names = cache.get(key)
+    if names is None:
+        names = frozenset(
+            Plan.features.through.objects.filter(plan_id=plan_id)
+            .values_list("feature__name", flat=True)
+        )
+        cache.set(key, names, _timeout())
+    return names
+
+
+def get_user_feature_names(user_id):
+    """
+    Return the feature names granted to a user by their active subscription.
+    """
+    plan_id = get_active_plan_id(user_id)
+    if plan_id is None:
+        return frozenset()
+    return get_plan_feature_names(plan_id)
+
+
+def user_has_feature(user_id, feature_name):
+    return feature_name in get_user_feature_names(user_id)
+
+
+def get_feature_bits():
+    """
+    Return {feature name: bit} for the whole catalog.
+    """
+    bits = cache.get(FEATURE_BITS_KEY)
+    if bits is None:
+        bits = dict(Feature.objects.values_list("name", "bit"))
+        cache.set(FEATURE_BITS_KEY, bits, _timeout())
+    return bits
+
+
+def has_feature(user, feature_name):
+    """
+    Feature check for request.user. A loaded User answers from its
+    feature_mask without a query; token users fall back to the cached
+    plan lookup.
+    """
+    feature_mask = getattr(user, "feature_mask", None)
+    if feature_mask is None:
+        return user_has_feature(user.pk, feature_name)
+    bit = get_feature_bits().get(feature_name)
+    return bit is not None and has_bit(unpack(feature_mask), bit)
+
+
+# Async twins for the ASGI read views: same keys and values, fetched
+# with the async cache and ORM APIs.
+
+async def aget_active_plan_id(user_id):
+    key = USER_PLAN_KEY.format(user_id)
+    plan_id = await cache.aget(key)
+    if plan_id is None:
+        plan_id = await (
+            User.objects.filter(pk=user_id).values_list("active_plan_id", flat=True).afirst()
+        ) or NO_PLAN
+        await cache.aset(key, plan_id, _timeout())
+    return plan_id or None
+
+
+async def aget_plan_feature_names(plan_id):
+    key = PLAN_FEATURES_KEY.format(plan_id)
+    names = await cache.aget(key)
+    if names is None:
+        names = frozenset([
+            name async for name in
+            Plan.features.through.objects.filter(plan_id=plan_id).values_list("feature__name", flat=True)
+        ])
+        await cache.aset(key, names, _timeout())
+    return names
+
+
+async def aget_user_feature_names(user_id):
+    plan_id = await aget_active_plan_id(user_id)
+    if plan_id is None:
+        return frozenset()
+    return await aget_plan_feature_names(plan_id)
+
+
+def _delete_keys(keys):
+    # Drop now so this request sees fresh data, and again after commit so a
+    # concurrent reader cannot re-cache the pre-commit state.
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def invalidate_user_entitlements(user_ids):
+    keys = [USER_PLAN_KEY.format(pk) for pk in user_ids]
+    if keys:
+        _delete_keys(keys)
+
+
+def invalidate_plan_entitlements(plan_ids):
+    keys = [PLAN_FEATURES_KEY.format(pk) for pk in plan_ids]
+    if keys:
+        _delete_keys(keys)
+
+
+def invalidate_feature_bits():
+    _delete_keys([FEATURE_BITS_KEY])
@@ -0,0 +1,114 @@
+"""
+Point-in-time subscription queries.
+
+A subscription is active from start_date until end_date (exclusive; null
+while still active), and a user's subscriptions never overlap. Every query
+here is an index range scan:
+
+  - get_plan_at(): one seek on sub_user_start_idx, reading a single row;
+  - daily_active_counts(): counts before the range plus per-day starts and
+    ends, each from sub_start_idx/sub_end_idx (or sub_plan_start_idx /
+    sub_plan_end_idx for one plan). No subscription row is read, however
+    large the table.
+"""
+import datetime
+from django.db.models import Count, DateTimeField, ExpressionWrapper, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from subscriptions.models import Subscription
+
+_EPSILON = datetime.timedelta(microseconds=1)
+
+
+def get_subscription_at(user_id, when):
+    """
+    Return {"id", "plan_id", "start_date", "end_date"} of the subscription
+    `user_id` had at `when`, or None.
+    """
+    row = (
+        Subscription.objects.filter(user_id=user_id, start_date__lte=when)
+        .order_by("-start_date", "-id")
+        .values("id", "plan_id", "start_date", "end_date")
+        .first()
+    )
+    if row is None or (row["end_date"] is not None and row["end_date"] <= when):
+        return None
+    return row
+
+
+def get_plan_at(user_id, when):
+    """
+    Return the id of the plan `user_id` was on at `when`, or None.
+    """
+    row = get_subscription_at(user_id, when)
+    return row["plan_id"] if row else None
+
+
+def _day_start(day, tz):
+    return datetime.datetime.combine(day, datetime.time.min, tzinfo=tz)
+
+
+def _per_day(queryset, field, start, end, tz):
+    """
+    {date: n} of the `field` values in [start, end), by local day.
+    """
+    rows = (
+        queryset.filter(**{f"{field}__gte": start, f"{field}__lt": end})
+        .order_by()
+        .values(day=TruncDate(field, tzinfo=tz))
+        .annotate(n=Count("id"))
+        .values_list("day", "n")
+    )
+    return dict(rows)
+
+
+def _ends_per_day(queryset, start, end, tz):
+    """
+    {date: n} of the end_date values in (start, end], by the local day of
+    the subscription's last active instant: end_date is exclusive, so an
+    end at midnight closes the previous day.
+    """
+    last_instant = ExpressionWrapper(F("end_date") - _EPSILON, output_field=DateTimeField())
+    rows = (
+        queryset.filter(end_date__gt=start, end_date__lte=end)
+        .order_by()
+        .values(day=TruncDate(last_instant, tzinfo=tz))
+        .annotate(n=Count("id"))
+        .values_list("day", "n")
+    )
+    return dict(rows)
+
+
+def daily_active_counts(first_day, last_day, plan_id=None):
+    """
+    Return [(date, count)] for every day from first_day to last_day
+    (inclusive): the subscriptions active at any time during that day, in
+    the current time zone, optionally for one plan. Four queries.
+    """
+    if last_day < first_day:
+        return []
+    tz = timezone.get_current_timezone()
+    start = _day_start(first_day, tz)
+    end = _day_start(last_day + datetime.timedelta(days=1), tz)
+    queryset = Subscription.objects.all()
+    if plan_id is not None:
+        queryset = queryset.filter(plan_id=plan_id)
+
+    # started before the range and still active at its first instant
+    active = (
+        queryset.filter(start_date__lt=start).count()
+        - queryset.filter(end_date__lte=start).count()
+    )
+    starts = _per_day(queryset, "start_date", start, end, tz)
+    ends = _ends_per_day(queryset, start, end, tz)
+
+    counts = []
+    day = first_day
+    while day <= last_day:
+        # subscriptions that started during the day count for it, ones whose
+        # last active instant falls in it still count and drop out the next day
+        active += starts.get(day, 0)
+        counts.append((day, active))
+        active -= ends.get(day, 0)
+        day += datetime.timedelta(days=1)
+    return counts
@@ -1,6 +1,14 @@
 from .feature import FeatureSerializer
 from .plan import PlanSerializer
 from .subscription import SubscriptionSerializer
+from .bulk import BulkCreateSerializer, BulkChangePlanSerializer, BulkDeactivateSerializer
 
 
-__all__ = ["FeatureSerializer", "PlanSerializer", "SubscriptionSerializer"] 
\ No newline at end of file
+__all__ = [
+    "FeatureSerializer",
+    "PlanSerializer",
+    "SubscriptionSerializer",
+    "BulkCreateSerializer",
+    "BulkChangePlanSerializer",
+    "BulkDeactivateSerializer",
+] 
\ No newline at end of file
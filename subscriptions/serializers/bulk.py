@@ -0,0 +1,32 @@
+from django.conf import settings
+from rest_framework import serializers
+
+BULK_MAX_ITEMS = getattr(settings, "SUBSCRIPTION_BULK_MAX_ITEMS", 10000)
+
+
+class BulkCreateItemSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField()
+    plan_id = serializers.IntegerField()
+
+
+class BulkChangePlanItemSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    plan_id = serializers.IntegerField()
+
+
+class BulkCreateSerializer(serializers.Serializer):
+    """
+    Shape-only validation; existence and uniqueness checks
+    run set-based in subscriptions.services.
+    """
+    items = BulkCreateItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+
+class BulkChangePlanSerializer(serializers.Serializer):
+    items = BulkChangePlanItemSerializer(many=True, allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+
+class BulkDeactivateSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=BULK_MAX_ITEMS
+    )
@@ -0,0 +1,48 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS, ManyRelatedField
+
+
+class BulkManyRelatedField(ManyRelatedField):
+    """
+    ManyRelatedField that resolves all primary keys with one IN query
+    instead of one query per item.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        to_python = queryset.model._meta.pk.to_python
+        pks = []
+        for value in data:
+            if isinstance(value, bool):
+                child.fail("incorrect_type", data_type=type(value).__name__)
+            try:
+                pks.append(to_python(value))
+            except (DjangoValidationError, TypeError, ValueError):
+                child.fail("incorrect_type", data_type=type(value).__name__)
+
+        objects = queryset.in_bulk(set(pks))
+        for pk in pks:
+            if pk not in objects:
+                child.fail("does_not_exist", pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField whose many=True form validates in one query.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
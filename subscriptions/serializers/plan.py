@@ -1,12 +1,13 @@
 from rest_framework import serializers
 from subscriptions.models import Plan, Feature
 from subscriptions.serializers import FeatureSerializer
+from subscriptions.serializers.fields import BulkPrimaryKeyRelatedField
 
 class PlanSerializer(serializers.ModelSerializer):
     # Read nested details
     features = FeatureSerializer(many=True, read_only=True)
-    # Writeable IDs for creation/updating
-    feature_ids = serializers.PrimaryKeyRelatedField(
+    # Writeable IDs for creation/updating (validated with a single query)
+    feature_ids = BulkPrimaryKeyRelatedField(
         queryset=Feature.objects.all(),
         many=True,
         write_only=True,
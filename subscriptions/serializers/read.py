@@ -0,0 +1,122 @@
+"""
+Read-only fast path for list/retrieve.
+
+Each read plan renders `.values()` rows straight into the exact structure
+the matching ModelSerializer produces, from a field plan computed once at
+import time: no model instances, no per-field serializer dispatch, and
+nested features fetched with one query per page.
+"""
+from collections import defaultdict
+from rest_framework import serializers
+from subscriptions.models import Plan
+
+# DRF's own representation (timezone + "Z" suffix), so output stays identical
+_datetime = serializers.DateTimeField().to_representation
+
+
+def _feature_rows(plan_ids):
+    return (
+        Plan.features.through.objects.filter(plan_id__in=set(plan_ids))
+        .order_by("feature_id")
+        .values_list("plan_id", "feature_id", "feature__name")
+    )
+
+
+def _group_features(rows):
+    features = defaultdict(list)
+    for plan_id, feature_id, name in rows:
+        features[plan_id].append({"id": feature_id, "name": name})
+    return features
+
+
+def _features_by_plan(plan_ids):
+    """
+    {plan_id: [{"id", "name"}, ...]} in Feature's default (id) order.
+    """
+    if not plan_ids:
+        return defaultdict(list)
+    return _group_features(_feature_rows(plan_ids))
+
+
+async def _afeatures_by_plan(plan_ids):
+    if not plan_ids:
+        return defaultdict(list)
+    return _group_features([row async for row in _feature_rows(plan_ids)])
+
+
+class ReadPlan:
+    """
+    fields: (output key, values() column, converter or None), in
+    serializer field order. A field with column None is a nested value:
+    nested() supplies it from the row and the plan features, which
+    subclasses fetch by naming the plan id column in `features_of`.
+    """
+    fields = ()
+    # extra columns needed by pagination/permissions but not rendered
+    extra_columns = ()
+    features_of = None
+
+    @classmethod
+    def columns(cls):
+        return tuple(column for _, column, _ in cls.fields if column is not None) + cls.extra_columns
+
+    @classmethod
+    def render_row(cls, row, nested=None):
+        return {
+            key: nested[key] if column is None else
+            (convert(row[column]) if convert and row[column] is not None else row[column])
+            for key, column, convert in cls.fields
+        }
+
+    @classmethod
+    def nested(cls, row, features):
+        return {}
+
+    @classmethod
+    def build(cls, rows, features):
+        return [cls.render_row(row, cls.nested(row, features)) for row in rows]
+
+    @classmethod
+    def render(cls, rows):
+        features = _features_by_plan([row[cls.features_of] for row in rows]) if cls.features_of else None
+        return cls.build(rows, features)
+
+    @classmethod
+    async def arender(cls, rows):
+        """
+        render() for async views: the nested features come from the async ORM.
+        """
+        features = await _afeatures_by_plan([row[cls.features_of] for row in rows]) if cls.features_of else None
+        return cls.build(rows, features)
+
+
+class FeatureReadPlan(ReadPlan):
+    """Same output as FeatureSerializer."""
+    fields = (("id", "id", None), ("name", "name", None))
+
+
+class PlanReadPlan(ReadPlan):
+    """Same output as PlanSerializer."""
+    fields = (("id", "id", None), ("name", "name", None), ("features", None, None))
+    features_of = "id"
+
+    @classmethod
+    def nested(cls, row, features):
+        return {"features": features[row["id"]]}
+
+
+class SubscriptionReadPlan(ReadPlan):
+    """Same output as SubscriptionSerializer."""
+    fields = (
+        ("id", "id", None),
+        ("plan", None, None),
+        ("start_date", "start_date", _datetime),
+        ("end_date", "end_date", _datetime),
+        ("is_active", "is_active", None),
+    )
+    extra_columns = ("user_id", "plan_id", "plan__name")
+    features_of = "plan_id"
+
+    @classmethod
+    def nested(cls, row, features):
+        return {"plan": {"id": row["plan_id"], "name": row["plan__name"], "features": features[row["plan_id"]]}}
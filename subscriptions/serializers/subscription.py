@@ -12,8 +12,8 @@ class SubscriptionSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Subscription
-        fields = ["id", "plan", "plan_id", "start_date", "is_active"]
-        read_only_fields = ["id", "start_date", "is_active"]
+        fields = ["id", "plan", "plan_id", "start_date", "end_date", "is_active"]
+        read_only_fields = ["id", "start_date", "end_date", "is_active"]
 
     def validate_plan_id(self, value):
         """
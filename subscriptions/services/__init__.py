@@ -0,0 +1,56 @@
+from .active_plan import (
+    clear_active_plans,
+    rebuild_active_plans,
+    refresh_feature_masks,
+    set_active_plans,
+)
+from .feature_index import (
+    FeatureIndex,
+    PlanDiff,
+    UnknownFeature,
+    UnknownPlan,
+    get_feature_index,
+    update_plan_bits,
+)
+from .history import backfill_end_dates
+from .plan_comparison import get_comparison_matrix, get_plan_deltas
+from .catalog import (
+    bump_catalog_version,
+    get_catalog_page,
+    get_catalog_version,
+    set_catalog_page,
+)
+from .subscription import (
+    BulkConflict,
+    SubscriptionNotActive,
+    bulk_change_plan,
+    bulk_create_subscriptions,
+    bulk_deactivate,
+    change_plan,
+)
+
+__all__ = [
+    "clear_active_plans",
+    "rebuild_active_plans",
+    "refresh_feature_masks",
+    "set_active_plans",
+    "FeatureIndex",
+    "PlanDiff",
+    "UnknownFeature",
+    "UnknownPlan",
+    "get_feature_index",
+    "update_plan_bits",
+    "backfill_end_dates",
+    "get_comparison_matrix",
+    "get_plan_deltas",
+    "bump_catalog_version",
+    "get_catalog_page",
+    "get_catalog_version",
+    "set_catalog_page",
+    "BulkConflict",
+    "SubscriptionNotActive",
+    "bulk_change_plan",
+    "bulk_create_subscriptions",
+    "bulk_deactivate",
+    "change_plan",
+]
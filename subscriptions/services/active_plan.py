@@ -0,0 +1,119 @@
+"""
+Maintenance of the denormalized User.active_plan / User.feature_mask.
+
+Single subscription saves and deletes update them from post_save /
+post_delete (subscriptions.signals); the bulk services, whose writes skip
+signals, call set_active_plans() / clear_active_plans() themselves. Either
+way it happens inside the write's transaction, so the pointer commits or
+rolls back with the subscription rows. Updates are set-based: one UPDATE
+however many users moved.
+"""
+from collections import defaultdict
+from django.contrib.auth import get_user_model
+from django.db.models import BinaryField, Case, Exists, OuterRef, Subquery, Value, When
+from subscriptions.bitsets import pack, unpack
+from subscriptions.models import Plan, Subscription
+from subscriptions.services.feature_index import compute_plan_masks, sync_plan_bits
+
+User = get_user_model()
+
+
+def plan_feature_masks(plan_ids):
+    """
+    Return {plan_id: feature bitset} from the plans' stored feature_bits.
+    """
+    masks = dict.fromkeys(plan_ids, 0)
+    for plan_id, bits in Plan.objects.filter(pk__in=plan_ids).values_list("id", "feature_bits"):
+        masks[plan_id] = unpack(bits)
+    return masks
+
+
+def set_active_plans(subscriptions):
+    """
+    Point the users of newly active subscriptions at their plans.
+    """
+    users_by_plan = defaultdict(list)
+    for sub in subscriptions:
+        users_by_plan[sub.plan_id].append(sub.user_id)
+    if not users_by_plan:
+        return
+    masks = plan_feature_masks(list(users_by_plan))
+    if len(users_by_plan) == 1:
+        (plan_id, user_ids), = users_by_plan.items()
+        User.objects.filter(pk__in=user_ids).update(active_plan_id=plan_id, feature_mask=pack(masks[plan_id]))
+        return
+    # several plans: still one UPDATE, with a CASE per column
+    plan_case = Case(*[
+        When(pk__in=user_ids, then=Value(plan_id)) for plan_id, user_ids in users_by_plan.items()
+    ])
+    mask_case = Case(*[
+        When(pk__in=user_ids, then=Value(pack(masks[plan_id]), output_field=BinaryField()))
+        for plan_id, user_ids in users_by_plan.items()
+    ])
+    User.objects.filter(pk__in=[pk for user_ids in users_by_plan.values() for pk in user_ids]).update(
+        active_plan_id=plan_case, feature_mask=mask_case
+    )
+
+
+def clear_active_plans(user_ids):
+    """
+    After deactivations/deletes: clear the pointer of those users that no
+    longer have an active subscription (one UPDATE).
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    User.objects.filter(pk__in=user_ids).exclude(
+        Exists(Subscription.objects.filter(user_id=OuterRef("pk"), is_active=True))
+    ).update(active_plan=None, feature_mask=b"")
+
+
+def refresh_feature_masks(plan_ids):
+    """
+    Recopy the feature_bits of plans whose features changed to their
+    users, in one UPDATE ... SET feature_mask = (SELECT ...).
+    """
+    plan_ids = list(plan_ids)
+    if not plan_ids:
+        return
+    User.objects.filter(active_plan_id__in=plan_ids).update(
+        feature_mask=Subquery(Plan.objects.filter(pk=OuterRef("active_plan_id")).values("feature_bits")[:1])
+    )
+
+
+def rebuild_active_plans(batch_size=1000, dry_run=False):
+    """
+    Recompute every plan's feature_bits and every user's pointer and mask
+    from the M2M and Subscription rows, and fix the ones that differ (only
+    count them with dry_run). Users are walked in primary-key batches: a
+    SELECT of the batch's active subscriptions and one bulk UPDATE per
+    batch. Returns (stale plans, users checked, users wrong).
+    """
+    stale_plans = sync_plan_bits(dry_run=dry_run)
+    masks = compute_plan_masks(list(Plan.objects.values_list("id", flat=True)))
+    checked = wrong = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            User.objects.filter(pk__gt=last_pk).order_by("pk")
+            .values_list("pk", "active_plan_id", "feature_mask")[:batch_size]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+        active = dict(
+            Subscription.objects.filter(user_id__in=[row[0] for row in batch], is_active=True)
+            .order_by()
+            .values_list("user_id", "plan_id")
+        )
+        fixes = []
+        for pk, plan_id, feature_mask in batch:
+            expected_plan = active.get(pk)
+            expected_mask = masks.get(expected_plan, 0)
+            if plan_id != expected_plan or unpack(feature_mask) != expected_mask:
+                fixes.append(User(pk=pk, active_plan_id=expected_plan, feature_mask=pack(expected_mask)))
+        checked += len(batch)
+        wrong += len(fixes)
+        if fixes and not dry_run:
+            User.objects.bulk_update(fixes, ["active_plan", "feature_mask"])
+    return stale_plans, checked, wrong
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+CATALOG_VERSION_KEY = "catalog:version"
+CATALOG_PAGE_KEY = "catalog:{}:{}"
+# plan list pages, by renderer format and paginator page_key()
+PLAN_LIST_PAGE = "plans:{}:{}"
+
+# Per-process LRU of the current version's pages: {"version": v, "pages": {key: data}}
+_local = {"version": None, "pages": OrderedDict()}
+_local_lock = threading.Lock()
+
+
+def _timeout():
+    return getattr(settings, "CATALOG_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def get_catalog_version():
+    """
+    Return the current catalog version token.
+    Versions are time-based rather than a plain counter so a flushed
+    shared cache can never hand out a version that was already used.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(CATALOG_VERSION_KEY, version, None):
+            version = cache.get(CATALOG_VERSION_KEY, version)
+    return version
+
+
+async def aget_catalog_version():
+    version = await cache.aget(CATALOG_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(CATALOG_VERSION_KEY, version, None):
+            version = await cache.aget(CATALOG_VERSION_KEY, version)
+    return version
+
+
+def _bump():
+    cache.set(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+def bump_catalog_version():
+    """
+    Mark every cached catalog page stale.
+    Bumped again after commit so a reader that cached pre-commit
+    data under the intermediate version is discarded too.
+    """
+    _bump()
+    transaction.on_commit(_bump)
+
+
+def catalog_etag(version):
+    return f'"catalog-{version}"'
+
+
+def _local_page(version, key):
+    with _local_lock:
+        if _local["version"] != version or key not in _local["pages"]:
+            return None
+        _local["pages"].move_to_end(key)
+        return _local["pages"][key]
+
+
+def get_catalog_page(version, key):
+    data = _local_page(version, key)
+    if data is not None:
+        return data
+    data = cache.get(CATALOG_PAGE_KEY.format(version, key))
+    if data is not None:
+        _remember(version, key, data)
+    return data
+
+
+def set_catalog_page(version, key, data):
+    cache.set(CATALOG_PAGE_KEY.format(version, key), data, _timeout())
+    _remember(version, key, data)
+
+
+async def aget_catalog_page(version, key):
+    data = _local_page(version, key)
+    if data is not None:
+        return data
+    data = await cache.aget(CATALOG_PAGE_KEY.format(version, key))
+    if data is not None:
+        _remember(version, key, data)
+    return data
+
+
+async def aset_catalog_page(version, key, data):
+    await cache.aset(CATALOG_PAGE_KEY.format(version, key), data, _timeout())
+    _remember(version, key, data)
+
+
+def _remember(version, key, data):
+    max_pages = getattr(settings, "CATALOG_LOCAL_PAGES", 256)
+    with _local_lock:
+        if _local["version"] != version:
+            _local["version"] = version
+            _local["pages"] = OrderedDict()
+        _local["pages"][key] = data
+        _local["pages"].move_to_end(key)
+        while len(_local["pages"]) > max_pages:
+            _local["pages"].popitem(last=False)
@@ -0,0 +1,160 @@
+"""
+Feature index: plans as integer bitsets.
+
+A feature's position is Feature.bit (see subscriptions.bitsets) and every
+Plan keeps its feature set packed in Plan.feature_bits, rewritten when its
+M2M changes (subscriptions.signals). Plan comparisons are then integer
+operations on a snapshot of the catalog instead of join queries: a
+FeatureIndex is loaded with two queries and cached per catalog version.
+"""
+from collections import defaultdict, namedtuple
+from django.db.models import BinaryField, Case, Value, When
+from subscriptions.bitsets import bits_of, has_bit, mask_of, pack, unpack
+from subscriptions.models import Feature, Plan
+from subscriptions.services.catalog import get_catalog_page, get_catalog_version, set_catalog_page
+
+FEATURE_INDEX_PAGE = "feature-index"
+
+PlanDiff = namedtuple("PlanDiff", ["added", "removed", "kept"])
+
+
+class UnknownFeature(Exception):
+    """
+    Raised for feature names that are not in the catalog.
+    """
+
+
+class UnknownPlan(Exception):
+    """
+    Raised for plan ids that are not in the catalog.
+    """
+
+
+def compute_plan_masks(plan_ids):
+    """
+    Return {plan_id: feature bitset} built from the M2M rows (one query).
+    """
+    bits = defaultdict(list)
+    for plan_id, bit in Plan.features.through.objects.filter(plan_id__in=plan_ids).values_list(
+        "plan_id", "feature__bit"
+    ):
+        bits[plan_id].append(bit)
+    return {plan_id: mask_of(bits.get(plan_id, ())) for plan_id in plan_ids}
+
+
+def update_plan_bits(plan_ids):
+    """
+    Rewrite Plan.feature_bits of the given plans from their M2M rows:
+    one SELECT and one UPDATE.
+    """
+    masks = compute_plan_masks(list(plan_ids))
+    if not masks:
+        return
+    Plan.objects.filter(pk__in=list(masks)).update(feature_bits=Case(*[
+        When(pk=plan_id, then=Value(pack(mask), output_field=BinaryField()))
+        for plan_id, mask in masks.items()
+    ]))
+
+
+def sync_plan_bits(dry_run=False):
+    """
+    Check every plan's stored bitset against its M2M rows and fix the
+    stale ones (only count them with dry_run). Returns the stale count.
+    """
+    stored = dict(Plan.objects.values_list("id", "feature_bits"))
+    masks = compute_plan_masks(list(stored))
+    stale = [plan_id for plan_id, mask in masks.items() if unpack(stored[plan_id]) != mask]
+    if stale and not dry_run:
+        update_plan_bits(stale)
+    return len(stale)
+
+
+class FeatureIndex:
+    """
+    Snapshot of the catalog as bitsets: {feature name: bit} and
+    {plan id: feature bitset}. All methods are pure integer operations.
+    """
+    def __init__(self, feature_bits, plan_masks, plan_names=None, feature_ids=None):
+        self.feature_bits = feature_bits
+        self.feature_names = {bit: name for name, bit in feature_bits.items()}
+        self.feature_ids = feature_ids or {}
+        self.plan_masks = plan_masks
+        self.plan_names = plan_names or {}
+
+    @classmethod
+    def load(cls):
+        features = Feature.objects.values_list("id", "name", "bit")
+        plans = Plan.objects.values_list("id", "name", "feature_bits")
+        return cls(
+            {name: bit for _, name, bit in features},
+            {plan_id: unpack(bits) for plan_id, _, bits in plans},
+            {plan_id: name for plan_id, name, _ in plans},
+            {bit: feature_id for feature_id, _, bit in features},
+        )
+
+    def tiers(self):
+        """
+        Plan ids from the smallest feature set to the largest (ties by id).
+        """
+        return sorted(self.plan_masks, key=lambda plan_id: (self.plan_masks[plan_id].bit_count(), plan_id))
+
+    def mask(self, names):
+        try:
+            return mask_of(self.feature_bits[name] for name in names)
+        except KeyError as exc:
+            raise UnknownFeature(exc.args[0]) from None
+
+    def names(self, mask):
+        return sorted(self.feature_names[bit] for bit in bits_of(mask) if bit in self.feature_names)
+
+    def plan_mask(self, plan_id):
+        try:
+            return self.plan_masks[plan_id]
+        except KeyError:
+            raise UnknownPlan(plan_id) from None
+
+    def has_feature(self, plan_id, name):
+        bit = self.feature_bits.get(name)
+        return bit is not None and has_bit(self.plan_mask(plan_id), bit)
+
+    def contains(self, plan_id, names):
+        """
+        True if the plan includes every one of `names`.
+        """
+        required = self.mask(names)
+        return self.plan_mask(plan_id) & required == required
+
+    def diff(self, from_plan_id, to_plan_id):
+        """
+        Features gained, lost and kept when moving between two plans.
+        """
+        old, new = self.plan_mask(from_plan_id), self.plan_mask(to_plan_id)
+        return PlanDiff(self.names(new & ~old), self.names(old & ~new), self.names(old & new))
+
+    def plans_with(self, names):
+        """
+        Ids of the plans that include every one of `names`, smallest
+        feature set first (ties by id).
+        """
+        required = self.mask(names)
+        return [plan_id for plan_id in self.tiers() if self.plan_masks[plan_id] & required == required]
+
+    def cheapest_plan_with(self, names):
+        """
+        The smallest plan (fewest features) that includes all of `names`,
+        or None. Plans carry no price, so feature count is the cost.
+        """
+        matches = self.plans_with(names)
+        return matches[0] if matches else None
+
+
+def get_feature_index():
+    """
+    Return the FeatureIndex of the current catalog version.
+    """
+    version = get_catalog_version()
+    index = get_catalog_page(version, FEATURE_INDEX_PAGE)
+    if index is None:
+        index = FeatureIndex.load()
+        set_catalog_page(version, FEATURE_INDEX_PAGE, index)
+    return index
@@ -0,0 +1,27 @@
+from django.db.models import Exists, F, OuterRef, Subquery, Value
+from subscriptions.models import Subscription
+
+
+def backfill_end_dates(fallback=None):
+    """
+    Give inactive subscriptions closed before end_date existed an end.
+
+    Rows followed by another subscription of the same user (a plan change)
+    end when the next one starts. For the rest there is no reliable end:
+    `updated_at` is only right for rows closed by the services, since the
+    deactivate endpoint used to save is_active alone and left updated_at at
+    creation time (an end of roughly start_date). So they are left without
+    an end unless `fallback` is given: "updated_at", or a datetime to use.
+
+    Returns (ended from the next subscription, ended from fallback,
+    left without an end).
+    """
+    later = Subscription.objects.filter(user_id=OuterRef("user_id"), start_date__gt=OuterRef("start_date"))
+    next_start = later.order_by("start_date").values("start_date")[:1]
+    missing = Subscription.objects.filter(is_active=False, end_date__isnull=True)
+
+    from_next = missing.filter(Exists(later)).update(end_date=Subquery(next_start))
+    if fallback is None:
+        return from_next, 0, missing.count()
+    value = F("updated_at") if fallback == "updated_at" else Value(fallback)
+    return from_next, missing.update(end_date=value), 0
@@ -0,0 +1,83 @@
+"""
+Plan comparison for the pricing page (GET /plans/compare/).
+
+Both parts are built from the FeatureIndex bitsets and cached per catalog
+version, so a warm request does no DB work and no set building:
+  - the plan x feature matrix, shared by every user;
+  - the deltas from one plan to every other, one page per starting plan.
+"""
+from subscriptions.bitsets import has_bit
+from subscriptions.services.catalog import get_catalog_page, set_catalog_page
+from subscriptions.services.feature_index import get_feature_index
+
+MATRIX_PAGE = "compare:matrix"
+DELTAS_PAGE = "compare:from:{}"
+
+UPGRADE = "upgrade"
+DOWNGRADE = "downgrade"
+CHANGE = "change"
+SAME = "same"
+
+
+def _direction(current, target):
+    if current == target:
+        return SAME
+    if current & target == current:
+        return UPGRADE
+    if current & target == target:
+        return DOWNGRADE
+    return CHANGE
+
+
+def build_matrix(index):
+    bits = sorted(index.feature_names)
+    return {
+        "features": [{"id": index.feature_ids[bit], "name": index.feature_names[bit]} for bit in bits],
+        "plans": [
+            {
+                "id": plan_id,
+                "name": index.plan_names.get(plan_id),
+                "feature_count": index.plan_masks[plan_id].bit_count(),
+                # one flag per entry of "features", in the same order
+                "features": [has_bit(index.plan_masks[plan_id], bit) for bit in bits],
+            }
+            for plan_id in index.tiers()
+        ],
+    }
+
+
+def build_deltas(index, plan_id):
+    current = index.plan_mask(plan_id)
+    deltas = []
+    for target_id in index.tiers():
+        if target_id == plan_id:
+            continue
+        target = index.plan_masks[target_id]
+        deltas.append({
+            "plan_id": target_id,
+            "direction": _direction(current, target),
+            "added": index.names(target & ~current),
+            "removed": index.names(current & ~target),
+        })
+    return deltas
+
+
+def get_comparison_matrix(version):
+    data = get_catalog_page(version, MATRIX_PAGE)
+    if data is None:
+        data = build_matrix(get_feature_index())
+        set_catalog_page(version, MATRIX_PAGE, data)
+    return data
+
+
+def get_plan_deltas(version, plan_id):
+    """
+    Deltas from `plan_id` to every other plan, or [] if it is unknown.
+    """
+    key = DELTAS_PAGE.format(plan_id)
+    data = get_catalog_page(version, key)
+    if data is None:
+        index = get_feature_index()
+        data = build_deltas(index, plan_id) if plan_id in index.plan_masks else []
+        set_catalog_page(version, key, data)
+    return data
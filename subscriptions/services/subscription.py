@@ -0,0 +1,262 @@
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from accounts.tasks import record_audit_event
+from jobs.queue import enqueue_jobs
+from subscriptions.models import Plan, Subscription, SubscriptionChangeEvent
+from subscriptions.selectors.entitlement import invalidate_user_entitlements
+from subscriptions.services.active_plan import clear_active_plans, set_active_plans
+from subscriptions.tasks import sync_billing
+
+User = get_user_model()
+
+
+class BulkConflict(Exception):
+    """
+    Raised when a concurrent write made the batch violate
+    uniq_active_subscription_per_user after validation.
+    """
+
+
+class SubscriptionNotActive(Exception):
+    """
+    Raised when a plan change targets a subscription that is
+    (or concurrently became) inactive.
+    """
+
+
+def _ok(index, pk, status):
+    return {"index": index, "id": pk, "status": status}
+
+
+def _error(index, message):
+    return {"index": index, "id": None, "status": "error", "error": message}
+
+
+def publish_changes(event, subscriptions, replaced=None):
+    """
+    Record a subscription write for the outside world, inside the write's
+    transaction: one outbox row per subscription for the change feed, and
+    the non-critical follow-ups (audit record, billing sync) as jobs.
+    Two INSERTs however many subscriptions changed.
+
+    subscriptions: Subscription instances (saved or not) with pk set.
+    replaced: {new pk: closed pk} for plan changes.
+    """
+    replaced = replaced or {}
+    events, jobs = [], []
+    for sub in subscriptions:
+        events.append(SubscriptionChangeEvent(
+            event=event, subscription_id=sub.pk, user_id=sub.user_id, plan_id=sub.plan_id,
+            is_active=sub.is_active, replaces_id=replaced.get(sub.pk),
+        ))
+        jobs.append(record_audit_event.job(
+            idempotency_key=f"audit:{event}:{sub.pk}", event=event, subscription_id=sub.pk, user_id=sub.user_id,
+        ))
+        jobs.append(sync_billing.job(
+            idempotency_key=f"billing:{event}:{sub.pk}", subscription_id=sub.pk, event=event,
+        ))
+    if events:
+        SubscriptionChangeEvent.objects.bulk_create(events)
+    enqueue_jobs(jobs)
+
+
+def change_plan(subscription, plan):
+    """
+    Switch a user to another plan while keeping history: the current row
+    is closed and a new active row is inserted, in one transaction.
+
+    The close is a conditional UPDATE ... WHERE is_active, which row-locks
+    the subscription like select_for_update would and lets only one of two
+    concurrent changes through, so uniq_active_subscription_per_user holds.
+    Returns the new subscription (with `plan` set, no re-fetch).
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        closed = Subscription.objects.filter(pk=subscription.pk, is_active=True).update(
+            is_active=False, end_date=now, updated_at=now
+        )
+        if not closed:
+            raise SubscriptionNotActive
+        new_subscription = Subscription.objects.create(user_id=subscription.user_id, plan=plan, start_date=now)
+        publish_changes(
+            SubscriptionChangeEvent.PLAN_CHANGED, [new_subscription], {new_subscription.pk: subscription.pk}
+        )
+    return new_subscription
+
+
+def deactivate(subscription):
+    """
+    Close an active subscription with a conditional UPDATE ... WHERE
+    is_active, so a row that is already inactive (or is closed
+    concurrently) keeps its end_date and no DEACTIVATED event is
+    published: SubscriptionNotActive is raised instead.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        closed = Subscription.objects.filter(pk=subscription.pk, is_active=True).update(
+            is_active=False, end_date=now, updated_at=now
+        )
+        if not closed:
+            raise SubscriptionNotActive
+        subscription.is_active = False
+        subscription.end_date = subscription.updated_at = now
+        # the UPDATE skips post_save: move the user's active-plan pointer here
+        clear_active_plans([subscription.user_id])
+        publish_changes(SubscriptionChangeEvent.DEACTIVATED, [subscription])
+    invalidate_user_entitlements([subscription.user_id])
+
+
+def bulk_create_subscriptions(items):
+    """
+    Create active subscriptions for many users at once.
+    items: [{"user_id": int, "plan_id": int}, ...]
+
+    The whole batch is validated with a handful of set-based queries;
+    valid rows are inserted with a single bulk_create.
+    Returns one result dict per input item, in input order.
+    """
+    user_ids = {item["user_id"] for item in items}
+    plan_ids = {item["plan_id"] for item in items}
+    existing_users = set(User.objects.filter(id__in=user_ids).values_list("id", flat=True))
+    existing_plans = set(Plan.objects.filter(id__in=plan_ids).values_list("id", flat=True))
+
+    results = [None] * len(items)
+    to_create = []
+    with transaction.atomic():
+        already_active = set(
+            Subscription.objects.filter(user_id__in=user_ids, is_active=True)
+            .values_list("user_id", flat=True)
+        )
+        for index, item in enumerate(items):
+            user_id, plan_id = item["user_id"], item["plan_id"]
+            if user_id not in existing_users:
+                results[index] = _error(index, "User does not exist.")
+            elif plan_id not in existing_plans:
+                results[index] = _error(index, "Plan does not exist.")
+            elif user_id in already_active:
+                results[index] = _error(index, "User already has an active subscription.")
+            else:
+                # later items for the same user are rejected, too
+                already_active.add(user_id)
+                to_create.append((index, Subscription(user_id=user_id, plan_id=plan_id)))
+
+        try:
+            created = Subscription.objects.bulk_create([sub for _, sub in to_create])
+        except IntegrityError as exc:
+            raise BulkConflict(str(exc)) from exc
+        # bulk writes skip post_save: move the users' active-plan pointers here
+        set_active_plans(created)
+        publish_changes(SubscriptionChangeEvent.CREATED, created)
+
+    for (index, _), sub in zip(to_create, created):
+        results[index] = _ok(index, sub.pk, "created")
+    # bulk_create skips post_save, so entitlement keys are dropped here
+    invalidate_user_entitlements([sub.user_id for sub in created])
+    return results
+
+
+def bulk_change_plan(items):
+    """
+    Move many subscriptions to new plans, keeping history.
+    items: [{"id": int, "plan_id": int}, ...]
+
+    Rows are locked and validated up front; then one conditional UPDATE
+    closes every changed row and one bulk_create opens their replacements.
+    The "id" of each successful result is the new subscription.
+    """
+    sub_ids = {item["id"] for item in items}
+    plan_ids = {item["plan_id"] for item in items}
+    existing_plans = set(Plan.objects.filter(id__in=plan_ids).values_list("id", flat=True))
+
+    results = [None] * len(items)
+    changes = []   # (index, old pk, new Subscription)
+    with transaction.atomic():
+        current = {
+            pk: (user_id, plan_id, is_active)
+            for pk, user_id, plan_id, is_active in Subscription.objects.select_for_update()
+            .filter(id__in=sub_ids)
+            .order_by()
+            .values_list("id", "user_id", "plan_id", "is_active")
+        }
+        seen = set()
+        for index, item in enumerate(items):
+            pk, plan_id = item["id"], item["plan_id"]
+            if pk not in current:
+                results[index] = _error(index, "Subscription does not exist.")
+            elif pk in seen:
+                results[index] = _error(index, "Subscription appears more than once in the batch.")
+            elif not current[pk][2]:
+                results[index] = _error(index, "Only an active subscription can change plan.")
+            elif plan_id not in existing_plans:
+                results[index] = _error(index, "Plan does not exist.")
+            elif current[pk][1] == plan_id:
+                results[index] = _error(index, "Cannot change to the same plan.")
+            else:
+                seen.add(pk)
+                changes.append((index, pk, Subscription(user_id=current[pk][0], plan_id=plan_id)))
+
+        if changes:
+            now = timezone.now()
+            closed = Subscription.objects.filter(id__in=seen, is_active=True).update(
+                is_active=False, end_date=now, updated_at=now
+            )
+            if closed != len(seen):
+                # some row was closed concurrently after validation
+                raise BulkConflict("Subscriptions changed while the batch was applied.")
+            for _, _, sub in changes:
+                sub.start_date = now
+            try:
+                Subscription.objects.bulk_create([sub for _, _, sub in changes])
+            except IntegrityError as exc:
+                raise BulkConflict(str(exc)) from exc
+            set_active_plans([sub for _, _, sub in changes])
+            publish_changes(
+                SubscriptionChangeEvent.PLAN_CHANGED,
+                [sub for _, _, sub in changes],
+                {sub.pk: old_pk for _, old_pk, sub in changes},
+            )
+
+    for index, _, sub in changes:
+        results[index] = _ok(index, sub.pk, "changed")
+    invalidate_user_entitlements({sub.user_id for _, _, sub in changes})
+    return results
+
+
+def bulk_deactivate(ids):
+    """
+    Deactivate many subscriptions with a single UPDATE.
+    """
+    results = [None] * len(ids)
+    with transaction.atomic():
+        current = {
+            pk: (user_id, is_active, plan_id)
+            for pk, user_id, is_active, plan_id in Subscription.objects.select_for_update()
+            .filter(id__in=set(ids))
+            .order_by()
+            .values_list("id", "user_id", "is_active", "plan_id")
+        }
+        to_deactivate = set()
+        for index, pk in enumerate(ids):
+            if pk not in current:
+                results[index] = _error(index, "Subscription does not exist.")
+            elif pk in to_deactivate:
+                results[index] = _error(index, "Subscription appears more than once in the batch.")
+            elif not current[pk][1]:
+                results[index] = _error(index, "Subscription is already inactive.")
+            else:
+                to_deactivate.add(pk)
+                results[index] = _ok(index, pk, "deactivated")
+
+        now = timezone.now()
+        Subscription.objects.filter(id__in=to_deactivate).update(
+            is_active=False, end_date=now, updated_at=now
+        )
+        clear_active_plans({current[pk][0] for pk in to_deactivate})
+        publish_changes(SubscriptionChangeEvent.DEACTIVATED, [
+            Subscription(pk=pk, user_id=current[pk][0], plan_id=current[pk][2], is_active=False, end_date=now)
+            for pk in to_deactivate
+        ])
+
+    invalidate_user_entitlements({current[pk][0] for pk in to_deactivate})
+    return results
@@ -0,0 +1,91 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from subscriptions.models import Feature, Plan, Subscription
+from subscriptions.selectors.entitlement import (
+    invalidate_feature_bits,
+    invalidate_plan_entitlements,
+    invalidate_user_entitlements,
+)
+from subscriptions.services.active_plan import clear_active_plans, refresh_feature_masks, set_active_plans
+from subscriptions.services.catalog import bump_catalog_version
+from subscriptions.services.feature_index import update_plan_bits
+
+@receiver([post_save, post_delete], sender=Subscription)
+def subscription_changed(sender, instance, **kwargs):
+    """
+    Plan or is_active changes move the user to another feature set.
+    """
+    invalidate_user_entitlements([instance.user_id])
+
+
+@receiver(post_save, sender=Subscription)
+def subscription_saved(sender, instance, **kwargs):
+    # keep User.active_plan in the save's transaction; bulk services do this themselves
+    if instance.is_active:
+        set_active_plans([instance])
+    else:
+        clear_active_plans([instance.user_id])
+
+
+@receiver(post_delete, sender=Subscription)
+def subscription_deleted(sender, instance, **kwargs):
+    if instance.is_active:
+        clear_active_plans([instance.user_id])
+
+
+@receiver(m2m_changed, sender=Plan.features.through)
+def plan_features_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            invalidate_plan_entitlements([instance.pk])
+            update_plan_bits([instance.pk])
+            refresh_feature_masks([instance.pk])
+    # Reverse side (feature.plans.add/remove/clear): instance is a Feature.
+    elif action == "pre_clear":
+        instance._cleared_plan_ids = list(instance.plans.values_list("id", flat=True))
+        invalidate_plan_entitlements(instance._cleared_plan_ids)
+    elif action == "post_clear":
+        update_plan_bits(instance._cleared_plan_ids)
+        refresh_feature_masks(instance._cleared_plan_ids)
+    elif action in ("post_add", "post_remove"):
+        invalidate_plan_entitlements(list(pk_set))
+        update_plan_bits(pk_set)
+        refresh_feature_masks(pk_set)
+
+
+@receiver(post_delete, sender=Plan)
+def plan_deleted(sender, instance, **kwargs):
+    invalidate_plan_entitlements([instance.pk])
+
+
+@receiver([post_save, pre_delete], sender=Feature)
+def feature_changed(sender, instance, created=False, **kwargs):
+    # Renames and deletes change the cached names of every plan holding the
+    # feature; deletes are caught before the M2M rows cascade away.
+    if not created:
+        instance._plan_ids = list(instance.plans.values_list("id", flat=True))
+        invalidate_plan_entitlements(instance._plan_ids)
+
+
+@receiver(post_delete, sender=Feature)
+def feature_deleted(sender, instance, **kwargs):
+    # the cascade skips m2m_changed: drop the feature's bit from plans and users
+    update_plan_bits(instance._plan_ids)
+    refresh_feature_masks(instance._plan_ids)
+
+
+@receiver([post_save, post_delete], sender=Feature)
+def feature_bits_changed(sender, **kwargs):
+    invalidate_feature_bits()
+
+
+@receiver([post_save, post_delete], sender=Plan)
+@receiver([post_save, post_delete], sender=Feature)
+def catalog_changed(sender, **kwargs):
+    bump_catalog_version()
+
+
+@receiver(m2m_changed, sender=Plan.features.through)
+def catalog_features_changed(sender, action, **kwargs):
+    if action.startswith("post_"):
+        bump_catalog_version()
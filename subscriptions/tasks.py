@@ -0,0 +1,33 @@
+import json
+import logging
+import urllib.request
+from django.conf import settings
+from jobs.registry import task
+from subscriptions.models import Subscription
+
+logger = logging.getLogger(__name__)
+
+
+@task("subscriptions.sync_billing")
+def sync_billing(subscription_id, event):
+    """
+    Push a subscription's current state to BILLING_SYNC_URL.
+    Failures raise, so the job is retried with backoff.
+    """
+    url = getattr(settings, "BILLING_SYNC_URL", None)
+    state = (
+        Subscription.objects.filter(pk=subscription_id)
+        .values("id", "user_id", "plan_id", "is_active")
+        .first()
+    )
+    if not url or state is None:
+        logger.debug("billing sync skipped for subscription %s", subscription_id)
+        return
+    request = urllib.request.Request(
+        url,
+        data=json.dumps({"event": event, "subscription": state}).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=getattr(settings, "BILLING_SYNC_TIMEOUT", 10)):
+        pass
@@ -0,0 +1,101 @@
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from subscriptions.bitsets import bits_of, unpack
+from subscriptions.models import Feature, Plan, Subscription
+from subscriptions.selectors.entitlement import get_active_plan_id, get_feature_bits, has_feature
+
+User = get_user_model()
+
+
+class ActivePlanPointerTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="user1", email="user1@example.com", password="pass1234")
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="adminpass")
+        self.storage = Feature.objects.create(name="Unlimited Storage")
+        self.reports = Feature.objects.create(name="Custom Reports")
+        self.basic = Plan.objects.create(name="Basic Plan")
+        self.basic.features.set([self.storage])
+        self.pro = Plan.objects.create(name="Pro Plan")
+        self.pro.features.set([self.storage, self.reports])
+
+    def pointer(self, user=None):
+        user = User.objects.get(pk=(user or self.user).pk)
+        return user.active_plan_id, set(bits_of(unpack(user.feature_mask)))
+
+    def test_subscription_lifecycle_moves_pointer(self):
+        """create, change-plan, deactivate and delete keep the user's pointer in step"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse("subscriptions:subscription-list"), {"plan_id": self.basic.id})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.pointer(), (self.basic.id, {self.storage.bit}))
+
+        url = reverse("subscriptions:subscription-change-plan", args=[response.data["id"]])
+        new_id = self.client.post(url, {"plan_id": self.pro.id}).data["id"]
+        self.assertEqual(self.pointer(), (self.pro.id, {self.storage.bit, self.reports.bit}))
+
+        self.client.post(reverse("subscriptions:subscription-deactivate", args=[new_id]))
+        self.assertEqual(self.pointer(), (None, set()))
+
+        sub = Subscription.objects.create(user=self.user, plan=self.basic)
+        self.assertEqual(self.pointer()[0], self.basic.id)
+        self.client.delete(reverse("subscriptions:subscription-detail", args=[sub.id]))
+        self.assertEqual(self.pointer(), (None, set()))
+
+    def test_bulk_writes_move_pointers(self):
+        other = User.objects.create_user(username="user2", email="user2@example.com", password="pass1234")
+        self.client.force_authenticate(user=self.admin)
+        self.client.post(reverse("subscriptions:subscription-bulk-create"), {"items": [
+            {"user_id": self.user.id, "plan_id": self.basic.id},
+            {"user_id": other.id, "plan_id": self.pro.id},
+        ]}, format="json")
+        self.assertEqual(self.pointer()[0], self.basic.id)
+        self.assertEqual(self.pointer(other)[0], self.pro.id)
+
+        sub = Subscription.objects.get(user=self.user, is_active=True)
+        self.client.post(reverse("subscriptions:subscription-bulk-change-plan"), {
+            "items": [{"id": sub.id, "plan_id": self.pro.id}],
+        }, format="json")
+        self.assertEqual(self.pointer(), (self.pro.id, {self.storage.bit, self.reports.bit}))
+
+        self.client.post(reverse("subscriptions:subscription-bulk-deactivate"), {
+            "ids": list(Subscription.objects.filter(is_active=True).values_list("id", flat=True)),
+        }, format="json")
+        self.assertEqual(self.pointer(), (None, set()))
+        self.assertEqual(self.pointer(other), (None, set()))
+
+    def test_plan_feature_changes_update_masks(self):
+        Subscription.objects.create(user=self.user, plan=self.basic)
+        self.basic.features.add(self.reports)
+        self.assertEqual(self.pointer()[1], {self.storage.bit, self.reports.bit})
+        self.storage.delete()
+        self.assertEqual(self.pointer()[1], {self.reports.bit})
+        self.reports.plans.clear()
+        self.assertEqual(self.pointer(), (self.basic.id, set()))
+
+    def test_hot_checks(self):
+        """Plan lookups are one primary-key read; a loaded user needs no query"""
+        Subscription.objects.create(user=self.user, plan=self.pro)
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_active_plan_id(self.user.id), self.pro.id)
+
+        user = User.objects.get(pk=self.user.pk)
+        get_feature_bits()
+        with self.assertNumQueries(0):
+            self.assertTrue(has_feature(user, "Custom Reports"))
+            self.assertFalse(has_feature(user, "No Such Feature"))
+
+    def test_rebuild_command(self):
+        Subscription.objects.create(user=self.user, plan=self.pro)
+        User.objects.filter(pk=self.user.pk).update(active_plan=self.basic, feature_mask=b"")
+        with self.assertRaisesMessage(CommandError, "0 plans have a stale feature bitset; 1 of 2 users"):
+            call_command("rebuild_active_plans", "--verify", stdout=None)
+        call_command("rebuild_active_plans", "--batch-size", "1")
+        self.assertEqual(self.pointer(), (self.pro.id, {self.storage.bit, self.reports.bit}))
+        call_command("rebuild_active_plans", "--verify")
@@ -0,0 +1,120 @@
+import json
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from accounts.serializers import ClaimsTokenObtainPairSerializer
+from subscriptions.models import Feature, Plan, Subscription
+
+User = get_user_model()
+
+
+class AsyncReadViewsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="user", email="user@example.com", password="userpass")
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="adminpass")
+        self.feature = Feature.objects.create(name="Unlimited Storage")
+        self.plans = [Plan.objects.create(name=f"Plan {i}") for i in range(3)]
+        for plan in self.plans:
+            plan.features.set([self.feature])
+        Subscription.objects.create(user=self.user, plan=self.plans[0], is_active=False)
+        Subscription.objects.create(user=self.user, plan=self.plans[1])
+        self.headers = self.auth_headers(self.user)
+        self.admin_headers = self.auth_headers(self.admin)
+
+        self.sync_client = APIClient()
+        self.sync_client.force_authenticate(user=self.user)
+
+    def auth_headers(self, user):
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        return {"Authorization": f"Bearer {token}"}
+
+    async def test_me(self):
+        """Async /me/ returns the profile of the token's user"""
+        response = await self.async_client.get(reverse("async-user-me"), headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["username"], "user")
+
+    async def test_requires_token(self):
+        """Anonymous and bad tokens get 401 like the ViewSets"""
+        response = await self.async_client.get(reverse("subscriptions:async-plan-list"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+        response = await self.async_client.get(
+            reverse("subscriptions:async-plan-list"), headers={"Authorization": "Bearer nope"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def test_rejects_writes(self):
+        """Async endpoints are read-only"""
+        response = await self.async_client.post(reverse("subscriptions:async-plan-list"), headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_same_output_as_viewsets(self):
+        """Plan and subscription lists match the sync endpoints item for item"""
+        pairs = [
+            ("subscriptions:plan-list", "subscriptions:async-plan-list"),
+            ("subscriptions:subscription-list", "subscriptions:async-subscription-list"),
+        ]
+        for sync_name, async_name in pairs:
+            expected = self.sync_client.get(reverse(sync_name)).data["results"]
+            response = self.client.get(reverse(async_name), headers=self.headers)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(json.loads(json.dumps(expected)), response.json()["results"])
+
+    async def test_subscription_cursor_pages(self):
+        """Async list follows the same cursor envelope"""
+        url = reverse("subscriptions:async-subscription-list")
+        first = (await self.async_client.get(url, {"page_size": 1}, headers=self.headers)).json()
+        self.assertEqual(len(first["results"]), 1)
+        self.assertIsNone(first["previous"])
+        second = (await self.async_client.get(first["next"], headers=self.headers)).json()
+        self.assertEqual(len(second["results"]), 1)
+        self.assertNotEqual(first["results"][0]["id"], second["results"][0]["id"])
+        self.assertIsNone(second["next"])
+
+    def test_cursor_links_match_viewsets_both_ways(self):
+        """Walking forward and back gives the sync endpoint's pages and cursors"""
+        sync_url, async_url = reverse("subscriptions:plan-list"), reverse("subscriptions:async-plan-list")
+        sync_page = self.sync_client.get(sync_url, {"page_size": 1}).data
+        async_page = self.client.get(async_url, {"page_size": 1}, headers=self.headers).json()
+        for direction in ("next", "next", "previous", "previous"):
+            self.assertEqual(json.loads(json.dumps(sync_page["results"])), async_page["results"])
+            self.assertEqual(
+                (sync_page["next"] or "").replace(sync_url, async_url),
+                async_page["next"] or "",
+            )
+            sync_page = self.sync_client.get(sync_page[direction]).data
+            async_page = self.client.get(async_page[direction], headers=self.headers).json()
+        self.assertEqual(async_page["results"][0]["id"], self.plans[0].id)
+        self.assertIsNone(async_page["previous"])
+
+    async def test_plan_catalog_etag(self):
+        """Async catalog answers If-None-Match with 304"""
+        url = reverse("subscriptions:async-plan-list")
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertTrue(response["ETag"].startswith('"catalog-'))
+        cached = await self.async_client.get(url, headers={**self.headers, "If-None-Match": response["ETag"]})
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_entitlements(self):
+        """Async entitlement checks use the active plan"""
+        response = await self.async_client.get(reverse("subscriptions:async-entitlement-list"), headers=self.headers)
+        self.assertEqual(response.json(), {"user": self.user.id, "features": ["Unlimited Storage"]})
+        response = await self.async_client.get(
+            reverse("subscriptions:async-entitlement-detail", args=["Priority Support"]), headers=self.headers
+        )
+        self.assertFalse(response.json()["enabled"])
+
+    async def test_entitlements_for_other_user_admin_only(self):
+        """Only admins may pass ?user="""
+        url = reverse("subscriptions:async-entitlement-list")
+        response = await self.async_client.get(url, {"user": self.admin.id}, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = await self.async_client.get(url, {"user": self.user.id}, headers=self.admin_headers)
+        self.assertEqual(response.json()["features"], ["Unlimited Storage"])
+
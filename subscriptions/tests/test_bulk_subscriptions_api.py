@@ -0,0 +1,90 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from subscriptions.models import Plan, Subscription
+
+User = get_user_model()
+
+
+class BulkSubscriptionApiTest(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="adminpass"
+        )
+        self.users = [
+            User.objects.create_user(username=f"user{i}", email=f"user{i}@example.com", password="pass1234")
+            for i in range(3)
+        ]
+        self.basic = Plan.objects.create(name="Basic Plan")
+        self.pro = Plan.objects.create(name="Pro Plan")
+
+        self.create_url = reverse("subscriptions:subscription-bulk-create")
+        self.change_url = reverse("subscriptions:subscription-bulk-change-plan")
+        self.deactivate_url = reverse("subscriptions:subscription-bulk-deactivate")
+
+    def test_bulk_endpoints_are_admin_only(self):
+        """Regular users cannot run bulk operations"""
+        self.client.force_authenticate(user=self.users[0])
+        payload = {"items": [{"user_id": self.users[0].id, "plan_id": self.basic.id}]}
+        response = self.client.post(self.create_url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_create_reports_per_item_results(self):
+        """Valid items are created, invalid ones reported without failing the batch"""
+        Subscription.objects.create(user=self.users[2], plan=self.basic)
+        self.client.force_authenticate(user=self.admin)
+        payload = {"items": [
+            {"user_id": self.users[0].id, "plan_id": self.basic.id},
+            {"user_id": self.users[0].id, "plan_id": self.pro.id},    # duplicate user in batch
+            {"user_id": self.users[1].id, "plan_id": 999999},          # unknown plan
+            {"user_id": self.users[2].id, "plan_id": self.pro.id},     # already active
+        ]}
+        response = self.client.post(self.create_url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["succeeded"], 1)
+        self.assertEqual(
+            [r["status"] for r in response.data["results"]],
+            ["created", "error", "error", "error"],
+        )
+        sub = Subscription.objects.get(user=self.users[0])
+        self.assertEqual(response.data["results"][0]["id"], sub.id)
+        self.assertTrue(sub.is_active)
+
+    def test_bulk_change_plan_uses_set_based_updates(self):
+        """All changes become one UPDATE plus one INSERT, keeping history"""
+        subs = [Subscription.objects.create(user=u, plan=self.basic) for u in self.users]
+        self.client.force_authenticate(user=self.admin)
+        payload = {"items": [{"id": s.id, "plan_id": self.pro.id} for s in subs]}
+        payload["items"].append({"id": subs[0].id, "plan_id": self.basic.id})
+        # plans + locked rows + UPDATE + INSERT + users' plan pointer (mask + UPDATE)
+        # + outbox and job INSERTs, inside a savepoint
+        with self.assertNumQueries(10):
+            response = self.client.post(self.change_url, payload, format="json")
+        self.assertEqual(response.data["succeeded"], 3)
+        self.assertEqual(response.data["results"][3]["status"], "error")
+        self.assertEqual(Subscription.objects.filter(plan=self.pro, is_active=True).count(), 3)
+        self.assertEqual(Subscription.objects.filter(plan=self.basic, is_active=False).count(), 3)
+        new_ids = {r["id"] for r in response.data["results"][:3]}
+        self.assertFalse(new_ids & {s.id for s in subs})
+
+    def test_bulk_deactivate(self):
+        """Active subscriptions are deactivated, unknown or inactive ones reported"""
+        active = Subscription.objects.create(user=self.users[0], plan=self.basic)
+        inactive = Subscription.objects.create(user=self.users[1], plan=self.basic, is_active=False)
+        self.client.force_authenticate(user=self.admin)
+        payload = {"ids": [active.id, inactive.id, 999999]}
+        response = self.client.post(self.deactivate_url, payload, format="json")
+        self.assertEqual(
+            [r["status"] for r in response.data["results"]],
+            ["deactivated", "error", "error"],
+        )
+        active.refresh_from_db()
+        self.assertFalse(active.is_active)
+
+    def test_empty_batch_rejected(self):
+        """Empty batches fail validation"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(self.deactivate_url, {"ids": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
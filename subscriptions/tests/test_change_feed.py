@@ -0,0 +1,161 @@
+import asyncio
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from accounts.serializers import ClaimsTokenObtainPairSerializer
+from subscriptions.models import Plan, Subscription, SubscriptionChangeEvent
+
+User = get_user_model()
+
+
+class ChangeFeedTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="user", email="user@example.com", password="userpass")
+        self.other = User.objects.create_user(username="other", email="other@example.com", password="userpass")
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="adminpass")
+        self.basic = Plan.objects.create(name="Basic Plan")
+        self.pro = Plan.objects.create(name="Pro Plan")
+        self.url = reverse("subscriptions:change-feed")
+        self.headers = self.auth_headers(self.user)
+        self.admin_headers = self.auth_headers(self.admin)
+
+        self.api = APIClient()
+        self.api.force_authenticate(user=self.user)
+
+    def auth_headers(self, user):
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_writes_record_outbox_rows(self):
+        """Create, change-plan, deactivate and delete each add one event in order"""
+        sub_id = self.api.post(reverse("subscriptions:subscription-list"), {"plan_id": self.basic.id}).data["id"]
+        new_id = self.api.post(
+            reverse("subscriptions:subscription-change-plan", args=[sub_id]), {"plan_id": self.pro.id}
+        ).data["id"]
+        self.api.post(reverse("subscriptions:subscription-deactivate", args=[new_id]))
+        self.api.delete(reverse("subscriptions:subscription-detail", args=[new_id]))
+
+        events = list(SubscriptionChangeEvent.objects.values_list("event", "subscription_id", "replaces_id"))
+        self.assertEqual(events, [
+            (SubscriptionChangeEvent.CREATED, sub_id, None),
+            (SubscriptionChangeEvent.PLAN_CHANGED, new_id, sub_id),
+            (SubscriptionChangeEvent.DEACTIVATED, new_id, None),
+            (SubscriptionChangeEvent.DELETED, new_id, None),
+        ])
+
+    def test_update_with_plan_id_is_a_plan_change(self):
+        """PATCH/PUT close the row and publish like change-plan instead of rewriting it"""
+        sub_id = self.api.post(reverse("subscriptions:subscription-list"), {"plan_id": self.basic.id}).data["id"]
+        response = self.api.patch(reverse("subscriptions:subscription-detail", args=[sub_id]), {"plan_id": self.pro.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        new_id = response.data["id"]
+        self.assertNotEqual(new_id, sub_id)
+        self.assertEqual(response.data["plan"]["id"], self.pro.id)
+        old = Subscription.objects.get(pk=sub_id)
+        self.assertEqual((old.plan_id, old.is_active), (self.basic.id, False))
+        self.assertEqual(old.end_date, Subscription.objects.get(pk=new_id).start_date)
+
+        response = self.api.put(reverse("subscriptions:subscription-detail", args=[sub_id]), {"plan_id": self.basic.id})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            list(SubscriptionChangeEvent.objects.values_list("event", "subscription_id", "replaces_id")),
+            [(SubscriptionChangeEvent.CREATED, sub_id, None), (SubscriptionChangeEvent.PLAN_CHANGED, new_id, sub_id)],
+        )
+
+    def test_deactivating_closed_row_records_nothing(self):
+        """A row already closed by change-plan publishes no second event"""
+        sub_id = self.api.post(reverse("subscriptions:subscription-list"), {"plan_id": self.basic.id}).data["id"]
+        self.api.post(reverse("subscriptions:subscription-change-plan", args=[sub_id]), {"plan_id": self.pro.id})
+        self.api.post(reverse("subscriptions:subscription-deactivate", args=[sub_id]))
+        self.assertEqual(
+            list(SubscriptionChangeEvent.objects.values_list("event", flat=True)),
+            [SubscriptionChangeEvent.CREATED, SubscriptionChangeEvent.PLAN_CHANGED],
+        )
+
+    def test_failed_write_records_nothing(self):
+        """The outbox row shares the write's transaction"""
+        sub = Subscription.objects.create(user=self.user, plan=self.basic, is_active=False)
+        response = self.api.post(
+            reverse("subscriptions:subscription-change-plan", args=[sub.id]), {"plan_id": self.pro.id}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(SubscriptionChangeEvent.objects.exists())
+
+    async def test_feed_returns_deltas_after_cursor(self):
+        """Consumers only get events after their cursor, and only their own"""
+        first = await Subscription.objects.acreate(user=self.user, plan=self.basic)
+        await Subscription.objects.acreate(user=self.other, plan=self.basic)
+        await SubscriptionChangeEvent.objects.abulk_create([
+            SubscriptionChangeEvent(event="subscription.created", subscription_id=first.id,
+                                    user_id=self.user.id, plan_id=self.basic.id, is_active=True),
+            SubscriptionChangeEvent(event="subscription.created", subscription_id=0,
+                                    user_id=self.other.id, plan_id=self.basic.id, is_active=True),
+        ])
+        data = (await self.async_client.get(self.url, headers=self.headers)).json()
+        self.assertEqual([e["subscription"]["user"] for e in data["events"]], [self.user.id])
+
+        again = (await self.async_client.get(self.url, {"after": data["next"]}, headers=self.headers)).json()
+        self.assertEqual(again, {"events": [], "next": data["next"]})
+
+        everyone = (await self.async_client.get(self.url, headers=self.admin_headers)).json()
+        self.assertEqual(len(everyone["events"]), 2)
+
+    async def test_long_poll_wakes_on_new_event(self):
+        """A waiting request returns as soon as a matching event commits"""
+        latest = (await self.async_client.get(self.url, {"after": "latest"}, headers=self.headers)).json()["next"]
+
+        async def write_later():
+            await asyncio.sleep(0.2)
+            await SubscriptionChangeEvent.objects.acreate(
+                event="subscription.created", subscription_id=1,
+                user_id=self.user.id, plan_id=self.basic.id, is_active=True,
+            )
+
+        with override_settings(CHANGE_FEED_POLL_INTERVAL=0.05):
+            response, _ = await asyncio.gather(
+                self.async_client.get(self.url, {"after": latest, "wait": 5}, headers=self.headers),
+                write_later(),
+            )
+        events = response.json()["events"]
+        self.assertEqual(len(events), 1)
+        self.assertGreater(events[0]["seq"], latest)
+
+    async def test_only_admins_follow_other_users(self):
+        """?user= is admin-only"""
+        response = await self.async_client.get(self.url, {"user": self.other.id}, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = await self.async_client.get(self.url, {"after": "x"}, headers=self.headers)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(CHANGE_FEED_STREAM_SECONDS=0.3, CHANGE_FEED_POLL_INTERVAL=0.05)
+    async def test_server_sent_events_resume_from_last_event_id(self):
+        """SSE frames carry the sequence as id; Last-Event-ID resumes after it"""
+        events = await SubscriptionChangeEvent.objects.abulk_create([
+            SubscriptionChangeEvent(event="subscription.created", subscription_id=i,
+                                    user_id=self.user.id, plan_id=self.basic.id, is_active=True)
+            for i in (1, 2)
+        ])
+        response = await self.async_client.get(
+            self.url,
+            headers={**self.headers, "Accept": "text/event-stream", "Last-Event-ID": str(events[0].id)},
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        body = b"".join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertIn(f"id: {events[1].id}\nevent: subscription.created\n", body)
+        self.assertNotIn(f"id: {events[0].id}\n", body)
+
+    def test_server_sent_events_fall_back_to_long_poll_under_wsgi(self):
+        """WSGI would buffer the whole stream, so the request is answered as JSON"""
+        event = SubscriptionChangeEvent.objects.create(
+            event="subscription.created", subscription_id=1, user_id=self.user.id, plan_id=self.basic.id,
+            is_active=True,
+        )
+        response = self.client.get(self.url, headers={**self.headers, "Accept": "text/event-stream"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.streaming)
+        self.assertEqual(response.json()["next"], event.id)
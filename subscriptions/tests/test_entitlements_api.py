@@ -0,0 +1,101 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from subscriptions.models import Plan, Feature, Subscription
+
+User = get_user_model()
+
+
+class EntitlementViewSetTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user1", email="user1@example.com", password="pass1234"
+        )
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@example.com", password="adminpass"
+        )
+
+        self.storage = Feature.objects.create(name="Unlimited Storage")
+        self.reports = Feature.objects.create(name="Custom Reports")
+
+        self.basic = Plan.objects.create(name="Basic Plan")
+        self.basic.features.set([self.storage])
+        self.pro = Plan.objects.create(name="Pro Plan")
+        self.pro.features.set([self.storage, self.reports])
+
+        self.subscription = Subscription.objects.create(user=self.user, plan=self.basic)
+
+        self.list_url = reverse("subscriptions:entitlement-list")
+        self.check_url = lambda name: reverse("subscriptions:entitlement-detail", args=[name])
+
+    def test_list_feature_names(self):
+        """User gets the feature names of their active plan"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["features"], ["Unlimited Storage"])
+
+    def test_single_check(self):
+        """Single feature check returns enabled flag"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.check_url("Unlimited Storage"))
+        self.assertTrue(response.data["enabled"])
+        response = self.client.get(self.check_url("Custom Reports"))
+        self.assertFalse(response.data["enabled"])
+
+    def test_cached_check_runs_no_queries(self):
+        """Warm checks are served from the cache"""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.list_url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.check_url("Unlimited Storage"))
+        self.assertTrue(response.data["enabled"])
+
+    def test_plan_change_invalidates(self):
+        """Changing the subscription's plan is visible immediately"""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.list_url)
+        self.subscription.plan = self.pro
+        self.subscription.save()
+        response = self.client.get(self.check_url("Custom Reports"))
+        self.assertTrue(response.data["enabled"])
+
+    def test_deactivate_invalidates(self):
+        """Deactivated subscriptions grant nothing"""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.list_url)
+        self.subscription.is_active = False
+        self.subscription.save(update_fields=["is_active"])
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data["features"], [])
+
+    def test_plan_features_change_invalidates(self):
+        """Adding/removing plan features or deleting a feature is visible immediately"""
+        self.client.force_authenticate(user=self.user)
+        self.client.get(self.list_url)
+        self.basic.features.add(self.reports)
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data["features"], ["Custom Reports", "Unlimited Storage"])
+
+        self.reports.plans.remove(self.basic)
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data["features"], ["Unlimited Storage"])
+
+        self.storage.delete()
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data["features"], [])
+
+    def test_other_user_check_admin_only(self):
+        """Only admins can check entitlements of other users"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.list_url, {"user": self.user.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["features"], ["Unlimited Storage"])
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.list_url, {"user": self.admin.id})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from subscriptions.models import Plan, Subscription
+
+User = get_user_model()
+
+
+class ExportTest(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="adminpass")
+        self.user = User.objects.create_user(username="user", email="user@example.com", password="userpass")
+        self.plan = Plan.objects.create(name="Pro, \"Annual\"")
+        self.users = [
+            User.objects.create_user(username=f"u{i}", email=f"u{i}@example.com", password="x") for i in range(5)
+        ]
+        for u in self.users:
+            Subscription.objects.create(user=u, plan=self.plan)
+        self.subscriptions_url = reverse("subscriptions:subscription-export")
+        self.users_url = reverse("user-export")
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_subscription_csv_export_streams_with_plan_names(self):
+        """Admins get every subscription as CSV, in chunks"""
+        self.client.force_authenticate(user=self.admin)
+        with self.settings(EXPORT_CHUNK_SIZE=2):
+            response = self.client.get(self.subscriptions_url, {"format": "csv"})
+            chunks = list(response.streaming_content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn('filename="subscriptions.csv"', response["Content-Disposition"])
+        self.assertGreater(len(chunks), 2)
+        rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode())))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["plan"], 'Pro, "Annual"')
+        self.assertEqual(rows[0]["username"], "u0")
+
+    def test_user_jsonl_export(self):
+        """?format=jsonl streams one JSON object per user"""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(self.users_url, {"format": "jsonl"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(lines), 7)
+        self.assertEqual(set(lines[0]), {
+            "id", "username", "email", "first_name", "last_name",
+            "is_active", "is_staff", "date_joined", "last_login",
+        })
+
+    def test_exports_are_admin_only(self):
+        """Regular users cannot export"""
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(self.subscriptions_url).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(self.users_url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_management_commands(self):
+        """export_* commands write the same streams to stdout"""
+        out = io.StringIO()
+        call_command("export_subscriptions", "--format", "jsonl", "--chunk-size", "2", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 5)
+        out = io.StringIO()
+        call_command("export_users", stdout=out)
+        self.assertEqual(len(list(csv.DictReader(io.StringIO(out.getvalue())))), 7)
@@ -0,0 +1,106 @@
+from unittest import mock
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import TestCase
+from subscriptions.bitsets import bits_of, unpack
+from subscriptions.models import Feature, Plan
+from subscriptions.services.feature_index import (
+    FeatureIndex,
+    UnknownFeature,
+    UnknownPlan,
+    get_feature_index,
+    update_plan_bits,
+)
+
+
+class FeatureIndexTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.storage = Feature.objects.create(name="Unlimited Storage")
+        self.reports = Feature.objects.create(name="Custom Reports")
+        self.support = Feature.objects.create(name="Priority Support")
+        self.basic = Plan.objects.create(name="Basic Plan")
+        self.basic.features.set([self.storage])
+        self.pro = Plan.objects.create(name="Pro Plan")
+        self.pro.features.set([self.storage, self.reports])
+        self.enterprise = Plan.objects.create(name="Enterprise Plan")
+        self.enterprise.features.set([self.storage, self.reports, self.support])
+
+    def bits(self, plan):
+        plan.refresh_from_db()
+        return set(bits_of(unpack(plan.feature_bits)))
+
+    def test_plan_bits_follow_m2m_changes(self):
+        """feature_bits is rewritten from both sides of the relation"""
+        self.assertEqual(self.bits(self.pro), {self.storage.bit, self.reports.bit})
+        self.pro.features.remove(self.storage)
+        self.assertEqual(self.bits(self.pro), {self.reports.bit})
+        self.support.plans.add(self.basic, self.pro)
+        self.assertEqual(self.bits(self.basic), {self.storage.bit, self.support.bit})
+        self.assertEqual(self.bits(self.pro), {self.reports.bit, self.support.bit})
+        self.reports.delete()
+        self.assertEqual(self.bits(self.pro), {self.support.bit})
+        self.support.plans.clear()
+        self.assertEqual(self.bits(self.basic), {self.storage.bit})
+
+    def test_bits_are_dense_and_stable(self):
+        """Bits ignore primary keys and do not move when a feature is deleted"""
+        self.assertEqual([self.storage.bit, self.reports.bit, self.support.bit], [0, 1, 2])
+        far = Feature.objects.create(id=10_000, name="Audit Log")
+        self.assertEqual(far.bit, 3)
+        self.reports.delete()
+        self.assertEqual(Feature.objects.create(name="SSO").bit, 4)
+        self.support.refresh_from_db()
+        self.assertEqual(self.support.bit, 2)
+        self.enterprise.features.add(far)
+        self.assertEqual(len(Plan.objects.get(pk=self.enterprise.pk).feature_bits), 1)
+
+    def test_concurrent_create_retries_taken_bit(self):
+        """A create that read a bit another create just took retries instead of failing"""
+        real_next_bit = Feature.next_bit
+        with mock.patch.object(Feature, "next_bit", side_effect=[self.support.bit, real_next_bit()]):
+            feature = Feature.objects.create(name="Audit Log")
+        self.assertEqual(feature.bit, 3)
+        with self.assertRaises(IntegrityError):
+            Feature.objects.create(name="Audit Log")
+
+    def test_set_operations(self):
+        index = get_feature_index()
+        diff = index.diff(self.basic.id, self.pro.id)
+        self.assertEqual(diff.added, ["Custom Reports"])
+        self.assertEqual(diff.removed, [])
+        self.assertEqual(diff.kept, ["Unlimited Storage"])
+        self.assertEqual(index.diff(self.enterprise.id, self.basic.id).removed, ["Custom Reports", "Priority Support"])
+
+        self.assertTrue(index.contains(self.pro.id, ["Unlimited Storage", "Custom Reports"]))
+        self.assertFalse(index.contains(self.basic.id, ["Custom Reports"]))
+        self.assertTrue(index.has_feature(self.basic.id, "Unlimited Storage"))
+        self.assertFalse(index.has_feature(self.basic.id, "Nope"))
+
+        self.assertEqual(index.plans_with(["Custom Reports"]), [self.pro.id, self.enterprise.id])
+        self.assertEqual(index.cheapest_plan_with(["Unlimited Storage"]), self.basic.id)
+        self.assertEqual(index.cheapest_plan_with(["Priority Support", "Custom Reports"]), self.enterprise.id)
+        self.assertEqual(index.cheapest_plan_with([]), self.basic.id)
+
+        with self.assertRaises(UnknownFeature):
+            index.cheapest_plan_with(["Nope"])
+        with self.assertRaises(UnknownPlan):
+            index.diff(self.basic.id, 0)
+
+    def test_index_is_cached_per_catalog_version(self):
+        get_feature_index()
+        with self.assertNumQueries(0):
+            index = get_feature_index()
+        self.assertIsInstance(index, FeatureIndex)
+        self.basic.features.add(self.support)
+        self.assertTrue(get_feature_index().contains(self.basic.id, ["Priority Support"]))
+
+    def test_update_plan_bits_repairs_bulk_loaded_rows(self):
+        Plan.features.through.objects.bulk_create([
+            Plan.features.through(plan_id=self.basic.id, feature_id=self.reports.id),
+        ])
+        self.assertEqual(self.bits(self.basic), {self.storage.bit})
+        with self.assertNumQueries(2):
+            update_plan_bits([self.basic.id, self.pro.id])
+        self.assertEqual(self.bits(self.basic), {self.storage.bit, self.reports.bit})
@@ -36,7 +36,7 @@ class FeatureViewSetTest(APITestCase):
         self.client.force_authenticate(user=self.regular_user)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_list_features_requires_authentication(self):
         """Unauthenticated users cannot list features"""
@@ -99,6 +99,9 @@ class FullWorkflowEndToEndTest(APITestCase):
         change_resp = self.client.post(change_url, {"plan_id": new_plan_id}, format="json")
         self.assertEqual(change_resp.status_code, status.HTTP_200_OK)
         self.assertEqual(change_resp.data["plan"]["id"], new_plan_id)
+        # the old subscription is kept as history
+        self.assertFalse(Subscription.objects.get(id=subscription_id).is_active)
+        subscription_id = change_resp.data["id"]
 
         # --- Step 6: User deactivates subscription ---
         deactivate_url = reverse("subscriptions:subscription-deactivate", args=[subscription_id])
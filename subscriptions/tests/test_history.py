@@ -0,0 +1,165 @@
+import datetime
+from io import StringIO
+from unittest import skipUnless
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from subscriptions.models import Plan, Subscription
+from subscriptions.selectors.history import daily_active_counts, get_plan_at
+
+User = get_user_model()
+UTC = datetime.timezone.utc
+
+
+def at(day, hour=12):
+    return datetime.datetime(2025, 3, day, hour, tzinfo=UTC)
+
+
+class SubscriptionHistoryTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="user1", email="user1@example.com", password="pass1234")
+        self.other = User.objects.create_user(username="user2", email="user2@example.com", password="pass1234")
+        self.basic = Plan.objects.create(name="Basic Plan")
+        self.pro = Plan.objects.create(name="Pro Plan")
+
+    def test_plan_changes_record_contiguous_history(self):
+        """change-plan ends the old row exactly when the new one starts"""
+        self.client.force_authenticate(user=self.user)
+        first = self.client.post(reverse("subscriptions:subscription-list"), {"plan_id": self.basic.id}).data
+        url = reverse("subscriptions:subscription-change-plan", args=[first["id"]])
+        second = self.client.post(url, {"plan_id": self.pro.id}).data
+        self.assertIsNone(second["end_date"])
+
+        old = Subscription.objects.get(pk=first["id"])
+        new = Subscription.objects.get(pk=second["id"])
+        self.assertEqual(old.end_date, new.start_date)
+        self.assertEqual(get_plan_at(self.user.pk, old.start_date), self.basic.id)
+        self.assertEqual(get_plan_at(self.user.pk, old.end_date - datetime.timedelta(microseconds=1)), self.basic.id)
+        self.assertEqual(get_plan_at(self.user.pk, new.start_date), self.pro.id)
+        self.assertIsNone(get_plan_at(self.user.pk, old.start_date - datetime.timedelta(seconds=1)))
+
+        url = reverse("subscriptions:subscription-deactivate", args=[second["id"]])
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_200_OK)
+        new.refresh_from_db()
+        self.assertIsNotNone(new.end_date)
+        self.assertEqual(new.updated_at, new.end_date)
+        self.assertIsNone(get_plan_at(self.user.pk, new.end_date))
+
+    def test_deactivating_closed_row_keeps_history(self):
+        """A row closed by change-plan cannot be closed again"""
+        self.client.force_authenticate(user=self.user)
+        first = self.client.post(reverse("subscriptions:subscription-list"), {"plan_id": self.basic.id}).data
+        url = reverse("subscriptions:subscription-change-plan", args=[first["id"]])
+        second = self.client.post(url, {"plan_id": self.pro.id}).data
+        old = Subscription.objects.get(pk=first["id"])
+
+        url = reverse("subscriptions:subscription-deactivate", args=[first["id"]])
+        self.assertEqual(self.client.post(url).status_code, status.HTTP_400_BAD_REQUEST)
+        closed = Subscription.objects.get(pk=first["id"])
+        self.assertEqual((closed.end_date, closed.updated_at), (old.end_date, old.updated_at))
+        self.assertEqual(closed.end_date, Subscription.objects.get(pk=second["id"]).start_date)
+        self.assertTrue(Subscription.objects.get(pk=second["id"]).is_active)
+
+    def test_direct_save_of_inactive_row_ends_it(self):
+        """Saves outside the services (admin, shell) still record an end"""
+        sub = Subscription.objects.create(user=self.user, plan=self.basic, start_date=at(1))
+        sub.is_active = False
+        sub.save(update_fields=["is_active"])
+        sub.refresh_from_db()
+        self.assertIsNotNone(sub.end_date)
+        self.assertIsNone(get_plan_at(self.user.pk, timezone.now()))
+
+        ended = sub.end_date
+        sub.save()
+        sub.refresh_from_db()
+        self.assertEqual(sub.end_date, ended)
+
+    def test_daily_active_counts(self):
+        """Subscriptions count for every day they were active during"""
+        Subscription.objects.create(user=self.user, plan=self.basic, start_date=at(1), end_date=at(3),
+                                    is_active=False)
+        Subscription.objects.create(user=self.user, plan=self.pro, start_date=at(3), is_active=True)
+        Subscription.objects.create(user=self.other, plan=self.basic, start_date=at(4), end_date=at(4, 18),
+                                    is_active=False)
+
+        with self.assertNumQueries(4):
+            counts = daily_active_counts(datetime.date(2025, 3, 2), datetime.date(2025, 3, 5))
+        self.assertEqual(counts, [
+            (datetime.date(2025, 3, 2), 1),
+            (datetime.date(2025, 3, 3), 2),   # basic ends, pro starts
+            (datetime.date(2025, 3, 4), 2),
+            (datetime.date(2025, 3, 5), 1),
+        ])
+        self.assertEqual(
+            [n for _, n in daily_active_counts(datetime.date(2025, 3, 1), datetime.date(2025, 3, 5), self.basic.id)],
+            [1, 1, 1, 1, 0],
+        )
+
+    def test_daily_counts_treat_end_as_exclusive(self):
+        """An end at midnight closes the previous day, in the current time zone"""
+        midnight = datetime.datetime(2025, 3, 2, tzinfo=UTC)
+        Subscription.objects.create(user=self.user, plan=self.basic, start_date=at(1), end_date=midnight,
+                                    is_active=False)
+        Subscription.objects.create(user=self.user, plan=self.pro, start_date=midnight,
+                                    end_date=midnight + datetime.timedelta(days=2), is_active=False)
+        days = (datetime.date(2025, 3, 1), datetime.date(2025, 3, 4))
+        self.assertEqual([n for _, n in daily_active_counts(*days)], [1, 1, 1, 0])
+        self.assertEqual([n for _, n in daily_active_counts(datetime.date(2025, 3, 2), days[1])], [1, 1, 0])
+        self.assertEqual([n for _, n in daily_active_counts(*days, plan_id=self.basic.id)], [1, 0, 0, 0])
+        with timezone.override("America/New_York"):
+            # 00:00 UTC on the 2nd is 19:00 on the 1st there
+            self.assertEqual([n for _, n in daily_active_counts(*days, plan_id=self.basic.id)], [1, 0, 0, 0])
+            self.assertEqual([n for _, n in daily_active_counts(*days, plan_id=self.pro.id)], [1, 1, 1, 0])
+
+    @skipUnless(connection.vendor == "sqlite", "query plans are SQLite's")
+    def test_queries_are_index_range_scans(self):
+        """Point lookups and counts search an index instead of scanning the table"""
+        for queryset, index in (
+            (Subscription.objects.filter(user_id=1, start_date__lte=at(1)).order_by("-start_date", "-id"),
+             "sub_user_start_idx"),
+            (Subscription.objects.filter(start_date__lt=at(1)).order_by(), "sub_start_idx"),
+            (Subscription.objects.filter(end_date__lt=at(1)).order_by(), "sub_end_idx"),
+            (Subscription.objects.filter(plan_id=1, start_date__gte=at(1)).order_by(), "sub_plan_start_idx"),
+            (Subscription.objects.filter(plan_id=1, end_date__lt=at(1)).order_by(), "sub_plan_end_idx"),
+        ):
+            self.assertIn("SEARCH subscriptions_subscription USING", queryset.explain())
+            self.assertIn(index, queryset.explain())
+
+    def closed_before_end_dates(self):
+        # rows deactivated before end_date existed
+        Subscription.objects.filter(is_active=False).update(end_date=None)
+
+    def test_backfill_end_dates(self):
+        """Plan changes end at the next start; others only with an explicit fallback"""
+        old = Subscription.objects.create(user=self.user, plan=self.basic, start_date=at(1), is_active=False)
+        Subscription.objects.create(user=self.user, plan=self.pro, start_date=at(5), is_active=True)
+        lone = Subscription.objects.create(user=self.other, plan=self.basic, start_date=at(2), is_active=False)
+        self.closed_before_end_dates()
+
+        out = StringIO()
+        call_command("backfill_end_dates", stdout=out)
+        old.refresh_from_db()
+        lone.refresh_from_db()
+        self.assertEqual(old.end_date, at(5))
+        self.assertIsNone(lone.end_date)
+        self.assertIn("1 inactive subscriptions have no later subscription", out.getvalue())
+
+        call_command("backfill_end_dates", "--fallback", "2025-03-03T00:00:00Z", stdout=StringIO())
+        lone.refresh_from_db()
+        self.assertEqual(lone.end_date, datetime.datetime(2025, 3, 3, tzinfo=UTC))
+
+    def test_backfill_updated_at_fallback(self):
+        lone = Subscription.objects.create(user=self.other, plan=self.basic, start_date=at(2), is_active=False)
+        self.closed_before_end_dates()
+        call_command("backfill_end_dates", "--fallback", "updated_at", stdout=StringIO())
+        lone.refresh_from_db()
+        self.assertEqual(lone.end_date, lone.updated_at)
+        with self.assertRaises(CommandError):
+            call_command("backfill_end_dates", "--fallback", "yesterday", stdout=StringIO())
@@ -0,0 +1,78 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from subscriptions.models import Plan, Feature
+from subscriptions.services import catalog
+
+User = get_user_model()
+
+
+class PlanCatalogCacheTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="userpass"
+        )
+        self.feature = Feature.objects.create(name="Unlimited Storage")
+        self.plan = Plan.objects.create(name="Basic Plan")
+        self.plan.features.set([self.feature])
+        self.url = reverse("subscriptions:plan-list")
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_sets_etag_and_serves_from_cache(self):
+        """Second read is served from the versioned cache"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response["ETag"].startswith('"catalog-'))
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached.data, response.data)
+        self.assertEqual(cached["ETag"], response["ETag"])
+
+    def test_conditional_get_returns_304(self):
+        """Matching If-None-Match returns 304 without a body"""
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_catalog_change_bumps_version(self):
+        """Plan, feature and M2M changes all invalidate the catalog"""
+        etag = self.client.get(self.url)["ETag"]
+
+        self.plan.features.add(Feature.objects.create(name="Custom Reports"))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"][0]["features"]), 2)
+
+        etag = response["ETag"]
+        self.feature.name = "Unlimited Storage+"
+        self.feature.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["features"][0]["name"], "Unlimited Storage+")
+
+        etag = response["ETag"]
+        Plan.objects.create(name="Pro Plan")
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    @override_settings(CATALOG_LOCAL_PAGES=2, ALLOWED_HOSTS=["testserver", "a.example.com", "b.example.com"])
+    def test_pages_are_keyed_by_page_not_url(self):
+        """Unrelated parameters share a page; links follow each request's host; the local copy is bounded"""
+        Plan.objects.create(name="Pro Plan")
+        first = self.client.get(self.url, {"page_size": 1}, HTTP_HOST="a.example.com")
+        self.assertTrue(first.data["next"].startswith(f"http://a.example.com{self.url}?"))
+        with self.assertNumQueries(0):
+            other = self.client.get(self.url, {"page_size": 1, "utm_source": "x"}, HTTP_HOST="b.example.com")
+        self.assertEqual(other.data["results"], first.data["results"])
+        self.assertEqual(other.data["next"], first.data["next"].replace("a.example.com", "b.example.com"))
+
+        for size in (2, 3, 4):
+            self.client.get(self.url, {"page_size": size})
+        self.assertEqual(len(catalog._local["pages"]), 2)
@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from subscriptions.models import Feature, Plan, Subscription
+
+User = get_user_model()
+
+
+class PlanCompareTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="userpass"
+        )
+        self.storage = Feature.objects.create(name="Unlimited Storage")
+        self.reports = Feature.objects.create(name="Custom Reports")
+        self.support = Feature.objects.create(name="Priority Support")
+        self.pro = Plan.objects.create(name="Pro Plan")
+        self.pro.features.set([self.storage, self.reports])
+        self.basic = Plan.objects.create(name="Basic Plan")
+        self.basic.features.set([self.storage])
+        self.helpdesk = Plan.objects.create(name="Helpdesk Plan")
+        self.helpdesk.features.set([self.storage, self.support])
+        self.url = reverse("subscriptions:plan-compare")
+        self.client.force_authenticate(user=self.user)
+
+    def test_matrix_lists_plans_by_tier(self):
+        """Plans go smallest first with one flag per feature"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [f["name"] for f in response.data["features"]],
+            ["Unlimited Storage", "Custom Reports", "Priority Support"],
+        )
+        self.assertEqual(
+            [(p["name"], p["feature_count"], p["features"]) for p in response.data["plans"]],
+            [
+                ("Basic Plan", 1, [True, False, False]),
+                ("Pro Plan", 2, [True, True, False]),
+                ("Helpdesk Plan", 2, [True, False, True]),
+            ],
+        )
+        self.assertIsNone(response.data["current_plan_id"])
+        self.assertEqual(response.data["deltas"], [])
+
+    def test_deltas_from_current_plan(self):
+        """Deltas are classified against the user's active plan"""
+        Subscription.objects.create(user=self.user, plan=self.pro)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["current_plan_id"], self.pro.id)
+        self.assertEqual(response.data["deltas"], [
+            {"plan_id": self.basic.id, "direction": "downgrade", "added": [], "removed": ["Custom Reports"]},
+            {"plan_id": self.helpdesk.id, "direction": "change",
+             "added": ["Priority Support"], "removed": ["Custom Reports"]},
+        ])
+
+        self.helpdesk.features.add(self.reports)
+        deltas = self.client.get(self.url).data["deltas"]
+        self.assertEqual(deltas[-1], {
+            "plan_id": self.helpdesk.id, "direction": "upgrade", "added": ["Priority Support"], "removed": [],
+        })
+
+    def test_warm_reads_and_conditional_get(self):
+        """Warm requests hit no tables; the ETag follows the user's plan"""
+        etag = self.client.get(self.url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Subscription.objects.create(user=self.user, plan=self.basic)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached.data, response.data)
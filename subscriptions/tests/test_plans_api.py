@@ -38,8 +38,8 @@ class PlanViewSetTest(APITestCase):
         self.client.force_authenticate(user=self.regular_user)
         response = self.client.get(self.url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["features"][0]["id"], self.feature1.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["features"][0]["id"], self.feature1.id)
 
     def test_list_plans_requires_authentication(self):
         """Unauthenticated users cannot list plans"""
@@ -59,6 +59,14 @@ class PlanViewSetTest(APITestCase):
         self.assertEqual(plan.name, "Pro Plan")
         self.assertEqual(list(plan.features.values_list("id", flat=True)), [self.feature1.id, self.feature2.id])
 
+    def test_create_plan_with_unknown_feature_fails(self):
+        """Unknown feature ids are rejected"""
+        self.client.force_authenticate(user=self.admin_user)
+        payload = {"name": "Pro Plan", "feature_ids": [self.feature1.id, 999999]}
+        response = self.client.post(self.url, payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Invalid pk "999999"', str(response.data["feature_ids"]))
+
     def test_create_plan_as_regular_user(self):
         """Regular user cannot create a plan"""
         self.client.force_authenticate(user=self.regular_user)
@@ -0,0 +1,71 @@
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from subscriptions.models import Plan, Feature, Subscription
+from subscriptions.serializers import FeatureSerializer, PlanSerializer, SubscriptionSerializer
+
+User = get_user_model()
+
+
+class ReadPlanOutputTest(APITestCase):
+    """The values()-based read path must produce the ModelSerializer's JSON."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="user1", email="user1@example.com", password="pass1234"
+        )
+        self.other = User.objects.create_user(
+            username="user2", email="user2@example.com", password="pass1234"
+        )
+        f1 = Feature.objects.create(name="Unlimited Storage")
+        f2 = Feature.objects.create(name="Custom Reports")
+        f3 = Feature.objects.create(name="Ünïcode ✓")
+        self.basic = Plan.objects.create(name="Basic Plan")
+        self.basic.features.set([f3, f1])
+        self.pro = Plan.objects.create(name="Pro Plan")
+        self.pro.features.set([f1, f2, f3])
+        Plan.objects.create(name="Empty Plan")
+
+        old = Subscription.objects.create(user=self.user, plan=self.basic, is_active=False, end_date=timezone.now())
+        self.current = Subscription.objects.create(user=self.user, plan=self.pro)
+        self.others = Subscription.objects.create(user=self.other, plan=self.basic)
+        self.user_subs = [self.current, old]   # newest first
+        self.client.force_authenticate(user=self.user)
+
+    def assertSameJSON(self, response, expected):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["results"] if isinstance(expected, list) else response.data
+        self.assertEqual(JSONRenderer().render(data), JSONRenderer().render(expected))
+
+    def test_feature_list_and_detail(self):
+        response = self.client.get(reverse("subscriptions:feature-list"))
+        self.assertSameJSON(response, FeatureSerializer(Feature.objects.all(), many=True).data)
+        feature = Feature.objects.first()
+        response = self.client.get(reverse("subscriptions:feature-detail", args=[feature.id]))
+        self.assertSameJSON(response, FeatureSerializer(feature).data)
+
+    def test_plan_list_and_detail(self):
+        plans = Plan.objects.prefetch_related("features")
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("subscriptions:plan-list"))
+        self.assertSameJSON(response, PlanSerializer(plans, many=True).data)
+        response = self.client.get(reverse("subscriptions:plan-detail", args=[self.pro.id]))
+        self.assertSameJSON(response, PlanSerializer(self.pro).data)
+
+    def test_subscription_list_and_detail(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("subscriptions:subscription-list"))
+        self.assertSameJSON(response, SubscriptionSerializer(self.user_subs, many=True).data)
+        response = self.client.get(reverse("subscriptions:subscription-detail", args=[self.current.id]))
+        self.assertSameJSON(response, SubscriptionSerializer(self.current).data)
+
+    def test_detail_permissions_and_missing(self):
+        response = self.client.get(reverse("subscriptions:subscription-detail", args=[self.others.id]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.get(reverse("subscriptions:subscription-detail", args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
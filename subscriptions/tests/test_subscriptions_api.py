@@ -45,12 +45,12 @@ class SubscriptionViewSetTest(APITestCase):
         self.client.force_authenticate(user=self.user1)
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]["plan"]["id"], self.plan1.id)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["plan"]["id"], self.plan1.id)
 
         self.client.force_authenticate(user=self.user2)
         response = self.client.get(self.list_url)
-        self.assertEqual(len(response.data), 0)
+        self.assertEqual(len(response.data["results"]), 0)
 
     def test_create_subscription(self):
         """User can create subscription for themselves"""
@@ -68,8 +68,28 @@ class SubscriptionViewSetTest(APITestCase):
         payload = {"plan_id": self.plan2.id}
         response = self.client.post(self.change_plan_url(self.subscription1.id), payload, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["plan"]["id"], self.plan2.id)
+        active = Subscription.objects.get(user=self.user1, is_active=True)
+        self.assertEqual(active.id, response.data["id"])
+        self.assertEqual(active.plan, self.plan2)
+
+    def test_change_plan_keeps_history(self):
+        """The previous subscription is closed, not overwritten"""
+        self.client.force_authenticate(user=self.user1)
+        payload = {"plan_id": self.plan2.id}
+        response = self.client.post(self.change_plan_url(self.subscription1.id), payload, format="json")
+        self.assertNotEqual(response.data["id"], self.subscription1.id)
         self.subscription1.refresh_from_db()
-        self.assertEqual(self.subscription1.plan, self.plan2)
+        self.assertFalse(self.subscription1.is_active)
+        self.assertEqual(self.subscription1.plan, self.plan1)
+
+    def test_change_plan_of_inactive_subscription_fails(self):
+        """A closed subscription cannot change plan again"""
+        self.client.force_authenticate(user=self.user1)
+        self.client.post(self.change_plan_url(self.subscription1.id), {"plan_id": self.plan2.id}, format="json")
+        response = self.client.post(self.change_plan_url(self.subscription1.id), {"plan_id": self.plan2.id}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Subscription.objects.filter(user=self.user1, is_active=True).count(), 1)
 
     def test_change_plan_same_plan_fails(self):
         """Cannot change to the same plan"""
@@ -1,7 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from subscriptions.views import PlanViewSet, SubscriptionViewSet
+from subscriptions.views import PlanViewSet, SubscriptionViewSet, EntitlementViewSet
 from subscriptions.views.feature import FeatureViewSet
+from subscriptions.views import asynchronous
+from subscriptions.views.change_feed import change_feed
 
 
 app_name = "subscriptions" 
@@ -10,7 +12,17 @@ router = DefaultRouter()
 router.register("plans", PlanViewSet, basename="plan")
 router.register("features", FeatureViewSet, basename="feature")
 router.register("subscriptions", SubscriptionViewSet, basename="subscription")
+router.register("entitlements", EntitlementViewSet, basename="entitlement")
 
 urlpatterns = [
     path("", include(router.urls)),
+
+    # Outbox-backed change feed (long-poll JSON or SSE)
+    path("changes/", change_feed, name="change-feed"),
+
+    # Native async reads for ASGI servers
+    path("async/plans/", asynchronous.plan_list, name="async-plan-list"),
+    path("async/subscriptions/", asynchronous.subscription_list, name="async-subscription-list"),
+    path("async/entitlements/", asynchronous.entitlement_list, name="async-entitlement-list"),
+    path("async/entitlements/<str:feature>/", asynchronous.entitlement_detail, name="async-entitlement-detail"),
 ]
@@ -1,5 +1,6 @@
 from .subscription import SubscriptionViewSet
 from .plan import PlanViewSet
+from .entitlement import EntitlementViewSet
 
 
-__all__ = ["SubscriptionViewSet"]
\ No newline at end of file
+__all__ = ["SubscriptionViewSet", "EntitlementViewSet"]
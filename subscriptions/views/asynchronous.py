@@ -0,0 +1,75 @@
+"""
+Native async versions of the read-heavy endpoints, for ASGI servers.
+Same data, cursors and cache entries as the ViewSets; every query goes
+through the async ORM and cache APIs, so a slow client holds a coroutine
+instead of a worker thread. Writes stay on the ViewSets.
+"""
+from django.http import HttpResponse
+from rest_framework import status
+from core.asyncapi import async_api_view, drf_request, json_response
+from core.conditional import etag_matches, set_etag
+from core.pagination import IdCursorPagination, StartDateCursorPagination, absolute_links, portable_links
+from subscriptions.models import Plan, Subscription
+from subscriptions.selectors.entitlement import aget_user_feature_names
+from subscriptions.serializers.read import PlanReadPlan, SubscriptionReadPlan
+from subscriptions.views.entitlement import entitlement_user_id
+from subscriptions.services.catalog import (
+    PLAN_LIST_PAGE,
+    aget_catalog_page,
+    catalog_etag,
+    aget_catalog_version,
+    aset_catalog_page,
+)
+
+
+async def _paginated(paginator, queryset, request, read_plan):
+    page = await paginator.apaginate_queryset(queryset, drf_request(request))
+    return paginator.get_paginated_response(await read_plan.arender(page)).data
+
+
+@async_api_view(query_budget=3)
+async def plan_list(request):
+    """
+    GET /plans/ -> plan catalog, with the ETag/304 handling of PlanViewSet.list
+    """
+    version = await aget_catalog_version()
+    etag = catalog_etag(version)
+    if etag_matches(request, etag):
+        return set_etag(HttpResponse(status=status.HTTP_304_NOT_MODIFIED), etag)
+    paginator = IdCursorPagination()
+    key = PLAN_LIST_PAGE.format("json", paginator.page_key(drf_request(request)))
+    data = await aget_catalog_page(version, key)
+    if data is None:
+        queryset = Plan.objects.values(*PlanReadPlan.columns())
+        data = portable_links(await _paginated(paginator, queryset, request, PlanReadPlan))
+        await aset_catalog_page(version, key, data)
+    return set_etag(json_response(absolute_links(request, data)), etag)
+
+
+@async_api_view(query_budget=3)
+async def subscription_list(request):
+    """
+    GET /subscriptions/ -> current user's subscriptions, newest first
+    """
+    queryset = Subscription.objects.filter(user_id=request.user.pk).values(*SubscriptionReadPlan.columns())
+    return await _paginated(StartDateCursorPagination(), queryset, request, SubscriptionReadPlan)
+
+
+@async_api_view(query_budget=3)
+async def entitlement_list(request):
+    """
+    GET /entitlements/ -> all feature names of the active plan
+    """
+    user_id = entitlement_user_id(request.user, request.GET.get("user"))
+    features = await aget_user_feature_names(user_id)
+    return {"user": user_id, "features": sorted(features)}
+
+
+@async_api_view(query_budget=3)
+async def entitlement_detail(request, feature):
+    """
+    GET /entitlements/{feature_name}/ -> single feature check
+    """
+    user_id = entitlement_user_id(request.user, request.GET.get("user"))
+    enabled = feature in await aget_user_feature_names(user_id)
+    return {"user": user_id, "feature": feature, "enabled": enabled}
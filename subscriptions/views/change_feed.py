@@ -0,0 +1,129 @@
+"""
+Subscription change feed: consumers follow the outbox
+(SubscriptionChangeEvent) by sequence number instead of re-listing
+/subscriptions/. Two transports over one resumable cursor:
+
+- long-poll JSON: GET /changes/?after=<seq>&wait=<seconds>
+- Server-Sent Events (Accept: text/event-stream), resumed with ?after=
+  or the Last-Event-ID header browsers send on reconnect.
+
+Both are native async views, so waiting consumers hold no worker thread
+under ASGI. SSE needs ASGI: a WSGI server buffers an async stream until
+it ends, so there the request is answered as a long-poll instead.
+"""
+import asyncio
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from core.asyncapi import async_api_view
+from core.renderers import FastJSONRenderer
+from subscriptions.selectors.change_feed import (
+    aget_change_events,
+    aget_latest_sequence,
+    render_change_event,
+)
+
+_renderer = FastJSONRenderer()
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _feed_user_id(request):
+    """
+    Users follow their own changes; admins follow everyone's,
+    or one user's with ?user=<id>.
+    """
+    user_id = request.GET.get("user")
+    is_admin = request.user.is_staff or request.user.is_superuser
+    if user_id is None:
+        return None if is_admin else request.user.pk
+    if not is_admin:
+        raise PermissionDenied("Only admins can follow other users.")
+    try:
+        return int(user_id)
+    except ValueError:
+        raise ValidationError({"user": "Must be an integer id."})
+
+
+async def _cursor(request):
+    after = request.GET.get("after") or request.headers.get("Last-Event-ID") or "0"
+    if after == "latest":
+        # start from now, e.g. right after an initial full listing
+        return await aget_latest_sequence()
+    try:
+        after = int(after)
+    except ValueError:
+        raise ValidationError({"after": 'Must be a sequence number or "latest".'})
+    if after < 0:
+        raise ValidationError({"after": "Must not be negative."})
+    return after
+
+
+def _limit(request):
+    max_limit = _setting("CHANGE_FEED_PAGE_SIZE", 500)
+    try:
+        return max(1, min(int(request.GET.get("limit", max_limit)), max_limit))
+    except ValueError:
+        raise ValidationError({"limit": "Must be an integer."})
+
+
+def _wait(request):
+    try:
+        wait = float(request.GET.get("wait", 0))
+    except ValueError:
+        raise ValidationError({"wait": "Must be a number of seconds."})
+    return max(0.0, min(wait, _setting("CHANGE_FEED_MAX_WAIT", 25)))
+
+
+async def _event_stream(after, user_id, limit):
+    loop = asyncio.get_running_loop()
+    poll = _setting("CHANGE_FEED_POLL_INTERVAL", 0.5)
+    heartbeat = _setting("CHANGE_FEED_HEARTBEAT", 15)
+    # bounded so proxies and workers recycle connections; clients resume
+    end = loop.time() + _setting("CHANGE_FEED_STREAM_SECONDS", 300)
+    last_write = loop.time()
+
+    yield f"retry: {_setting('CHANGE_FEED_RETRY_MS', 2000)}\n\n"
+    while loop.time() < end:
+        rows = await aget_change_events(after, user_id, limit)
+        for row in rows:
+            event = render_change_event(row)
+            after = event["seq"]
+            yield f"id: {after}\nevent: {event['event']}\ndata: {_renderer.render(event).decode()}\n\n"
+        if rows:
+            last_write = loop.time()
+            continue
+        if loop.time() - last_write >= heartbeat:
+            yield ": keepalive\n\n"
+            last_write = loop.time()
+        await asyncio.sleep(poll)
+
+
+@async_api_view(n_plus_one_exempt=True)
+async def change_feed(request):
+    """
+    GET /changes/ -> subscription change events after a sequence number
+    """
+    user_id = _feed_user_id(request)
+    after = await _cursor(request)
+    limit = _limit(request)
+
+    streamable = isinstance(request, ASGIRequest)
+    if streamable and "text/event-stream" in request.headers.get("Accept", ""):
+        response = StreamingHttpResponse(_event_stream(after, user_id, limit), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + _wait(request)
+    while True:
+        rows = await aget_change_events(after, user_id, limit)
+        if rows or loop.time() >= deadline:
+            break
+        await asyncio.sleep(_setting("CHANGE_FEED_POLL_INTERVAL", 0.5))
+    events = [render_change_event(row) for row in rows]
+    return {"events": events, "next": events[-1]["seq"] if events else after}
@@ -0,0 +1,53 @@
+from rest_framework import permissions, viewsets
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from subscriptions.selectors.entitlement import get_user_feature_names
+
+
+def entitlement_user_id(user, requested):
+    """
+    The user whose entitlements are checked: `user` itself, or the
+    ?user=<id> it asked for (admins only).
+    """
+    if requested is None:
+        return user.pk
+    if not (user.is_staff or user.is_superuser):
+        raise PermissionDenied("Only admins can check other users.")
+    try:
+        return int(requested)
+    except ValueError:
+        raise ValidationError({"user": "Must be an integer id."})
+
+
+class EntitlementViewSet(viewsets.ViewSet):
+    """
+    Cheap "does this user have feature X" checks for downstream services.
+    Answers come from the cached per-plan feature sets, not the nested
+    subscription serializers.
+
+    Admins may pass ?user=<id> to check on behalf of another user.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_field = "feature"
+    lookup_value_regex = "[^/]+"
+    # enforced by core.querybudget in tests
+    query_budget = {"list": 3, "retrieve": 3}
+
+    def get_user_id(self, request):
+        return entitlement_user_id(request.user, request.query_params.get("user"))
+
+    def list(self, request):
+        """
+        GET /entitlements/ -> all feature names of the active plan
+        """
+        user_id = self.get_user_id(request)
+        features = get_user_feature_names(user_id)
+        return Response({"user": user_id, "features": sorted(features)})
+
+    def retrieve(self, request, feature=None):
+        """
+        GET /entitlements/{feature_name}/ -> single feature check
+        """
+        user_id = self.get_user_id(request)
+        enabled = feature in get_user_feature_names(user_id)
+        return Response({"user": user_id, "feature": feature, "enabled": enabled})
@@ -1,13 +1,25 @@
 from rest_framework import viewsets
+from core.mixins import ReadPlanMixin, ReplicaReadMixin
 from subscriptions.models import Feature
 from subscriptions.serializers import FeatureSerializer
+from subscriptions.serializers.read import FeatureReadPlan
 from subscriptions.permissions import IsAdminOrReadOnly
 
-class FeatureViewSet(viewsets.ModelViewSet):
+class FeatureViewSet(ReplicaReadMixin, ReadPlanMixin, viewsets.ModelViewSet):
     """
     Features can be listed by any authenticated user,
     but only admins can create/update/delete.
     """
     queryset = Feature.objects.all()
     serializer_class = FeatureSerializer
-    permission_classes = [IsAdminOrReadOnly]
\ No newline at end of file
+    read_plan = FeatureReadPlan
+    permission_classes = [IsAdminOrReadOnly]
+    # enforced by core.querybudget in tests
+    query_budget = {
+        "list": 2,
+        "retrieve": 2,
+        "create": 6,
+        "update": 5,
+        "partial_update": 5,
+        "destroy": 5,
+    }
@@ -1,13 +1,90 @@
-from rest_framework import viewsets
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from core.conditional import etag_matches, set_etag
+from core.mixins import ReadPlanMixin, ReplicaReadMixin
+from core.pagination import absolute_links, portable_links
+from core.replicas import primary_reads
 from subscriptions.models import Plan
 from subscriptions.serializers import PlanSerializer
+from subscriptions.serializers.read import PlanReadPlan
 from subscriptions.permissions import IsAdminOrReadOnly
+from subscriptions.selectors.entitlement import get_active_plan_id
+from subscriptions.services.catalog import (
+    PLAN_LIST_PAGE,
+    catalog_etag,
+    get_catalog_page,
+    get_catalog_version,
+    set_catalog_page,
+)
+from subscriptions.services.plan_comparison import get_comparison_matrix, get_plan_deltas
 
-class PlanViewSet(viewsets.ModelViewSet):
+class PlanViewSet(ReplicaReadMixin, ReadPlanMixin, viewsets.ModelViewSet):
     """
     Plans can be listed by any authenticated user,
     but only admins can create/update/delete.
     """
     queryset = Plan.objects.prefetch_related("features").all()
     serializer_class = PlanSerializer
-    permission_classes = [IsAdminOrReadOnly]
\ No newline at end of file
+    read_plan = PlanReadPlan
+    permission_classes = [IsAdminOrReadOnly]
+    # enforced by core.querybudget in tests
+    query_budget = {
+        "list": 3,
+        "retrieve": 3,
+        "create": 10,
+        "update": 16,
+        "partial_update": 16,
+        "destroy": 8,
+        "compare": 3,
+    }
+
+    def _conditional(self, request, etag, build):
+        """
+        304 if If-None-Match matches `etag`, else build() as the body.
+        """
+        if etag_matches(request, etag):
+            return set_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+        return set_etag(Response(build()), etag)
+
+    def list(self, request, *args, **kwargs):
+        """
+        The catalog list is served from a cache keyed by the catalog
+        version, with the version as ETag: unchanged catalogs answer
+        If-None-Match with 304 without touching the DB or serializers.
+        Pages are built from "default": one read from a lagging replica
+        would stay cached under the new version. They are keyed by the
+        page asked for and hold no host-specific links.
+        """
+        version = get_catalog_version()
+
+        def build():
+            key = PLAN_LIST_PAGE.format(request.accepted_renderer.format, self.paginator.page_key(request))
+            data = get_catalog_page(version, key)
+            if data is None:
+                with primary_reads():
+                    data = portable_links(super(PlanViewSet, self).list(request, *args, **kwargs).data)
+                set_catalog_page(version, key, data)
+            return absolute_links(request, data)
+
+        return self._conditional(request, catalog_etag(version), build)
+
+    @action(detail=False, methods=["get"], url_path="compare")
+    def compare(self, request):
+        """
+        Plan x feature matrix plus the deltas from the user's current plan
+        to every other one. Both come from pages cached per catalog
+        version, so only the current plan lookup is per user; the ETag
+        covers both the catalog version and that plan.
+        """
+        version = get_catalog_version()
+        plan_id = get_active_plan_id(request.user.pk)
+
+        def build():
+            return {
+                **get_comparison_matrix(version),
+                "current_plan_id": plan_id,
+                "deltas": get_plan_deltas(version, plan_id) if plan_id else [],
+            }
+
+        return self._conditional(request, f'"compare-{version}-{plan_id or 0}"', build)
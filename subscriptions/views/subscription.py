@@ -1,32 +1,92 @@
+from django.db import transaction
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
-from subscriptions.models.subscription import Subscription
+from core.export import EXPORT_RENDERERS
+from core.mixins import ReadPlanMixin, ReplicaReadMixin
+from core.pagination import StartDateCursorPagination
+from subscriptions.exports import subscription_export
+from subscriptions.models import Subscription, SubscriptionChangeEvent
 from subscriptions.serializers.subscription import SubscriptionSerializer
+from subscriptions.serializers.read import SubscriptionReadPlan
+from subscriptions.serializers.bulk import (
+    BulkCreateSerializer,
+    BulkChangePlanSerializer,
+    BulkDeactivateSerializer,
+)
+from subscriptions.services import subscription as subscription_service
 from ..permissions import IsOwnerOfSubscription
 
-class SubscriptionViewSet(viewsets.ModelViewSet):
+class SubscriptionViewSet(ReplicaReadMixin, ReadPlanMixin, viewsets.ModelViewSet):
     """
     Manage subscriptions for the authenticated user.
     """
     serializer_class = SubscriptionSerializer
+    read_plan = SubscriptionReadPlan
     permission_classes = [permissions.IsAuthenticated, IsOwnerOfSubscription]
+    pagination_class = StartDateCursorPagination
+    # list/retrieve read from a replica, except right after the user's own writes
+    pin_on_write = True
+    # enforced by core.querybudget in tests
+    query_budget = {
+        "list": 3,
+        "retrieve": 3,
+        "create": 10,
+        "change_plan": 11,
+        "update": 11,
+        "partial_update": 11,
+        "deactivate": 7,
+        "destroy": 8,
+        "bulk_create": 10,
+        "bulk_change_plan": 10,
+        "bulk_deactivate": 7,
+        "export": 2,
+    }
 
     def get_queryset(self):
         """
         Limit to current user's subscriptions.
         Optimize with select_related & prefetch_related.
         """
+        if self.action in ("change_plan", "deactivate", "update", "partial_update"):
+            # only ownership and ids are needed, not the nested plan
+            return Subscription.objects.all()
         qs = Subscription.objects.select_related("plan").prefetch_related("plan__features")
         if self.action == "list":
-            return qs.filter(user=self.request.user)
+            return qs.filter(user_id=self.request.user.pk)
         return qs
 
     def perform_create(self, serializer):
         """
         When creating, bind subscription to the logged-in user.
         """
-        serializer.save(user=self.request.user)
+        with transaction.atomic():
+            subscription = serializer.save(user_id=self.request.user.pk)
+            subscription_service.publish_changes(SubscriptionChangeEvent.CREATED, [subscription])
+
+    def update(self, request, *args, **kwargs):
+        try:
+            return super().update(request, *args, **kwargs)
+        except subscription_service.SubscriptionNotActive:
+            return Response(
+                {"error": "Only an active subscription can change plan."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    def perform_update(self, serializer):
+        """
+        PUT/PATCH with plan_id is a plan change: it goes through the service
+        like change-plan, so history and the change feed see it, and the new
+        subscription is returned.
+        """
+        plan = serializer.validated_data.get("plan")
+        if plan is not None:
+            serializer.instance = subscription_service.change_plan(serializer.instance, plan)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            subscription_service.publish_changes(SubscriptionChangeEvent.DELETED, [instance])
+            instance.delete()
 
 
 
@@ -36,6 +96,7 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         Custom action: Change a subscription's plan.
         POST /subscriptions/{id}/change-plan/
         Body: { "plan_id": X }
+        The current subscription is closed and the new one is returned.
         """
         subscription = self.get_object()
         plan_id = request.data.get("plan_id")
@@ -49,8 +110,16 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
             partial=True
         )
         serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        try:
+            new_subscription = subscription_service.change_plan(
+                subscription, serializer.validated_data["plan"]
+            )
+        except subscription_service.SubscriptionNotActive:
+            return Response(
+                {"error": "Only an active subscription can change plan."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(self.get_serializer(new_subscription).data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"], url_path="deactivate")
     def deactivate(self, request, pk=None):
@@ -59,6 +128,71 @@ class SubscriptionViewSet(viewsets.ModelViewSet):
         POST /subscriptions/{id}/deactivate/
         """
         subscription = self.get_object()
-        subscription.is_active = False
-        subscription.save(update_fields=["is_active"])
+        try:
+            subscription_service.deactivate(subscription)
+        except subscription_service.SubscriptionNotActive:
+            return Response(
+                {"error": "Subscription is already inactive."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         return Response({"status": "subscription deactivated"})
+
+    def _bulk_response(self, results):
+        failed = sum(1 for r in results if r["status"] == "error")
+        return Response(
+            {"succeeded": len(results) - failed, "failed": failed, "results": results},
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=False, methods=["post"], url_path="bulk-create", permission_classes=[permissions.IsAdminUser])
+    def bulk_create(self, request):
+        """
+        Admin-only: create many subscriptions in one transaction.
+        POST /subscriptions/bulk-create/
+        Body: { "items": [{ "user_id": X, "plan_id": Y }, ...] }
+        """
+        serializer = BulkCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            results = subscription_service.bulk_create_subscriptions(serializer.validated_data["items"])
+        except subscription_service.BulkConflict:
+            return Response(
+                {"error": "Batch conflicts with concurrent subscription changes, retry."},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return self._bulk_response(results)
+
+    @action(detail=False, methods=["post"], url_path="bulk-change-plan", permission_classes=[permissions.IsAdminUser])
+    def bulk_change_plan(self, request):
+        """
+        Admin-only: change the plan of many subscriptions.
+        POST /subscriptions/bulk-change-plan/
+        Body: { "items": [{ "id": X, "plan_id": Y }, ...] }
+        """
+        serializer = BulkChangePlanSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = subscription_service.bulk_change_plan(serializer.validated_data["items"])
+        return self._bulk_response(results)
+
+    @action(detail=False, methods=["post"], url_path="bulk-deactivate", permission_classes=[permissions.IsAdminUser])
+    def bulk_deactivate(self, request):
+        """
+        Admin-only: deactivate many subscriptions.
+        POST /subscriptions/bulk-deactivate/
+        Body: { "ids": [X, Y, ...] }
+        """
+        serializer = BulkDeactivateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = subscription_service.bulk_deactivate(serializer.validated_data["ids"])
+        return self._bulk_response(results)
+
+    @action(
+        detail=False, methods=["get"], url_path="export",
+        permission_classes=[permissions.IsAdminUser], renderer_classes=EXPORT_RENDERERS,
+    )
+    def export(self, request):
+        """
+        Admin-only: stream every subscription with user and plan names.
+        GET /subscriptions/export/?format=csv|jsonl
+        """
+        return subscription_export().response(request.accepted_renderer.format)